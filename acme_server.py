@@ -0,0 +1,121 @@
+"""
+Local stand-in for the AcmeCRM REST API, backed by the in-process AcmeService.
+
+Gives AcmeClient something real to talk to in tests and benchmarks. Upstream
+slowness and flakiness can be injected through environment variables:
+
+    ACME_STUB_LATENCY_MS   Added delay per request (default 0)
+    ACME_STUB_JITTER_MS    Extra random delay of up to this much (default 0)
+    ACME_STUB_ERROR_RATE   Share of requests rejected with 503 before they are handled (default 0)
+
+Usage:
+    uvicorn acme_server:app --port 8300
+"""
+
+import asyncio
+import os
+import random
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.acme_service import AcmeService
+
+# Created batches remembered per Idempotency-Key, so a retried create is answered, not applied again
+IDEMPOTENCY_CACHE_SIZE = 10_000
+
+
+class AcmeStatusUpdate(BaseModel):
+    """Body of a contact status update."""
+    
+    acme_status: str
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0) -> FastAPI:
+    """
+    Build the stand-in AcmeCRM API.
+    
+    Args:
+        latency_ms: Delay added to every request
+        jitter_ms: Maximum extra random delay per request
+        error_rate: Share of requests rejected with 503 (and a Retry-After header) without being handled
+        
+    Returns:
+        FastAPI application
+    """
+    acme = FastAPI(title="AcmeCRM stand-in", docs_url="/docs", redoc_url=None)
+    created_by_key: "OrderedDict[str, List[AcmeContactResponse]]" = OrderedDict()
+    
+    @acme.middleware("http")
+    async def inject_faults(request: Request, call_next: Any) -> Response:
+        delay = latency_ms + random.uniform(0, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if error_rate and random.random() < error_rate:
+            return JSONResponse(
+                {"detail": "AcmeCRM is temporarily unavailable"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "0"}
+            )
+        return await call_next(request)
+    
+    @acme.post("/acme/contacts", response_model=List[AcmeContactResponse], status_code=status.HTTP_201_CREATED)
+    async def create_contacts(
+        contacts: List[AcmeContact],
+        idempotency_key: Optional[str] = Header(None)
+    ) -> List[AcmeContactResponse]:
+        if idempotency_key is not None and idempotency_key in created_by_key:
+            return created_by_key[idempotency_key]
+        created = AcmeService.create_contacts(contacts)
+        if idempotency_key is not None:
+            created_by_key[idempotency_key] = created
+            if len(created_by_key) > IDEMPOTENCY_CACHE_SIZE:
+                created_by_key.popitem(last=False)
+        return created
+    
+    @acme.get("/acme/contacts")
+    async def list_contacts(
+        limit: int = Query(100, ge=1, le=10_000),
+        after: Optional[int] = Query(None, ge=0),
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Dict[str, Any]:
+        contacts, next_after = AcmeService.get_contacts_page(limit, after, email=email, company=company, status=status)
+        return {"contacts": contacts, "next_after": next_after}
+    
+    @acme.delete("/acme/contacts", status_code=status.HTTP_204_NO_CONTENT)
+    async def clear_contacts() -> None:
+        AcmeService.clear_storage()
+    
+    @acme.get("/acme/contacts/{contact_id}", response_model=AcmeContactResponse)
+    async def get_contact(contact_id: str) -> AcmeContactResponse:
+        contact = AcmeService.get_contact(contact_id)
+        if contact is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+        return contact
+    
+    @acme.patch("/acme/contacts/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def update_contact_status(contact_id: str, update: AcmeStatusUpdate) -> None:
+        if not AcmeService.update_contact_status(contact_id, update.acme_status):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+    
+    @acme.delete("/acme/contacts/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def delete_contact(contact_id: str) -> None:
+        if not AcmeService.delete_contact(contact_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
+    
+    @acme.get("/acme/stats")
+    async def get_stats(top_companies: int = Query(5, ge=0, le=100)) -> Dict[str, Any]:
+        return AcmeService.get_storage_stats(top_companies)
+    
+    return acme
+
+
+app = create_app(
+    latency_ms=float(os.getenv("ACME_STUB_LATENCY_MS", "0")),
+    jitter_ms=float(os.getenv("ACME_STUB_JITTER_MS", "0")),
+    error_rate=float(os.getenv("ACME_STUB_ERROR_RATE", "0"))
+)
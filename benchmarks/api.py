@@ -0,0 +1,279 @@
+"""
+End-to-end API benchmark suite with JSON results for regression tracking.
+
+Runs each scenario through the full FastAPI stack, either in-process via
+httpx.ASGITransport (default) or against a live server (--url, e.g. one
+started with ``uvicorn main:app --port 8200``), and reports throughput,
+p50/p95/p99 latency and RSS per scenario:
+
+    create      POST /contacts
+    bulk        POST /contacts/bulk with --bulk-size contacts per request
+    stats       GET /contacts/stats
+    auth        GET /contacts?limit=1 with a rotation of distinct JWTs
+    list_<n>    GET /contacts pages from random cursors with n contacts stored
+
+Results are written as JSON; pass a previous file to --compare to print the
+change per scenario.
+
+Usage:
+    python -m benchmarks.api --sizes 1000,100000,1000000 --output results.json
+    python -m benchmarks.api --url http://localhost:8200 --server-pid 1234 --compare results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.auth_service import AuthService
+
+MOCK_TOKEN = "linq-demo-token"
+SEED_BATCH_SIZE = 10_000
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+def linq_contact(i: int) -> Dict[str, str]:
+    """Build a Linq-format contact payload."""
+    return {
+        "firstName": f"First{i}", "lastName": f"Last{i}", "email": f"contact{i}@example.com",
+        "phone": f"+1-555-{i % 10_000_000:07d}", "company": COMPANIES[i % len(COMPANIES)]
+    }
+
+
+def acme_contact(i: int) -> AcmeContact:
+    """Build the AcmeCRM form of ``linq_contact(i)`` without validation, for fast in-process seeding."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+        acme_phone_number=f"+1-555-{i % 10_000_000:07d}", acme_company_name=COMPANIES[i % len(COMPANIES)],
+        acme_notes=None
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value at a given fraction of the sorted samples."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def rss_mib(pid: Optional[int] = None) -> Optional[float]:
+    """Current resident set size of a process in MiB (Linux /proc), falling back to this process's peak."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid is not None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, to tell runs apart."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def auth(token: str) -> Dict[str, str]:
+    """Authorization header for a bearer token."""
+    return {"Authorization": f"Bearer {token}"}
+
+
+class Runner:
+    """Drives scenarios against one API client and collects their results."""
+    
+    def __init__(self, client: httpx.AsyncClient, concurrency: int, in_process: bool, server_pid: Optional[int]) -> None:
+        self.client = client
+        self.concurrency = concurrency
+        self.in_process = in_process
+        self.server_pid = server_pid
+        self.results: List[Dict[str, Any]] = []
+        self._next_id = 0
+    
+    def take_ids(self, count: int) -> range:
+        """Reserve numbers for contacts that are unique within this run."""
+        ids = range(self._next_id, self._next_id + count)
+        self._next_id += count
+        return ids
+    
+    async def scenario(self, name: str, requests: int, send: Callable[[int], Awaitable[httpx.Response]]) -> None:
+        """Issue ``requests`` calls of ``send(i)`` from ``concurrency`` workers and record the results."""
+        latencies: List[float] = []
+        errors = 0
+        pending = iter(range(requests))
+        
+        async def worker() -> None:
+            nonlocal errors
+            for i in pending:
+                started = time.perf_counter()
+                response = await send(i)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 400:
+                    errors += 1
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        elapsed = time.perf_counter() - started
+        
+        result = {
+            "name": name,
+            "requests": requests,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "throughput": round(requests / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "rss_mib": rss_mib(self.server_pid) if not self.in_process else rss_mib(),
+            "contacts": await self.contact_count()
+        }
+        self.results.append(result)
+        print(f"{name:<14} {result['throughput']:>10.0f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f}"
+              f" {result['p99_ms']:>9.2f} {result['rss_mib'] or 0:>9.1f} {errors:>7}", flush=True)
+    
+    async def contact_count(self) -> int:
+        """Number of stored contacts, as reported by the API."""
+        response = await self.client.get("/contacts/stats", headers=auth(MOCK_TOKEN))
+        return response.json()["acmecrm_stats"]["total_contacts"]
+    
+    async def seed(self, total: int) -> None:
+        """Top up the store to ``total`` contacts."""
+        missing = total - await self.contact_count()
+        while missing > 0:
+            count = min(missing, SEED_BATCH_SIZE)
+            ids = self.take_ids(count)
+            if self.in_process:
+                AcmeService.create_contacts([acme_contact(i) for i in ids])
+            else:
+                response = await self.client.post(
+                    "/contacts/bulk", params={"batch_size": count},
+                    json=[linq_contact(i) for i in ids], headers=auth(MOCK_TOKEN)
+                )
+                response.raise_for_status()
+            missing -= count
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    in_process = args.url is None
+    if in_process:
+        import main as api
+        await api.app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench")
+    else:
+        client = httpx.AsyncClient(
+            base_url=args.url, timeout=60.0,
+            limits=httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        )
+    
+    runner = Runner(client, args.concurrency, in_process, args.server_pid)
+    headers = auth(MOCK_TOKEN)
+    jwts = [AuthService.create_access_token({"sub": f"bench_user_{i}"}) for i in range(args.tokens)]
+    print(f"{'scenario':<14} {'req/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'RSS MiB':>9} {'errors':>7}")
+    try:
+        ids = runner.take_ids(args.requests)
+        await runner.scenario(
+            "create", args.requests,
+            lambda i: client.post("/contacts", json=linq_contact(ids[i]), headers=headers)
+        )
+        
+        bulk_ids = runner.take_ids(args.bulk_requests * args.bulk_size)
+        await runner.scenario(
+            "bulk", args.bulk_requests,
+            lambda i: client.post("/contacts/bulk", headers=headers, json=[
+                linq_contact(n) for n in bulk_ids[i * args.bulk_size:(i + 1) * args.bulk_size]
+            ])
+        )
+        
+        await runner.scenario("stats", args.requests, lambda i: client.get("/contacts/stats", headers=headers))
+        await runner.scenario(
+            "auth", args.requests,
+            lambda i: client.get("/contacts", params={"limit": 1}, headers=auth(jwts[i % len(jwts)]))
+        )
+        
+        for size in sorted(int(n) for n in args.sizes.split(",")):
+            await runner.seed(size)
+            await runner.scenario(
+                f"list_{size}", args.requests,
+                lambda i: client.get("/contacts", headers=headers, params={
+                    "limit": args.page_size, "after": AcmeService.encode_cursor(random.randrange(size))
+                })
+            )
+    finally:
+        await client.aclose()
+        if in_process:
+            await api.app.router.shutdown()
+    
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "target": args.url or "in-process",
+            "repository": os.getenv("ACME_REPOSITORY", "memory"),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "page_size": args.page_size,
+            "bulk_size": args.bulk_size,
+            "bulk_requests": args.bulk_requests
+        },
+        "scenarios": runner.results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput and p99 changes per scenario relative to a baseline run."""
+    before = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'scenario':<14} {'req/s':>9} {'p99':>9}")
+    for scenario in current["scenarios"]:
+        old = before.get(scenario["name"])
+        if old is None:
+            continue
+        throughput = (scenario["throughput"] / old["throughput"] - 1) * 100
+        p99 = (scenario["p99_ms"] / old["p99_ms"] - 1) * 100 if old["p99_ms"] else 0.0
+        print(f"{scenario['name']:<14} {throughput:>+8.1f}% {p99:>+8.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=None, help="Live server URL (default: in-process ASGI transport)")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of the live server, for its RSS")
+    parser.add_argument("--sizes", default="1000,100000,1000000", help="Comma-separated store sizes for list")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client workers")
+    parser.add_argument("--page-size", type=int, default=100, help="Contacts per list page")
+    parser.add_argument("--bulk-size", type=int, default=1000, help="Contacts per bulk request")
+    parser.add_argument("--bulk-requests", type=int, default=50, help="Requests in the bulk scenario")
+    parser.add_argument("--tokens", type=int, default=100, help="Distinct JWTs in the auth scenario")
+    parser.add_argument("--output", default="benchmark-results.json", help="File the JSON results are written to")
+    parser.add_argument("--compare", default=None, help="Previous results file to compare against")
+    args = parser.parse_args()
+    
+    results = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
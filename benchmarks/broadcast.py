@@ -0,0 +1,94 @@
+"""
+Load test the change broadcaster with thousands of concurrent subscribers.
+
+Creates contacts through AcmeService, so every message takes the real path
+(change feed, listener, one JSON encoding, fan-out), and measures how long each
+subscriber takes to receive it. A share of the subscribers never read, to show
+that they are dropped instead of growing memory.
+
+Usage:
+    python -m benchmarks.broadcast --subscribers 5000 --messages 200 --slow 0.05
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+from typing import Dict, List
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.broadcaster import Subscription
+from main import change_broadcaster, _publish_changes
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a contact without validation; only the fan-out is measured."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+        acme_phone_number=None, acme_company_name="Tech Corp", acme_notes=None
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value at a given fraction of the sorted samples."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def consume(subscription: Subscription, sent_at: Dict[int, float], latencies: List[float], count: int) -> None:
+    """Read ``count`` messages, recording the delay between each write and its receipt."""
+    for _ in range(count):
+        message = await subscription.get()
+        if message is None:
+            return
+        latencies.append(time.perf_counter() - sent_at[message[0]])
+
+
+async def run(subscribers: int, messages: int, slow_share: float, interval: float) -> None:
+    """Subscribe, publish one contact per interval, wait for every reader and print the results."""
+    broadcaster = change_broadcaster
+    AcmeService.add_change_listener(_publish_changes)
+    slow = int(subscribers * slow_share)
+    
+    sent_at: Dict[int, float] = {}
+    latencies: List[float] = []
+    idle = [broadcaster.subscribe() for _ in range(slow)]
+    readers = [
+        asyncio.create_task(consume(broadcaster.subscribe(), sent_at, latencies, messages))
+        for _ in range(subscribers - slow)
+    ]
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    
+    started = time.perf_counter()
+    for i in range(messages):
+        sent = time.perf_counter()
+        AcmeService.create_contact(make_contact(i))
+        sent_at[AcmeService.get_change_cursor()] = sent
+        await asyncio.sleep(interval)
+    await asyncio.gather(*readers)
+    elapsed = time.perf_counter() - started
+    
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    deliveries = len(latencies)
+    print(f"subscribers          : {subscribers} ({slow} never read)")
+    print(f"messages published   : {messages} in {elapsed:.2f} s")
+    print(f"deliveries           : {deliveries} ({deliveries / elapsed:,.0f}/s)")
+    print(f"latency p50/p95/p99  : {percentile(latencies, 0.5) * 1000:.2f} / "
+          f"{percentile(latencies, 0.95) * 1000:.2f} / {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"slow subscribers dropped: {sum(s.dropped for s in idle)} of {slow} "
+          f"(queue size {broadcaster.queue_size})")
+    print(f"peak RSS growth      : {(rss_after - rss_before) / 1024:.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=5000, help="Concurrent subscribers")
+    parser.add_argument("--messages", type=int, default=500, help="Contacts created (one message each)")
+    parser.add_argument("--slow", type=float, default=0.05, help="Share of subscribers that never read")
+    parser.add_argument("--interval", type=float, default=0.002, help="Seconds between writes")
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.messages, args.slow, args.interval))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Latency of other requests while a large bulk import runs, inline versus in the worker pool (ACME_BULK_WORKERS).
+
+Drives the app in-process through httpx.ASGITransport, so the import and
+the probe requests share one event loop just as in a server worker. A
+probe (GET /contacts?limit=1) is sent every --probe-interval-ms, first
+with no import running, then during a POST /contacts/bulk of --contacts
+contacts with validation and mapping inline, then with them in
+--workers worker processes. Reported are the probe latency percentiles
+and the import duration.
+
+Usage:
+    python -m benchmarks.bulk_offload --contacts 100000 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional
+import httpx
+from benchmarks.api import MOCK_TOKEN, auth, linq_contact, percentile
+from services.acme_service import AcmeService
+from services.bulk_service import BulkService
+
+
+async def probe(client: httpx.AsyncClient, interval: float, done: asyncio.Event) -> List[float]:
+    """
+    Send a cheap authenticated request every ``interval`` seconds until ``done`` is set.
+    
+    Latency counts from when the request was due, so time spent waiting for
+    a blocked event loop to send it is included, as a client would see it.
+    """
+    latencies: List[float] = []
+    while not done.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await client.get("/contacts", params={"limit": 1}, headers=auth(MOCK_TOKEN))
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - due)
+    return latencies
+
+
+async def measure(
+    client: httpx.AsyncClient, label: str, body: Optional[bytes], interval: float, idle_seconds: float
+) -> Dict[str, float]:
+    """Probe while importing ``body`` (or for ``idle_seconds`` when None) and print the latency percentiles."""
+    AcmeService.clear_storage()
+    done = asyncio.Event()
+    probing = asyncio.create_task(probe(client, interval, done))
+    # Let the probes get going, so one is in flight whenever the import holds the loop
+    await asyncio.sleep(interval)
+    started = time.perf_counter()
+    if body is None:
+        await asyncio.sleep(idle_seconds)
+    else:
+        response = await client.post(
+            "/contacts/bulk", params={"batch_size": BulkService.DEFAULT_BATCH_SIZE}, content=body,
+            headers={**auth(MOCK_TOKEN), "Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    done.set()
+    latencies = await probing
+    result = {
+        "probes": len(latencies),
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "import_s": elapsed
+    }
+    print(
+        f"{label:<18} {result['probes']:>7} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+        f"{result['max_ms']:>9.2f} {'-' if body is None else format(elapsed, '.2f'):>9}",
+        flush=True
+    )
+    return result
+
+
+async def run(args: argparse.Namespace) -> None:
+    import main as api
+    await api.app.router.startup()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://bench", timeout=600.0)
+    body = json.dumps([linq_contact(i) for i in range(args.contacts)]).encode()
+    interval = args.probe_interval_ms / 1000
+    
+    print(f"CPU cores: {os.cpu_count()}, {args.contacts} contacts, {len(body) / 1024 / 1024:.1f} MiB body")
+    print(f"{'run':<18} {'probes':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'import s':>9}")
+    try:
+        await measure(client, "idle", None, interval, idle_seconds=2.0)
+        BulkService.stop_pool()
+        await measure(client, "import inline", body, interval, 0)
+        started = time.perf_counter()
+        await asyncio.to_thread(BulkService.start_pool, args.workers)
+        print(f"  pool of {args.workers} started and warmed in {time.perf_counter() - started:.2f} s")
+        await measure(client, f"import {args.workers} workers", body, interval, 0)
+    finally:
+        BulkService.stop_pool()
+        await client.aclose()
+        await api.app.router.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=100_000, help="Contacts in the bulk import")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for the offloaded run")
+    parser.add_argument("--probe-interval-ms", type=float, default=5.0, help="Pause between probe requests")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
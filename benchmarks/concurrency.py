@@ -0,0 +1,170 @@
+"""
+Stress and throughput test for concurrent writers against AcmeService.
+
+The stress phase runs writer threads (creates, status updates, deletes)
+alongside reader threads (page listings, full listings, stats) and checks
+that no call fails and that listings, stats and the change feed agree with
+what the writers did. The throughput phase measures write operations per
+second as the number of writer threads grows.
+
+Usage:
+    python -m benchmarks.concurrency --writers 1,2,4,8 --ops 20000 --backend memory
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Callable, List
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.contact_repository import ContactRepository, InMemoryContactRepository
+from services.sqlite_repository import SQLiteContactRepository
+from services.shared_repository import SharedContactRepository
+
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a contact without validation; only storage is measured."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+        acme_phone_number=None, acme_company_name=COMPANIES[i % len(COMPANIES)], acme_notes=None
+    )
+
+
+def run_threads(count: int, target: Callable[[int], None]) -> float:
+    """Run ``target(thread number)`` on ``count`` threads and return the elapsed seconds."""
+    threads = [threading.Thread(target=target, args=(n,)) for n in range(count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def stress(writers: int, readers: int, ops: int) -> None:
+    """Mix concurrent writes and reads, then check the store against what the writers did."""
+    AcmeService.clear_storage()
+    first_change = AcmeService.get_change_cursor()
+    errors: List[BaseException] = []
+    done = threading.Event()
+    writes = Counter()
+    lock = threading.Lock()
+    
+    def writer(n: int) -> None:
+        rng = random.Random(n)
+        mine: List[str] = []
+        done_here = Counter()
+        try:
+            for i in range(ops // writers):
+                roll = rng.random()
+                if roll < 0.6 or not mine:
+                    mine.append(AcmeService.create_contact(make_contact(n * ops + i)).acme_contact_id)
+                    done_here["create"] += 1
+                elif roll < 0.85:
+                    if AcmeService.update_contact_status(rng.choice(mine), rng.choice(["active", "inactive"])):
+                        done_here["status"] += 1
+                elif AcmeService.delete_contact(mine.pop(rng.randrange(len(mine)))):
+                    done_here["delete"] += 1
+        except BaseException as exc:
+            errors.append(exc)
+        with lock:
+            writes.update(done_here)
+    
+    def reader(n: int) -> None:
+        rng = random.Random(-n)
+        try:
+            while not done.is_set():
+                roll = rng.random()
+                if roll < 0.5:
+                    AcmeService.get_contacts_page(100, after=rng.randrange(max(1, ops)))
+                elif roll < 0.6:
+                    AcmeService.get_all_contacts()
+                elif roll < 0.8:
+                    stats = AcmeService.get_storage_stats()
+                    if sum(stats["contacts_by_status"].values()) != stats["total_contacts"]:
+                        raise AssertionError(f"Inconsistent stats snapshot: {stats}")
+                else:
+                    AcmeService.get_contacts_page(100, status="inactive")
+        except BaseException as exc:
+            errors.append(exc)
+    
+    reader_threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    for thread in reader_threads:
+        thread.start()
+    elapsed = run_threads(writers, writer)
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+    
+    contacts = AcmeService.get_all_contacts()
+    stats = AcmeService.get_storage_stats()
+    changes = AcmeService.get_changes(first_change, sum(writes.values()) + 1) or []
+    checks = {
+        "no errors": not errors,
+        "listing matches creates - deletes": len(contacts) == writes["create"] - writes["delete"],
+        "stats match listing": stats["total_contacts"] == len(contacts)
+        and stats["contacts_by_status"] == dict(Counter(contact.acme_status for contact in contacts)),
+        "change feed has every write": len(changes) == sum(writes.values()),
+        "change feed is consecutive": all(b.seq == a.seq + 1 for a, b in zip(changes, changes[1:])),
+    }
+    
+    print(f"stress: {writers} writers, {readers} readers, {sum(writes.values())} writes in {elapsed:.2f} s "
+          f"({dict(writes)})")
+    for name, passed in checks.items():
+        print(f"  {'ok  ' if passed else 'FAIL'} {name}")
+    for exc in errors[:3]:
+        print(f"  error: {exc!r}")
+
+
+def throughput(writer_counts: List[int], ops: int) -> None:
+    """Measure write operations per second (creates with a status update each) per writer count."""
+    print(f"{'writers':>7} {'writes/s':>10} {'speedup':>8}")
+    baseline = None
+    for writers in writer_counts:
+        AcmeService.clear_storage()
+        per_thread = ops // writers
+        
+        def writer(n: int) -> None:
+            for i in range(per_thread // 2):
+                contact = AcmeService.create_contact(make_contact(n * ops + i))
+                AcmeService.update_contact_status(contact.acme_contact_id, "inactive")
+        
+        rate = per_thread // 2 * 2 * writers / run_threads(writers, writer)
+        baseline = baseline or rate
+        print(f"{writers:>7} {rate:>10.0f} {rate / baseline:>7.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", default="1,2,4,8", help="Comma-separated writer thread counts")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads during the stress phase")
+    parser.add_argument("--ops", type=int, default=20_000, help="Write operations per measurement")
+    parser.add_argument("--backend", choices=["memory", "sqlite", "shared"], default="memory", help="Contact repository")
+    args = parser.parse_args()
+    writer_counts = [int(n) for n in args.writers.split(",")]
+    
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, backend {args.backend}")
+    with tempfile.TemporaryDirectory() as directory:
+        repository: ContactRepository = InMemoryContactRepository()
+        if args.backend == "sqlite":
+            repository = SQLiteContactRepository(os.path.join(directory, "contacts.db"))
+        elif args.backend == "shared":
+            repository = SharedContactRepository(os.path.join(directory, "contacts.shm"))
+        AcmeService.use_repository(repository)
+        try:
+            stress(max(writer_counts), args.readers, args.ops)
+            throughput(writer_counts, args.ops)
+        finally:
+            AcmeService.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compare the compiled FieldMapper against re-validating model construction, in both directions.
+
+Usage:
+    python -m benchmarks.field_mapping --count 100000
+"""
+
+import argparse
+import time
+from typing import Callable, List
+from models.acme_models import AcmeContact
+from models.linq_models import LinqContact
+from services.field_mapper import FieldMapper
+
+
+def make_linq_contacts(count: int) -> List[LinqContact]:
+    """Build validated Linq contacts, as the API would receive them."""
+    return [
+        LinqContact(
+            firstName=f"First{i}", lastName=f"Last{i}", email=f"contact{i}@example.com",
+            phone=f"+1-555-{i % 10_000_000:07d}", company="Tech Corp",
+            notes="Met at networking event" if i % 3 == 0 else None
+        )
+        for i in range(count)
+    ]
+
+
+def revalidate_linq_to_acme(linq_contact: LinqContact) -> AcmeContact:
+    """The previous mapping: dump, rename keys, then construct with full validation."""
+    linq_dict = linq_contact.model_dump()
+    return AcmeContact(**{
+        acme_field: linq_dict[linq_field] for linq_field, acme_field in FieldMapper.LINQ_TO_ACME_MAPPING.items()
+    })
+
+
+def revalidate_acme_to_linq(acme_contact: AcmeContact) -> LinqContact:
+    """The previous reverse mapping, with full validation."""
+    acme_dict = acme_contact.model_dump()
+    return LinqContact(**{
+        linq_field: acme_dict[acme_field] for acme_field, linq_field in FieldMapper.ACME_TO_LINQ_MAPPING.items()
+    })
+
+
+def measure(label: str, mapper: Callable[[List], List], contacts: List) -> float:
+    """Map every contact once and print the elapsed time and rate."""
+    started = time.perf_counter()
+    mapper(contacts)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<32} {elapsed * 1000:>9.1f} ms {len(contacts) / elapsed:>12.0f} contacts/s")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="Contacts mapped per measurement")
+    args = parser.parse_args()
+    
+    linq_contacts = make_linq_contacts(args.count)
+    acme_contacts = FieldMapper.map_linq_to_acme_many(linq_contacts)
+    
+    before = measure("linq->acme re-validating", lambda c: [revalidate_linq_to_acme(x) for x in c], linq_contacts)
+    single = measure("linq->acme compiled", lambda c: [FieldMapper.map_linq_to_acme(x) for x in c], linq_contacts)
+    batch = measure("linq->acme compiled batch", FieldMapper.map_linq_to_acme_many, linq_contacts)
+    print(f"  speedup {before / single:.1f}x single, {before / batch:.1f}x batch")
+    
+    before = measure("acme->linq re-validating", lambda c: [revalidate_acme_to_linq(x) for x in c], acme_contacts)
+    single = measure("acme->linq compiled", lambda c: [FieldMapper.map_acme_to_linq(x) for x in c], acme_contacts)
+    batch = measure("acme->linq compiled batch", FieldMapper.map_acme_to_linq_many, acme_contacts)
+    print(f"  speedup {before / single:.1f}x single, {before / batch:.1f}x batch")
+
+
+if __name__ == "__main__":
+    main()
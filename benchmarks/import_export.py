@@ -0,0 +1,179 @@
+"""
+Peak memory of streamed CSV / NDJSON imports and exports as the file grows.
+
+Calls the ASGI app directly, so upload bodies are generated and exports
+discarded chunk by chunk; httpx's ASGI transport would hold the whole
+body in memory and hide what the server itself needs. For every size,
+POST /contacts/import ingests a generated file and GET /contacts/export
+streams every contact back out while a thread samples resident memory.
+Reported is the peak resident memory of each run; freed memory stays with
+the process, so the peak only stays flat across sizes if no run needs more
+than the last. Contacts go to a SQLite database by default so the store's
+own growth does not count (--backend memory includes it). The change feed
+keeps the most recent 100k changes with their contacts, so memory grows
+until an import passes that many contacts.
+
+Usage:
+    python -m benchmarks.import_export --sizes 10000,50000,200000 --format csv
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+from benchmarks.api import COMPANIES, MOCK_TOKEN, rss_mib
+
+# Size of the upload chunks, close to what an ASGI server hands the app
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def generate_file(count: int, format: str) -> Iterator[bytes]:
+    """Yield a CSV or NDJSON file of ``count`` Linq contacts in chunks of about UPLOAD_CHUNK_BYTES."""
+    lines: List[str] = ["firstName,lastName,email,phone,company,notes\n"] if format == "csv" else []
+    size = 0
+    for i in range(count):
+        company = COMPANIES[i % len(COMPANIES)]
+        if format == "csv":
+            line = f"First{i},Last{i},contact{i}@example.com,+1-555-{i % 10_000_000:07d},{company},\n"
+        else:
+            line = (
+                f'{{"firstName":"First{i}","lastName":"Last{i}","email":"contact{i}@example.com",'
+                f'"phone":"+1-555-{i % 10_000_000:07d}","company":"{company}"}}\n'
+            )
+        lines.append(line)
+        size += len(line)
+        if size >= UPLOAD_CHUNK_BYTES:
+            yield "".join(lines).encode()
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines).encode()
+
+
+async def call(app: Any, method: str, path: str, query: str, headers: Dict[str, str], body: Iterator[bytes]) -> Tuple[int, int, bytes]:
+    """
+    Send one request straight to an ASGI app.
+    
+    Returns:
+        Tuple of (status code, response body size, first response chunk)
+    """
+    chunks = iter(body)
+    next_chunk = next(chunks, None)
+    body_sent = False
+    disconnected = asyncio.Event()
+    status_code, size, first = 0, 0, b""
+    
+    async def receive() -> Dict[str, Any]:
+        nonlocal next_chunk, body_sent
+        if body_sent:
+            # Block like a client that stays connected until the response is complete
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+        chunk, next_chunk = next_chunk, next(chunks, None)
+        body_sent = next_chunk is None
+        return {"type": "http.request", "body": chunk or b"", "more_body": not body_sent}
+    
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status_code, size, first
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            data = message.get("body", b"")
+            first = first or data
+            size += len(data)
+    
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80)
+    }
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return status_code, size, first
+
+
+class PeakRSS:
+    """Sample resident memory on a thread and keep the highest value."""
+    
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.peak = 0.0
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+    
+    def _sample(self) -> None:
+        while not self._done.is_set():
+            self.peak = max(self.peak, rss_mib() or 0.0)
+            time.sleep(self.interval)
+    
+    def __enter__(self) -> "PeakRSS":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self._done.set()
+        self._thread.join()
+
+
+async def run(args: argparse.Namespace) -> None:
+    import main as api
+    from services.acme_service import AcmeService
+    from services.sqlite_repository import SQLiteContactRepository
+    
+    directory = tempfile.mkdtemp()
+    if args.backend == "sqlite":
+        AcmeService.use_repository(SQLiteContactRepository(os.path.join(directory, "contacts.db")))
+    await api.app.router.startup()
+    auth = {"Authorization": f"Bearer {MOCK_TOKEN}"}
+    content_type = "text/csv" if args.format == "csv" else "application/x-ndjson"
+    
+    print(f"backend {args.backend}, format {args.format}, RSS at start {rss_mib()} MiB")
+    print(f"{'contacts':>9} {'file MiB':>9} {'import s':>9} {'peak MiB':>9} {'export s':>9} {'peak MiB':>9}")
+    try:
+        for count in (int(n) for n in args.sizes.split(",")):
+            AcmeService.clear_storage()
+            file_size = sum(len(chunk) for chunk in generate_file(count, args.format))
+            
+            started = time.perf_counter()
+            with PeakRSS() as imported:
+                status_code, _, body = await call(
+                    api.app, "POST", "/contacts/import", "", {**auth, "Content-Type": content_type},
+                    generate_file(count, args.format)
+                )
+            import_seconds = time.perf_counter() - started
+            if status_code != 200:
+                raise RuntimeError(f"Import failed with {status_code}: {body[:200]!r}")
+            
+            started = time.perf_counter()
+            with PeakRSS() as exported:
+                status_code, _, _ = await call(
+                    api.app, "GET", "/contacts/export", f"format={args.format}", auth, iter(())
+                )
+            export_seconds = time.perf_counter() - started
+            if status_code != 200:
+                raise RuntimeError(f"Export failed with {status_code}")
+            
+            print(
+                f"{count:>9} {file_size / 1024 / 1024:>9.1f} {import_seconds:>9.2f} "
+                f"{imported.peak:>9.1f} {export_seconds:>9.2f} {exported.peak:>9.1f}",
+                flush=True
+            )
+    finally:
+        await api.app.router.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,50000,200000", help="Comma-separated contact counts")
+    parser.add_argument("--format", choices=["csv", "ndjson"], default="csv", help="File format")
+    parser.add_argument("--backend", choices=["sqlite", "memory"], default="sqlite", help="Contact repository")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare bytes per contact for the dict and columnar contact store layouts.
+
+Usage:
+    python -m benchmarks.memory_footprint --count 1000000
+"""
+
+import argparse
+import gc
+import tracemalloc
+import uuid
+from datetime import datetime
+from models.acme_models import AcmeContact
+from services.contact_store import CONTACT_STORES
+
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+BATCH_SIZE = 10_000
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a realistic contact (validation is skipped; it does not affect the stored size)."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}",
+        acme_last_name=f"Last{i}",
+        acme_email=f"contact{i}@example.com",
+        acme_phone_number=f"+1-555-{i % 10_000_000:07d}",
+        acme_company_name=COMPANIES[i % len(COMPANIES)],
+        acme_notes="Met at networking event" if i % 3 == 0 else None
+    )
+
+
+def measure(layout: str, count: int) -> float:
+    """
+    Fill an empty store of the given layout and return the retained bytes per contact.
+    
+    Args:
+        layout: Key of CONTACT_STORES
+        count: Number of contacts to insert
+        
+    Returns:
+        Bytes of traced memory retained per contact
+    """
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    
+    store = CONTACT_STORES[layout]()
+    for start in range(0, count, BATCH_SIZE):
+        stop = min(start + BATCH_SIZE, count)
+        contact_ids = [f"acme_{str(uuid.uuid4())[:8]}" for _ in range(start, stop)]
+        contacts = [make_contact(i) for i in range(start, stop)]
+        store.insert_many(contact_ids, contacts, datetime.utcnow().isoformat() + "Z", "active")
+        del contact_ids, contacts
+    
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del store
+    return retained / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Contacts to insert per layout")
+    args = parser.parse_args()
+    
+    results = {layout: measure(layout, args.count) for layout in CONTACT_STORES}
+    print(f"{'layout':<10} {'bytes/contact':>14} {'total MiB':>10}")
+    for layout, per_contact in results.items():
+        print(f"{layout:<10} {per_contact:>14.1f} {per_contact * args.count / 2**20:>10.1f}")
+    print(f"columnar uses {results['columnar'] / results['dict']:.0%} of the dict layout")
+
+
+if __name__ == "__main__":
+    main()
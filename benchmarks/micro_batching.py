@@ -0,0 +1,77 @@
+"""
+Measure how the create micro-batching window trades p99 latency for throughput.
+
+Creates arrive at a fixed rate (open loop, like independent POST /contacts
+requests) and go through an AcmeClient talking to the stand-in AcmeCRM
+(acme_server.py) with an injected round-trip latency: once with one upstream
+call per contact, then through a CreateBatcher for each flush window.
+
+Usage:
+    python -m benchmarks.micro_batching --latency 20 --windows 0,1,2,5,10 --batch-size 100 --rates 300,1500
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List
+from acme_server import create_app
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.acme_client import AcmeClient
+from services.create_batcher import CreateBatcher
+from benchmarks.upstream import ThreadedASGITransport, make_contact, percentile
+
+
+async def measure(
+    create: Callable[[AcmeContact], Awaitable[AcmeContactResponse]], contacts: List[AcmeContact], rate: float
+) -> str:
+    """Start one create every 1/rate seconds (open loop) and format achieved throughput and latency."""
+    latencies: List[float] = []
+    
+    async def timed(contact: AcmeContact) -> None:
+        started = time.perf_counter()
+        await create(contact)
+        latencies.append(time.perf_counter() - started)
+    
+    tasks = []
+    started = time.perf_counter()
+    for i, contact in enumerate(contacts):
+        delay = started + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(timed(contact)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    return (f"{len(contacts) / elapsed:>9.0f} {percentile(latencies, 0.5) * 1000:>8.1f}"
+            f" {percentile(latencies, 0.99) * 1000:>8.1f}")
+
+
+async def run(latency_ms: float, windows: List[float], batch_size: int, rates: List[float], requests: int) -> None:
+    contacts = [make_contact(i) for i in range(requests)]
+    transport = ThreadedASGITransport(create_app(latency_ms=latency_ms))
+    async with AcmeClient("http://acme", transport=transport) as client:
+        for rate in rates:
+            print(f"upstream latency {latency_ms:.0f} ms, {rate:.0f} creates/s offered, {requests} creates")
+            print(f"{'window':>10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'avg batch':>9}")
+            print(f"{'off':>10} {await measure(client.create_contact, contacts, rate)} {1:>9.1f}")
+            for window_ms in windows:
+                batcher = CreateBatcher(client.create_contacts, max_batch_size=batch_size, max_latency=window_ms / 1000)
+                result = await measure(batcher.submit, contacts, rate)
+                await batcher.aclose()
+                print(f"{window_ms:>8.0f}ms {result} {batcher.contacts / batcher.batches:>9.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=20.0, help="Injected upstream round-trip latency in ms")
+    parser.add_argument("--windows", default="0,1,2,5,10", help="Comma-separated flush windows in ms")
+    parser.add_argument("--batch-size", type=int, default=100, help="Maximum contacts per batch")
+    parser.add_argument("--rates", default="300,1500", help="Comma-separated offered create rates per second")
+    parser.add_argument("--requests", type=int, default=3000, help="Creates per measurement")
+    args = parser.parse_args()
+    windows = [float(n) for n in args.windows.split(",")]
+    rates = [float(n) for n in args.rates.split(",")]
+    asyncio.run(run(args.latency, windows, args.batch_size, rates, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark journal write throughput and cold-start recovery time.
+
+Usage:
+    python -m benchmarks.persistence --writes 20000 --threads 16 --contacts 1000000
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.contact_store import create_contact_store
+from services.persistence import ContactJournal
+
+RECORD = {"op": "status", "id": "acme_0000abcd", "status": "inactive"}
+
+
+def run_threads(threads: int, writes: int, write) -> float:
+    """Run ``writes`` calls of ``write`` spread over ``threads`` threads and return writes per second."""
+    per_thread = writes // threads
+    workers = [
+        threading.Thread(target=lambda: [write() for _ in range(per_thread)])
+        for _ in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def bench_fsync_per_write(directory: str, threads: int, writes: int) -> float:
+    """Baseline: every write is followed by its own fsync."""
+    lock = threading.Lock()
+    with open(os.path.join(directory, "baseline.log"), "ab") as f:
+        def write() -> None:
+            with lock:
+                f.write(b'{"op":"status","id":"acme_0000abcd","status":"inactive"}\n')
+                f.flush()
+                os.fsync(f.fileno())
+        return run_threads(threads, writes, write)
+
+
+def bench_group_commit(directory: str, threads: int, writes: int) -> float:
+    """ContactJournal with sync_commit: writers wait for a shared fsync."""
+    journal = ContactJournal(os.path.join(directory, "group"), sync_commit=True)
+    try:
+        return run_threads(threads, writes, lambda: journal.append(RECORD))
+    finally:
+        journal.close()
+
+
+def bench_cold_start(directory: str, contacts: int, layout: str) -> float:
+    """Persist ``contacts`` contacts, snapshot, then time a full restore."""
+    data_dir = os.path.join(directory, f"cold-{layout}")
+    AcmeService.use_store(create_contact_store(layout))
+    AcmeService.enable_persistence(data_dir, snapshot_every=10**12)
+    for start in range(0, contacts, 10_000):
+        AcmeService.create_contacts([
+            AcmeContact.model_construct(
+                acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+                acme_phone_number=None, acme_company_name=f"Company{i % 500}", acme_notes=None
+            )
+            for i in range(start, min(start + 10_000, contacts))
+        ])
+    AcmeService._repository._journal.snapshot()
+    # Leave a short log tail after the snapshot, as in a real restart
+    for contact_id in AcmeService.find_contact_ids(company="Company1")[:100]:
+        AcmeService.update_contact_status(contact_id, "inactive")
+    AcmeService.disable_persistence()
+    
+    AcmeService.use_store(create_contact_store(layout))
+    started = time.perf_counter()
+    AcmeService.enable_persistence(data_dir)
+    elapsed = time.perf_counter() - started
+    assert AcmeService.get_storage_stats()["total_contacts"] == contacts
+    AcmeService.disable_persistence()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=20_000, help="Journal writes per write benchmark")
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent writer threads")
+    parser.add_argument("--contacts", type=int, default=1_000_000, help="Contacts restored in the cold-start benchmark")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = bench_fsync_per_write(directory, args.threads, args.writes)
+        grouped = bench_group_commit(directory, args.threads, args.writes)
+        print(f"fsync per write : {baseline:>10.0f} writes/s")
+        print(f"group commit    : {grouped:>10.0f} writes/s ({grouped / baseline:.1f}x)")
+        for layout in ("dict", "columnar"):
+            elapsed = bench_cold_start(directory, args.contacts, layout)
+            print(f"cold start {layout:<8}: {elapsed:>6.2f} s for {args.contacts} contacts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compare create, get and list throughput of the in-memory and SQLite repositories under concurrency.
+
+Usage:
+    python -m benchmarks.repositories --contacts 100000 --ops 20000 --threads 1,8,32
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+from models.acme_models import AcmeContact
+from services.contact_repository import ContactRepository, InMemoryContactRepository
+from services.sqlite_repository import SQLiteContactRepository
+
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+BATCH_SIZE = 10_000
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a realistic contact (validation is skipped; it is the same for every backend)."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}",
+        acme_last_name=f"Last{i}",
+        acme_email=f"contact{i}@example.com",
+        acme_phone_number=f"+1-555-{i % 10_000_000:07d}",
+        acme_company_name=COMPANIES[i % len(COMPANIES)],
+        acme_notes=None
+    )
+
+
+def now() -> str:
+    """Return a creation timestamp in the format AcmeService uses."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def run_threads(threads: int, ops: int, op: Callable[[int], None]) -> float:
+    """Run ``ops`` calls of ``op`` spread over ``threads`` threads and return operations per second."""
+    per_thread = ops // threads
+    
+    def worker(offset: int) -> None:
+        for i in range(offset, offset + per_thread):
+            op(i)
+    
+    workers = [threading.Thread(target=worker, args=(n * per_thread,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - started)
+
+
+def bench(repository: ContactRepository, contacts: int, ops: int, threads: int) -> Dict[str, float]:
+    """
+    Measure one repository at one concurrency level.
+    
+    Args:
+        repository: Empty repository to fill and query
+        contacts: Contacts loaded before the read benchmarks
+        ops: Operations per measurement
+        threads: Concurrent worker threads
+        
+    Returns:
+        Operations per second by operation name
+    """
+    started = time.perf_counter()
+    for start in range(0, contacts, BATCH_SIZE):
+        batch = [make_contact(i) for i in range(start, min(start + BATCH_SIZE, contacts))]
+        repository.insert(batch, now(), "active")
+    results = {"load": contacts / (time.perf_counter() - started)}
+    
+    contact_ids: List[str] = [contact.acme_contact_id for _, contact in repository.iter_contacts()]
+    
+    def create(i: int) -> None:
+        repository.insert([make_contact(contacts + i)], now(), "active")
+    
+    def get(i: int) -> None:
+        contact_id = contact_ids[random.randrange(len(contact_ids))]
+        repository.get(contact_id)
+    
+    def list_page(i: int) -> None:
+        # A 100-contact page from a random offset, as a client paging with a cursor would fetch it
+        after = random.randrange(contacts)
+        for _ in zip(range(100), repository.iter_contacts(after)):
+            pass
+    
+    def list_filtered(i: int) -> None:
+        iterator = repository.iter_contacts(company=COMPANIES[i % len(COMPANIES)], status="active")
+        for _ in zip(range(100), iterator):
+            pass
+    
+    results["create"] = run_threads(threads, ops, create)
+    results["get"] = run_threads(threads, ops, get)
+    results["list"] = run_threads(threads, ops // 10, list_page)
+    results["list filtered"] = run_threads(threads, ops // 10, list_filtered)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=100_000, help="Contacts loaded before the read benchmarks")
+    parser.add_argument("--ops", type=int, default=20_000, help="Operations per measurement")
+    parser.add_argument("--threads", default="1,8,32", help="Comma-separated concurrency levels")
+    args = parser.parse_args()
+    
+    print(f"{'backend':<8} {'threads':>7} {'load/s':>10} {'create/s':>10} {'get/s':>10} {'list/s':>10} {'filtered/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in (int(n) for n in args.threads.split(",")):
+            memory = InMemoryContactRepository()
+            sqlite = SQLiteContactRepository(os.path.join(directory, f"contacts-{threads}.db"), pool_size=threads)
+            for name, repository in (("memory", memory), ("sqlite", sqlite)):
+                try:
+                    r = bench(repository, args.contacts, args.ops, threads)
+                finally:
+                    repository.close()
+                print(f"{name:<8} {threads:>7} {r['load']:>10.0f} {r['create']:>10.0f} {r['get']:>10.0f}"
+                      f" {r['list']:>10.0f} {r['list filtered']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
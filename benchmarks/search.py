@@ -0,0 +1,140 @@
+"""
+Build time, memory and query latency of the contact search index.
+
+Seeds --contacts contacts straight into the in-memory repository, with
+first names, last names, companies and note words drawn from fixed pools
+so the vocabulary grows the way real names do (a unique name per contact
+would make every name a new prefix word). Then times a full index build,
+the cost of a create with incremental indexing, and AcmeService.search_contacts
+(the work behind GET /contacts/search, including reading the returned
+contacts) for several kinds of type-ahead queries, reporting p50 / p99.
+
+Usage:
+    python -m benchmarks.search --contacts 1000000 --queries 200
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, List
+from benchmarks.api import percentile, rss_mib
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+
+FIRST_NAMES = [
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "William", "Elizabeth",
+    "David", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Charles", "Karen",
+    "Christopher", "Nancy", "Daniel", "Lisa", "Matthew", "Betty", "Anthony", "Margaret", "Mark", "Sandra",
+    "Donald", "Ashley", "Steven", "Kimberly", "Paul", "Emily", "Andrew", "Donna", "Joshua", "Michelle",
+    "Kenneth", "Dorothy", "Kevin", "Carol", "Brian", "Amanda", "George", "Melissa", "Edward", "Deborah",
+    "José", "Zoë", "Aarav", "Mei", "Olu", "Ingrid", "Siobhan", "Yusuf", "Priya", "Lukas"
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson",
+    "Walker", "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores",
+    "Green", "Adams", "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts",
+    "O'Brien", "Müller", "Kowalski", "Tanaka", "Okafor", "Johansson", "Dubois", "Rossi", "Singh", "Chen"
+]
+COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Tyrell", "Cyberdyne", "Soylent",
+    "Vandelay", "Wonka", "Gringotts", "Oscorp", "Monarch", "Aperture", "Massive", "Dynamic", "Blue", "Northwind"
+]
+COMPANY_KINDS = ["Labs", "Systems", "Industries", "Logistics", "Foods", "Capital", "Health", "Media", "Energy", "Robotics"]
+NOTE_WORDS = [
+    "met", "at", "conference", "wants", "demo", "pricing", "follow", "up", "next", "quarter", "renewal",
+    "referred", "by", "partner", "enterprise", "trial", "churn", "risk", "budget", "approved", "q3", "q4",
+    "integration", "api", "onboarding", "webinar", "lead", "warm", "cold", "call", "email", "linkedin"
+]
+DOMAINS = ["example.com", "mail.com", "corp.io", "inbox.net"]
+
+# Results requested per query, as a type-ahead dropdown would
+RESULT_LIMIT = 20
+
+
+def make_contact(i: int, rng: random.Random) -> AcmeContact:
+    """Build a contact without validation; only indexing and search are measured."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    # A few thousand companies, most named after one word and a kind
+    company_id = int(rng.paretovariate(1.2)) % 4000
+    company = f"{COMPANY_WORDS[company_id % 20]} {COMPANY_KINDS[company_id // 20 % 10]} {company_id // 200 or ''}".strip()
+    notes = " ".join(rng.choice(NOTE_WORDS) for _ in range(rng.randint(3, 12))) if rng.random() < 0.6 else None
+    local = f"{first}.{last}".lower().replace("'", "")
+    return AcmeContact.model_construct(
+        acme_first_name=first, acme_last_name=last, acme_email=f"{local}{i}@{rng.choice(DOMAINS)}",
+        acme_phone_number=None, acme_company_name=company, acme_notes=notes
+    )
+
+
+def make_queries(count: int, rng: random.Random, emails: List[str]) -> Dict[str, List[str]]:
+    """Type-ahead queries by kind, ``count`` of each."""
+    def first() -> str:
+        return rng.choice(FIRST_NAMES)
+    
+    def last() -> str:
+        return rng.choice(LAST_NAMES)
+    
+    return {
+        "1-letter prefix": [first()[0] for _ in range(count)],
+        "3-letter prefix": [first()[:3] for _ in range(count)],
+        "first name": [first() for _ in range(count)],
+        "first last": [f"{first()} {last()}" for _ in range(count)],
+        "first + 2 letters": [f"{first()} {last()[:2]}" for _ in range(count)],
+        "company prefix": [f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_KINDS)[:3]}" for _ in range(count)],
+        "email": [rng.choice(emails) for _ in range(count)],
+        "note words": [f"{rng.choice(NOTE_WORDS)} {rng.choice(NOTE_WORDS)}" for _ in range(count)],
+        "no match": [f"zz{i}" for i in range(count)]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--contacts", type=int, default=1_000_000, help="Contacts seeded before measuring")
+    parser.add_argument("--queries", type=int, default=200, help="Queries of each kind")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the generated contacts and queries")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    
+    AcmeService.clear_storage()
+    repository = AcmeService._repository
+    started = time.perf_counter()
+    emails: List[str] = []
+    for start in range(0, args.contacts, 10_000):
+        batch = [make_contact(i, rng) for i in range(start, min(start + 10_000, args.contacts))]
+        repository.insert(batch, "2025-07-25T16:38:00Z", "active")
+        emails += [contact.acme_email for contact in batch[:10]]
+    print(f"Seeded {len(repository)} contacts in {time.perf_counter() - started:.1f} s, RSS {rss_mib()} MiB")
+    
+    rss_before = rss_mib()
+    started = time.perf_counter()
+    stats = AcmeService.sync_search_index()
+    build_seconds = time.perf_counter() - started
+    rss_after = rss_mib()
+    print(
+        f"Index build: {build_seconds:.1f} s ({args.contacts / build_seconds:,.0f} contacts/s), "
+        f"{stats['prefix_words']} prefix words, RSS +{(rss_after or 0) - (rss_before or 0):.0f} MiB"
+    )
+    
+    creates = [make_contact(args.contacts + i, rng) for i in range(1000)]
+    started = time.perf_counter()
+    for contact in creates:
+        AcmeService.create_contact(contact)
+    print(f"Create with incremental indexing: {(time.perf_counter() - started) / len(creates) * 1e6:.0f} us")
+    
+    print(f"{'query':<18} {'p50 ms':>8} {'p99 ms':>8} {'results':>8}")
+    for kind, queries in make_queries(args.queries, rng, emails).items():
+        latencies, results = [], 0
+        for query in queries:
+            started = time.perf_counter()
+            results += len(AcmeService.search_contacts(query, RESULT_LIMIT))
+            latencies.append(time.perf_counter() - started)
+        print(
+            f"{kind:<18} {percentile(latencies, 0.50) * 1000:>8.2f} {percentile(latencies, 0.99) * 1000:>8.2f} "
+            f"{results / len(queries):>8.1f}",
+            flush=True
+        )
+
+
+if __name__ == "__main__":
+    main()
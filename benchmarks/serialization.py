@@ -0,0 +1,133 @@
+"""
+Compare FastAPI's default response encoding with the opt-in fast JSON path (ACME_FAST_JSON).
+
+The default path re-validates the returned model against the route's
+response_model, converts it to dicts, then encodes with json.dumps;
+FastJSONResponse encodes the model once with pydantic-core (or plain data
+with orjson). Measured for a bulk import result and a change feed page
+holding --sizes contacts, and for the stats dictionary.
+
+Usage:
+    python -m benchmarks.serialization --sizes 10000,100000
+"""
+
+import argparse
+import time
+from typing import Any, Callable, Coroutine, Optional
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from models.linq_models import (
+    LinqBulkContactResponse,
+    LinqBulkItemResult,
+    LinqContact,
+    LinqContactChange,
+    LinqContactChangesResponse,
+)
+from services.json_response import ORJSON_AVAILABLE, FastJSONResponse
+
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+def bulk_response(count: int) -> LinqBulkContactResponse:
+    """Build the result of a bulk import of ``count`` contacts."""
+    return LinqBulkContactResponse(
+        success=True, total=count, created=count, failed=0, batch_size=1000, elapsed_ms=1.0,
+        contacts_per_second=1.0,
+        results=[LinqBulkItemResult(index=i, success=True, contact_id=f"acme_{i:08x}") for i in range(count)]
+    )
+
+
+def changes_response(count: int) -> LinqContactChangesResponse:
+    """Build a change feed page of ``count`` creates, each carrying its contact."""
+    return LinqContactChangesResponse(
+        resync_required=False, next_since=count, has_more=False,
+        changes=[
+            LinqContactChange(
+                seq=i, op="create", contact_id=f"acme_{i:08x}", status="active", changed_at="2025-07-25T16:38:00Z",
+                contact=LinqContact.model_construct(
+                    firstName=f"First{i}", lastName=f"Last{i}", email=f"contact{i}@example.com",
+                    phone=f"+1-555-{i % 10_000_000:07d}", company=COMPANIES[i % len(COMPANIES)],
+                    notes="Met at networking event" if i % 3 == 0 else None
+                )
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def stats_response(companies: int) -> dict:
+    """Build a GET /contacts/stats body."""
+    return {
+        "user": "demo_user",
+        "acmecrm_stats": {
+            "total_contacts": 1_000_000,
+            "status_counts": {"active": 990_000, "inactive": 10_000},
+            "top_companies": [{"company": f"Company {i}", "contacts": 1000 - i} for i in range(companies)],
+            "created_per_minute": {f"2025-07-25T16:{i:02d}": 100 for i in range(60)}
+        },
+        "integration_status": "active"
+    }
+
+
+def run_sync(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine that never suspends (serialize_response for async endpoints) without an event loop."""
+    try:
+        coroutine.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("coroutine suspended")
+
+
+def default_encoding(model: Optional[type]) -> Callable[[Any], bytes]:
+    """FastAPI's path: response model validation and serialization (or jsonable_encoder), then JSONResponse."""
+    field = create_response_field("response", model) if model is not None else None
+    
+    def encode(content: Any) -> bytes:
+        data = run_sync(serialize_response(field=field, response_content=content))
+        return JSONResponse(data).body
+    return encode
+
+
+def fast_encoding(content: Any) -> bytes:
+    """The ACME_FAST_JSON path: FastJSONResponse renders the content in one pass."""
+    return FastJSONResponse(content).body
+
+
+def measure(label: str, encode: Callable[[Any], bytes], content: Any, repeat: int) -> float:
+    """Encode the content ``repeat`` times and print the best time."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = encode(content)
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<36} {best * 1000:>10.2f} ms {len(body) / 1024 / 1024:>9.2f} MiB", flush=True)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated contact counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+    
+    print(f"orjson available: {ORJSON_AVAILABLE}")
+    for size in (int(n) for n in args.sizes.split(",")):
+        print(f"\n{size} contacts")
+        for name, model, content in (
+            ("bulk", LinqBulkContactResponse, bulk_response(size)),
+            ("changes", LinqContactChangesResponse, changes_response(size))
+        ):
+            before = measure(f"{name} default", default_encoding(model), content, args.repeat)
+            after = measure(f"{name} fast", fast_encoding, content, args.repeat)
+            print(f"  speedup {before / after:.1f}x")
+    
+    print("\nstats")
+    content = stats_response(100)
+    before = measure("stats default", default_encoding(None), content, args.repeat * 100)
+    after = measure("stats fast", fast_encoding, content, args.repeat * 100)
+    print(f"  speedup {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Read throughput of the shared-memory contact store as worker processes are added.
+
+Seeds --contacts contacts into one shared log, then starts 1, 2, 4, ...
+worker processes that each open the log the way a uvicorn worker does and
+run a read mix (single contact lookups and 50-contact pages) for
+--seconds. With --write-rate a separate process keeps creating contacts
+meanwhile, so the readers also pay for catching up with the log. Reads in
+different processes share no lock, so throughput should grow with the
+number of CPU cores; on fewer cores than workers it cannot.
+
+Usage:
+    python -m benchmarks.shared_store --workers 1,2,4,8 --contacts 100000 --seconds 3
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from typing import List, Optional
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.shared_repository import SharedContactRepository
+
+COMPANIES = ["Tech Corp", "Acme Inc", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+# Contacts per page read, as in the default GET /contacts page
+PAGE_SIZE = 50
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a contact without validation; only storage is measured."""
+    return AcmeContact.model_construct(
+        acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+        acme_phone_number=None, acme_company_name=COMPANIES[i % len(COMPANIES)], acme_notes=None
+    )
+
+
+def reader(path: str, contact_ids: List[str], seconds: float, ready, start, results) -> None:
+    """Worker process: catch up with the log, then mix lookups and page reads and report the operation count."""
+    repository = SharedContactRepository(path)
+    AcmeService.use_repository(repository)
+    rng = random.Random(os.getpid())
+    ops = 0
+    # Build the local view up front, as a worker does while serving its first requests
+    len(repository)
+    ready.put(os.getpid())
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        if ops % 10:
+            AcmeService.get_contact(rng.choice(contact_ids))
+        else:
+            AcmeService.get_contacts_page(limit=PAGE_SIZE, company=rng.choice(COMPANIES))
+        ops += 1
+    results.put(ops)
+    repository.close()
+
+
+def writer(path: str, rate: float, stop) -> None:
+    """Writer process: create contacts at roughly ``rate`` per second until stopped."""
+    repository = SharedContactRepository(path)
+    counter = itertools.count(10_000_000)
+    while not stop.is_set():
+        repository.insert([make_contact(next(counter))], "2025-07-25T16:38:00Z", "active")
+        time.sleep(1 / rate)
+    repository.close()
+
+
+def measure(path: str, contact_ids: List[str], workers: int, seconds: float, write_rate: Optional[float]) -> float:
+    """Run ``workers`` reader processes (and the writer, if any) and return read operations per second."""
+    context = multiprocessing.get_context("fork")
+    start, stop, ready, results = context.Event(), context.Event(), context.Queue(), context.Queue()
+    processes = [
+        context.Process(target=reader, args=(path, contact_ids, seconds, ready, start, results))
+        for _ in range(workers)
+    ]
+    if write_rate:
+        processes.append(context.Process(target=writer, args=(path, write_rate, stop)))
+    for process in processes:
+        process.start()
+    for _ in range(workers):
+        ready.get()
+    start.set()
+    total = sum(results.get() for _ in range(workers))
+    stop.set()
+    for process in processes:
+        process.join()
+    return total / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker process counts")
+    parser.add_argument("--contacts", type=int, default=100_000, help="Contacts seeded before measuring")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Duration of each measurement")
+    parser.add_argument("--write-rate", type=float, default=None, help="Creates per second from a writer process")
+    args = parser.parse_args()
+    
+    print(f"CPU cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "contacts.shm")
+        repository = SharedContactRepository(path)
+        contact_ids: List[str] = []
+        for start in range(0, args.contacts, 10_000):
+            batch = [make_contact(i) for i in range(start, min(start + 10_000, args.contacts))]
+            contact_ids += repository.insert(batch, "2025-07-25T16:38:00Z", "active")
+        print(f"Seeded {len(repository)} contacts, {os.path.getsize(path) / 1024 / 1024:.0f} MiB log")
+        repository.close()
+        
+        print(f"{'workers':>7} {'reads/s':>10} {'speedup':>8}")
+        baseline = None
+        for workers in (int(n) for n in args.workers.split(",")):
+            rate = measure(path, contact_ids, workers, args.seconds, args.write_rate)
+            baseline = baseline or rate
+            print(f"{workers:>7} {rate:>10.0f} {rate / baseline:>7.2f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measure AcmeClient against a slow AcmeCRM and check that the event loop stays responsive.
+
+For each injected upstream latency, many concurrent creates go through one
+AcmeClient while a heartbeat task measures how late the event loop wakes it
+(loop lag). For comparison, the same latency is then spent in a blocking call,
+the way a synchronous upstream client inside an ``async def`` endpoint would.
+
+By default the stand-in server (acme_server.py) runs in-process on its own
+event loop thread, like a separate upstream would; pass --url to target a live
+one instead, e.g. started with
+``ACME_STUB_LATENCY_MS=50 uvicorn acme_server:app --port 8300``.
+
+Usage:
+    python -m benchmarks.upstream --latencies 0,50,200 --requests 2000 --concurrency 64 --callers 128
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+from typing import List, Optional
+import httpx
+from fastapi import FastAPI
+from models.acme_models import AcmeContact
+from acme_server import create_app
+from services.acme_client import AcmeClient
+
+HEARTBEAT_SECONDS = 0.01
+
+
+class ThreadedASGITransport(httpx.AsyncBaseTransport):
+    """Serve requests with an ASGI app running on a separate event loop thread."""
+    
+    def __init__(self, app: FastAPI) -> None:
+        self._transport = httpx.ASGITransport(app=app)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="acme-stand-in", daemon=True)
+        self._thread.start()
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        future = asyncio.run_coroutine_threadsafe(self._transport.handle_async_request(request), self._loop)
+        return await asyncio.wrap_future(future)
+    
+    async def aclose(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+def make_contact(i: int) -> AcmeContact:
+    """Build a valid contact."""
+    return AcmeContact(
+        acme_first_name=f"First{i}", acme_last_name=f"Last{i}", acme_email=f"contact{i}@example.com",
+        acme_company_name="Tech Corp"
+    )
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the value at a given fraction of the sorted samples."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def heartbeat(lags: List[float], stop: asyncio.Event) -> None:
+    """Record how much later than requested the event loop resumes a short sleep."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(time.perf_counter() - started - HEARTBEAT_SECONDS)
+
+
+async def run_client(client: AcmeClient, requests: int, callers: int) -> None:
+    """Send creates from many concurrent callers through the client and print throughput, latency and loop lag."""
+    contacts = [make_contact(i) for i in range(requests)]
+    pending = iter(contacts)
+    latencies: List[float] = []
+    
+    async def caller() -> None:
+        for contact in pending:
+            started = time.perf_counter()
+            await client.create_contact(contact)
+            latencies.append(time.perf_counter() - started)
+    
+    lags: List[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    started = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await beat
+    
+    print(f"  async client : {requests / elapsed:>8.0f} req/s, latency p50/p99 "
+          f"{percentile(latencies, 0.5) * 1000:.1f} / {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"loop lag p99/max {percentile(lags, 0.99) * 1000:.1f} / {max(lags) * 1000:.1f} ms")
+
+
+async def run_blocking(latency_ms: float, calls: int) -> None:
+    """Spend the same upstream latency in blocking calls on the event loop, for comparison."""
+    lags: List[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_SECONDS)
+    for _ in range(calls):
+        time.sleep(latency_ms / 1000)
+        await asyncio.sleep(0)
+    stop.set()
+    await beat
+    print(f"  blocking call: loop lag p99/max {percentile(lags, 0.99) * 1000:.1f} / {max(lags) * 1000:.1f} ms "
+          f"({calls} calls)")
+
+
+async def run(url: Optional[str], latencies: List[float], requests: int, concurrency: int, callers: int) -> None:
+    for latency_ms in latencies:
+        print(f"upstream latency {latency_ms:.0f} ms" + (" (set on the live server)" if url else ""))
+        transport = None if url else ThreadedASGITransport(create_app(latency_ms=latency_ms))
+        async with AcmeClient(url or "http://acme", max_concurrency=concurrency, transport=transport) as client:
+            await run_client(client, requests, callers)
+        if latency_ms:
+            await run_blocking(latency_ms, calls=5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default=None, help="Live AcmeCRM stand-in URL (default: in-process)")
+    parser.add_argument("--latencies", default="0,50,200", help="Comma-separated injected latencies in ms")
+    parser.add_argument("--requests", type=int, default=2000, help="Creates per latency")
+    parser.add_argument("--concurrency", type=int, default=64, help="AcmeClient max_concurrency")
+    parser.add_argument("--callers", type=int, default=128, help="Concurrent tasks issuing creates")
+    args = parser.parse_args()
+    latencies = [float(n) for n in args.latencies.split(",")] if not args.url else [0.0]
+    asyncio.run(run(args.url, latencies, args.requests, args.concurrency, args.callers))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,58 @@
 """Main FastAPI application for Linq-AcmeCRM integration."""
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import List
-from fastapi import FastAPI, Depends, HTTPException, status
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from models.linq_models import LinqContact, LinqContactResponse
-from models.acme_models import AcmeContactResponse
+from models.linq_models import (
+    LinqContact,
+    LinqContactResponse,
+    LinqBulkContactResponse,
+    LinqImportResponse,
+    LinqSearchResponse,
+    LinqSearchResult,
+    LinqContactChange,
+    LinqContactChangesResponse,
+)
+from models.acme_models import AcmeContact, AcmeContactResponse
 from services.auth_service import AuthService
 from services.field_mapper import FieldMapper
 from services.acme_service import AcmeService
+from services.contact_store import create_contact_store
+from services.sqlite_repository import SQLiteContactRepository
+from services.shared_repository import SharedContactRepository
+from services.bulk_service import BulkService
+from services.broadcaster import ChangeBroadcaster
+from services.create_batcher import CreateBatcher
+from services.change_feed import ContactChange
+from services.metrics import REGISTRY, SLOW_TRACES, MetricsMiddleware, process_rss_bytes
+from services.profiler import ProfilerBusyError, SamplingProfiler, format_collapsed
+from services.json_response import FastJSONResponse
+from services.contact_transfer import MEDIA_TYPES, export_contacts, import_contacts
 
 # Load environment variables
 load_dotenv()
 
+# Select the storage backend: in-memory "memory" (default), a "sqlite" database file, or a
+# "shared" memory log that every worker process of a multi-worker deployment maps
+ACME_REPOSITORY = os.getenv("ACME_REPOSITORY", "memory")
+if ACME_REPOSITORY == "sqlite":
+    AcmeService.use_repository(SQLiteContactRepository(os.getenv("ACME_SQLITE_PATH", "acme.db")))
+elif ACME_REPOSITORY == "shared":
+    AcmeService.use_repository(SharedContactRepository(os.getenv("ACME_SHARED_PATH", "/dev/shm/acme-contacts")))
+elif ACME_REPOSITORY == "memory":
+    # Select the contact record layout: "dict" (default) or the compact "columnar" layout
+    AcmeService.use_store(create_contact_store(os.getenv("ACME_CONTACT_STORE", "dict")))
+else:
+    raise ValueError(f"Unknown ACME_REPOSITORY: {ACME_REPOSITORY} (expected memory, sqlite or shared)")
+
 # Create FastAPI app
 app = FastAPI(
     title="Linq-AcmeCRM Integration API",
@@ -31,11 +69,224 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods (GET, POST, OPTIONS, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Let browser clients read the pagination cursor and ETag
 )
 
+# Request latency histograms for GET /metrics; added last so it also times the CORS middleware
+app.add_middleware(MetricsMiddleware)
+
+# Pagination settings for GET /contacts
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Result settings for GET /contacts/search
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Batch settings for GET /contacts/changes
+DEFAULT_CHANGES_LIMIT = 1000
+MAX_CHANGES_LIMIT = 10000
+
 # Security scheme
 security = HTTPBearer()
 
+# Users allowed to call the /admin endpoints (profiling, slow traces); nobody unless configured
+ADMIN_USERS = frozenset(user.strip() for user in os.getenv("ACME_ADMIN_USERS", "").split(",") if user.strip())
+
+# On-demand stack sampling of this worker, see GET /admin/profile
+profiler = SamplingProfiler()
+
+# Slow request tracing: keep the stage breakdown of requests taking at least this long (off unless set)
+if os.getenv("ACME_SLOW_TRACE_MS"):
+    SLOW_TRACES.configure(float(os.environ["ACME_SLOW_TRACE_MS"]) / 1000)
+
+# The mapping schema never changes while the app runs, so it is encoded once
+MAPPING_SCHEMA_BODY = json.dumps(FieldMapper.get_mapping_schema(), separators=(",", ":")).encode()
+MAPPING_SCHEMA_ETAG = '"' + hashlib.blake2b(MAPPING_SCHEMA_BODY, digest_size=8).hexdigest() + '"'
+MAPPING_SCHEMA_CACHE_CONTROL = "public, max-age=86400"
+
+# Authenticated data may change on every write; clients must revalidate with If-None-Match
+DATA_CACHE_CONTROL = "private, no-cache"
+
+# Opt-in single-pass JSON encoding (pydantic-core, orjson) for the contact and stats responses
+FAST_JSON = os.getenv("ACME_FAST_JSON", "false").lower() == "true"
+
+# Worker processes validating and mapping bulk imports off the event loop; 0 (default) runs them inline
+BULK_WORKERS = int(os.getenv("ACME_BULK_WORKERS", "0"))
+
+# Live push of contact changes over SSE and WebSocket; each subscriber may fall this many
+# messages behind before it is dropped and has to reconnect
+change_broadcaster = ChangeBroadcaster(queue_size=int(os.getenv("ACME_SUBSCRIBER_QUEUE_SIZE", "256")))
+EVENT_KEEPALIVE_SECONDS = 15.0
+
+# With the shared repository, how often each worker reads the changes other workers wrote, to push them live
+CHANGE_POLL_SECONDS = float(os.getenv("ACME_CHANGE_POLL_MS", "100")) / 1000
+change_poller: Optional[asyncio.Task] = None
+
+
+async def _create_contacts_batch(contacts: List[AcmeContact]) -> List[AcmeContactResponse]:
+    """Store a coalesced batch of creates in a single AcmeService call."""
+    return AcmeService.create_contacts(contacts)
+
+
+# Micro-batching of POST /contacts: creates arriving within the window share one store call.
+# Off unless ACME_CREATE_BATCH_WINDOW_MS is set
+create_batcher = (
+    CreateBatcher(
+        _create_contacts_batch,
+        max_batch_size=int(os.getenv("ACME_CREATE_BATCH_SIZE", "100")),
+        max_latency=float(os.environ["ACME_CREATE_BATCH_WINDOW_MS"]) / 1000
+    )
+    if os.getenv("ACME_CREATE_BATCH_WINDOW_MS") else None
+)
+
+
+def _register_metrics() -> None:
+    """Register the gauges and counters read from the services on every /metrics scrape."""
+    REGISTRY.gauge("acme_contacts", "Number of stored contacts", AcmeService.get_contact_count)
+    REGISTRY.gauge("acme_process_resident_memory_bytes", "Resident memory of this worker process", process_rss_bytes)
+    for name, stats in (("token", AuthService.get_cache_stats), ("projection", AcmeService.get_projection_cache_stats)):
+        REGISTRY.counter(
+            f"acme_{name}_cache_hits_total", f"{name.capitalize()} cache hits", lambda stats=stats: stats()["hits"]
+        )
+        REGISTRY.counter(
+            f"acme_{name}_cache_misses_total", f"{name.capitalize()} cache misses", lambda stats=stats: stats()["misses"]
+        )
+        REGISTRY.gauge(
+            f"acme_{name}_cache_hit_ratio", f"{name.capitalize()} cache hits per lookup since start",
+            lambda stats=stats: stats()["hit_ratio"]
+        )
+        REGISTRY.gauge(
+            f"acme_{name}_cache_entries", f"Entries in the {name} cache", lambda stats=stats: stats()["size"]
+        )
+    REGISTRY.gauge("acme_change_subscribers", "Connected SSE and WebSocket subscribers",
+                   lambda: change_broadcaster.subscriber_count)
+    REGISTRY.counter("acme_change_messages_published_total", "Change messages pushed to subscribers",
+                     lambda: change_broadcaster.published)
+    REGISTRY.counter("acme_change_subscribers_dropped_total", "Subscribers dropped for falling behind",
+                     lambda: change_broadcaster.dropped)
+    REGISTRY.counter("acme_slow_requests_total", "Requests kept by slow request tracing",
+                     lambda: SLOW_TRACES.recorded)
+    if create_batcher is not None:
+        REGISTRY.counter("acme_create_batches_total", "Micro-batched create calls sent to the store",
+                         lambda: create_batcher.batches)
+        REGISTRY.counter("acme_create_batched_contacts_total", "Contacts created through micro-batches",
+                         lambda: create_batcher.contacts)
+
+
+_register_metrics()
+
+
+@app.on_event("startup")
+async def restore_contacts() -> None:
+    """Restore persisted in-memory contacts and start journaling when ACME_DATA_DIR is set, then index them for duplicate checks and search."""
+    data_dir = os.getenv("ACME_DATA_DIR")
+    if data_dir:
+        AcmeService.enable_persistence(
+            data_dir,
+            sync_commit=os.getenv("ACME_SYNC_COMMIT", "true").lower() != "false"
+        )
+    AcmeService.add_change_listener(_publish_changes)
+    # Index the stored contacts for duplicate checks and search now rather than on the first request
+    await asyncio.to_thread(AcmeService.sync_duplicate_index)
+    await asyncio.to_thread(AcmeService.sync_search_index)
+
+
+async def _poll_changes() -> None:
+    """Push the changes other worker processes write to the shared repository to this worker's subscribers."""
+    while True:
+        await asyncio.sleep(CHANGE_POLL_SECONDS)
+        await asyncio.to_thread(AcmeService.poll_changes)
+
+
+@app.on_event("startup")
+async def start_change_poller() -> None:
+    """Start polling for other workers' changes when the repository is shared between worker processes."""
+    global change_poller
+    if ACME_REPOSITORY == "shared":
+        change_poller = asyncio.create_task(_poll_changes())
+
+
+@app.on_event("startup")
+async def start_bulk_workers() -> None:
+    """Start and warm the bulk import worker processes when ACME_BULK_WORKERS is set."""
+    if BULK_WORKERS > 0:
+        await asyncio.to_thread(BulkService.start_pool, BULK_WORKERS)
+
+
+@app.on_event("shutdown")
+async def flush_contacts() -> None:
+    """Flush batched creates and the contact journal, stop the change poller and bulk workers, and close the database on shutdown."""
+    if create_batcher is not None:
+        await create_batcher.aclose()
+    if change_poller is not None:
+        change_poller.cancel()
+    AcmeService.remove_change_listener(_publish_changes)
+    BulkService.stop_pool()
+    AcmeService.close()
+
+
+def _etag(*parts: object) -> str:
+    """
+    Build a weak ETag from the store version and the request parameters that shape a response.
+    
+    Args:
+        *parts: Values identifying the response representation
+        
+    Returns:
+        Quoted weak entity tag
+    """
+    return 'W/"' + hashlib.blake2b(repr(parts).encode(), digest_size=8).hexdigest() + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match header already covers the given ETag.
+    
+    Args:
+        request: Incoming request
+        etag: Current entity tag of the response
+        
+    Returns:
+        True if a 304 Not Modified can be sent instead of the body
+    """
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored on both sides
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+def _not_modified_response(etag: str, cache_control: str) -> Response:
+    """Build an empty 304 response carrying the validator headers."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+def _json_body(content: Any, response: Response) -> Any:
+    """
+    Return an endpoint's JSON body, pre-encoded when ACME_FAST_JSON is on.
+    
+    When off, the content is returned as-is for FastAPI to re-validate against
+    the response model and encode (jsonable_encoder, then json). When on, it is
+    encoded once by FastJSONResponse; the response model and OpenAPI schema
+    are unchanged.
+    
+    Args:
+        content: Response model instance or JSON-compatible data
+        response: Outgoing response whose headers (e.g. ETag) are carried over
+        
+    Returns:
+        The content, or a FastJSONResponse wrapping it
+    """
+    if not FAST_JSON:
+        return content
+    return FastJSONResponse(content, headers=dict(response.headers))
+
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
@@ -54,6 +305,24 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     return AuthService.get_current_user(token)
 
 
+async def get_admin_user(current_user: str = Depends(get_current_user)) -> str:
+    """
+    Dependency restricting an endpoint to the users listed in ACME_ADMIN_USERS.
+    
+    Args:
+        current_user: Authenticated user
+        
+    Returns:
+        Username of the authenticated admin
+        
+    Raises:
+        HTTPException: If the user is not an admin
+    """
+    if current_user not in ADMIN_USERS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -79,17 +348,28 @@ async def health_check():
 @app.post("/contacts", response_model=LinqContactResponse)
 async def create_contact(
     contact: LinqContact,
+    response: Response,
+    upsert: bool = Query(
+        False, description="Return the existing contact with the same email (case-insensitive) instead of creating another"
+    ),
     current_user: str = Depends(get_current_user)
 ) -> LinqContactResponse:
     """
     Create a new contact in AcmeCRM from Linq format.
     
+    The response lists stored contacts with the same last name and company
+    and a similar first name as possible duplicates; they do not stop the
+    create. With upsert=true, repeating a create with the same email returns
+    the first contact stored with it, unchanged, and created=false.
+    
     Args:
         contact: Contact data in Linq format
+        response: Outgoing response, for the fast JSON path
+        upsert: Create only if no contact with the same email exists
         current_user: Authenticated user
         
     Returns:
-        LinqContactResponse with success status and AcmeCRM contact ID
+        LinqContactResponse with success status, AcmeCRM contact ID and possible duplicates
         
     Raises:
         HTTPException: If contact creation fails
@@ -98,51 +378,282 @@ async def create_contact(
         # Map from Linq format to AcmeCRM format
         acme_contact = FieldMapper.map_linq_to_acme(contact)
         
-        # Create contact in AcmeCRM
-        acme_response = AcmeService.create_contact(acme_contact)
+        # Check for similar contacts before storing, so the new contact does not match itself
+        possible_duplicates = AcmeService.find_duplicates(acme_contact)
+        
+        # Create contact in AcmeCRM, batched with concurrent creates when micro-batching is on
+        created = True
+        if upsert:
+            acme_response, created = AcmeService.upsert_contact(acme_contact)
+        elif create_batcher is not None:
+            acme_response = await create_batcher.submit(acme_contact)
+        else:
+            acme_response = AcmeService.create_contact(acme_contact)
+        contact_id = acme_response.acme_contact_id
         
         # Return success response
-        return LinqContactResponse(
+        return _json_body(LinqContactResponse(
             success=True,
-            contact_id=acme_response.acme_contact_id,
-            message=f"Contact successfully created in AcmeCRM by user {current_user}"
+            contact_id=contact_id,
+            message=(
+                f"Contact successfully created in AcmeCRM by user {current_user}" if created
+                else "Contact with this email already exists in AcmeCRM"
+            ),
+            created=created,
+            possible_duplicates=[duplicate for duplicate in possible_duplicates if duplicate != contact_id]
+        ), response)
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create contact: {str(e)}"
         )
+
+
+@app.post("/contacts/bulk", response_model=LinqBulkContactResponse)
+async def create_contacts_bulk(
+    request: Request,
+    response: Response,
+    batch_size: int = Query(
+        BulkService.DEFAULT_BATCH_SIZE, ge=1, le=BulkService.MAX_BATCH_SIZE,
+        description="Number of contacts validated and inserted per batch"
+    ),
+    current_user: str = Depends(get_current_user)
+) -> LinqBulkContactResponse:
+    """
+    Create many contacts in AcmeCRM from Linq format in one request.
+    
+    The body is either a JSON array of Linq contacts or NDJSON (one contact per
+    line, with an ``application/x-ndjson`` Content-Type). Invalid items are
+    reported individually and do not prevent the rest from being created.
+    With ACME_BULK_WORKERS set, batches are validated and mapped in worker
+    processes so other requests are not held up by a large import.
+    
+    Args:
+        request: Incoming request carrying the raw payload
+        response: Outgoing response, for the fast JSON path
+        batch_size: Number of contacts validated and inserted per batch
+        current_user: Authenticated user
         
+    Returns:
+        LinqBulkContactResponse with per-item results and throughput
+        
+    Raises:
+        HTTPException: If the payload cannot be parsed or the import fails
+    """
+    try:
+        items = BulkService.parse_payload(await request.body(), request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    try:
+        return _json_body(await BulkService.ingest_offloaded(items, batch_size), response)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create contact: {str(e)}"
+            detail=f"Failed to import contacts: {str(e)}"
+        )
+
+
+@app.post("/contacts/import", response_model=LinqImportResponse)
+async def import_contacts_file(
+    request: Request,
+    response: Response,
+    format: Optional[str] = Query(
+        None, pattern="^(csv|ndjson)$",
+        description="Upload format: csv or ndjson (defaults to the file extension or Content-Type)"
+    ),
+    batch_size: int = Query(
+        BulkService.DEFAULT_BATCH_SIZE, ge=1, le=BulkService.MAX_BATCH_SIZE,
+        description="Number of contacts validated and inserted per batch"
+    ),
+    current_user: str = Depends(get_current_user)
+) -> LinqImportResponse:
+    """
+    Import a CSV or NDJSON file of Linq contacts of any size.
+    
+    The file is sent either as the raw body (``text/csv`` or
+    ``application/x-ndjson``) or as a ``multipart/form-data`` file field. It
+    is parsed as it streams in and stored batch by batch; the next part of
+    the body is only read once the previous batch is stored, so memory use
+    does not grow with the file. CSV needs a header row naming the Linq
+    fields, as written by GET /contacts/export. Every record becomes a new
+    active contact with a new ID; the contact_id, status and created_at
+    columns of an export are ignored. Invalid records are counted and the
+    first ones listed without stopping the import.
+    
+    Args:
+        request: Incoming request carrying the upload
+        response: Outgoing response, for the fast JSON path
+        format: Upload format
+        batch_size: Number of contacts validated and inserted per batch
+        current_user: Authenticated user
+        
+    Returns:
+        LinqImportResponse with counts and the first rejected records
+        
+    Raises:
+        HTTPException: If the upload cannot be read as CSV or NDJSON, or the import fails
+    """
+    try:
+        return _json_body(await import_contacts(
+            request.stream(), request.headers.get("content-type", ""), format, batch_size
+        ), response)
+    
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import contacts: {str(e)}"
+        )
+
+
+@app.get("/contacts/export")
+async def export_contacts_file(
+    format: str = Query("csv", pattern="^(csv|ndjson)$", description="File format: csv or ndjson"),
+    email: Optional[str] = Query(None, description="Only export contacts with this email (case-insensitive)"),
+    company: Optional[str] = Query(None, description="Only export contacts at this company (case-insensitive)"),
+    contact_status: Optional[str] = Query(None, alias="status", description="Only export contacts with this AcmeCRM status"),
+    current_user: str = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Download every contact as a CSV or NDJSON file.
+    
+    The file is generated while it is sent, straight from the store, so any
+    number of contacts can be exported in constant memory. Columns are the
+    contact ID, the Linq fields from the field mapping, then status and
+    creation time. POST /contacts/import reads the file back, but stores its
+    contacts as new active contacts and ignores the ID, status and creation
+    time columns.
+    
+    Args:
+        format: File format
+        email: Email filter
+        company: Company filter
+        contact_status: Status filter
+        current_user: Authenticated user
+        
+    Returns:
+        Streamed file download
+    """
+    filters = {"email": email, "company": company, "status": contact_status}
+    return StreamingResponse(
+        export_contacts(format, filters),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'}
+    )
+
+
+@app.get("/contacts/search", response_model=LinqSearchResponse)
+async def search_contacts(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Search text; the last word also matches name and company prefixes"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT, description="Maximum number of results"),
+    current_user: str = Depends(get_current_user)
+) -> LinqSearchResponse:
+    """
+    Search contacts by name, company, email and notes, for type-ahead.
+    
+    Every word of the query must match a word of the contact, ignoring case,
+    accents and punctuation; the last word also matches the start of name
+    and company words. Results are ranked by the fields matched (name over
+    company over email over notes, whole words over prefixes) and answered
+    from AcmeService's inverted index without reading other contacts.
+    
+    Args:
+        response: Outgoing response, for the fast JSON path
+        q: Search text
+        limit: Maximum number of results
+        current_user: Authenticated user
+        
+    Returns:
+        LinqSearchResponse with the ranked matches
+    """
+    results = [
+        LinqSearchResult(
+            contact_id=contact.acme_contact_id,
+            score=score,
+            contact=AcmeService.get_linq_projection(contact)[0]
         )
+        for contact, score in AcmeService.search_contacts(q, limit)
+    ]
+    return _json_body(LinqSearchResponse(query=q, results=results), response)
 
 
 @app.get("/contacts", response_model=List[LinqContact])
 async def get_contacts(
+    request: Request,
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE,
+        description=f"Page size (defaults to {DEFAULT_PAGE_SIZE}; unbounded when streaming NDJSON)"
+    ),
+    after: Optional[str] = Query(None, description="Opaque cursor from a previous X-Next-Cursor header"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="Response format: json or ndjson"),
+    email: Optional[str] = Query(None, description="Only return contacts with this email (case-insensitive)"),
+    company: Optional[str] = Query(None, description="Only return contacts at this company (case-insensitive)"),
+    contact_status: Optional[str] = Query(None, alias="status", description="Only return contacts with this AcmeCRM status"),
     current_user: str = Depends(get_current_user)
-) -> List[LinqContact]:
+) -> Response:
     """
-    Retrieve all contacts from AcmeCRM in Linq format.
+    Retrieve contacts from AcmeCRM in Linq format.
+    
+    JSON responses are paginated; when more contacts are available the cursor
+    for the next page is returned in the ``X-Next-Cursor`` header. NDJSON
+    responses are streamed one contact per line straight from the store.
+    Filters are answered from AcmeService's secondary indexes and can be combined.
+    Both formats are assembled from AcmeService's cached per-contact JSON.
+    Responses carry an ETag derived from the store version, and a matching
+    ``If-None-Match`` gets 304 Not Modified without reading any contacts.
     
     Args:
+        request: Incoming request, used for conditional GET
+        limit: Maximum number of contacts to return
+        after: Cursor to resume after
+        format: Response format
+        email: Email filter
+        company: Company filter
+        contact_status: Status filter
         current_user: Authenticated user
         
     Returns:
         List of contacts in Linq format
         
     Raises:
-        HTTPException: If retrieval fails
+        HTTPException: If the cursor is invalid or retrieval fails
     """
     try:
-        # Get all contacts from AcmeCRM
-        acme_contacts = AcmeService.get_all_contacts()
-        
-        # Map contacts back to Linq format
-        linq_contacts = []
-        for acme_contact in acme_contacts:
-            linq_contact = FieldMapper.map_acme_to_linq(acme_contact.acme_contact)
-            linq_contacts.append(linq_contact)
+        after_seq = AcmeService.decode_cursor(after) if after is not None else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    filters = {"email": email, "company": company, "status": contact_status}
+    
+    # Read the version before the contacts so a concurrent write can only make the ETag older, never newer
+    etag = _etag("contacts", AcmeService.get_version(), format, limit, after_seq, email, company, contact_status)
+    if _not_modified(request, etag):
+        return _not_modified_response(etag, DATA_CACHE_CONTROL)
+    headers = {"ETag": etag, "Cache-Control": DATA_CACHE_CONTROL}
+    
+    if format == "ndjson":
+        return StreamingResponse(
+            _stream_contacts_ndjson(after_seq, limit, filters),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+    
+    try:
+        # Get one page of contacts from AcmeCRM, already encoded in Linq format
+        body, next_seq = AcmeService.get_contacts_page_json(
+            limit or DEFAULT_PAGE_SIZE, after_seq, **filters
+        )
         
-        return linq_contacts
+        if next_seq is not None:
+            headers["X-Next-Cursor"] = AcmeService.encode_cursor(next_seq)
         
+        return Response(content=body, media_type="application/json", headers=headers)
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -150,24 +661,278 @@ async def get_contacts(
         )
 
 
+def _stream_contacts_ndjson(
+    after_seq: Optional[int], limit: Optional[int], filters: Dict[str, Optional[str]]
+) -> Iterator[bytes]:
+    """
+    Yield contacts as NDJSON lines without materializing the full list.
+    
+    Args:
+        after_seq: Sequence number to resume after
+        limit: Maximum number of contacts to yield, or None for all
+        filters: Email, company and status filters passed to AcmeService
+        
+    Yields:
+        One encoded Linq contact per line
+    """
+    for count, (_, acme_contact) in enumerate(AcmeService.iter_contacts(after_seq, **filters)):
+        if limit is not None and count >= limit:
+            break
+        yield AcmeService.get_linq_projection(acme_contact)[1] + b"\n"
+
+
+@app.get("/contacts/changes", response_model=LinqContactChangesResponse)
+async def get_contact_changes(
+    response: Response,
+    since: Optional[int] = Query(None, description="Cursor from a previous next_since; omit to start a new sync"),
+    limit: int = Query(DEFAULT_CHANGES_LIMIT, ge=1, le=MAX_CHANGES_LIMIT, description="Maximum number of changes to return"),
+    current_user: str = Depends(get_current_user)
+) -> LinqContactChangesResponse:
+    """
+    Get contact creates, status updates and deletes since a change cursor.
+    
+    Consumers keep the ``next_since`` of each response and pass it back as
+    ``since``, so the cost of staying in sync follows the rate of change
+    rather than the number of stored contacts. When ``resync_required`` is
+    true (no cursor, or the cursor has aged out of the change feed), reload
+    GET /contacts in full and continue from the returned ``next_since``,
+    which was taken before the reload so nothing is missed.
+    
+    Args:
+        response: Outgoing response, for the fast JSON path
+        since: Sequence number of the last change already applied
+        limit: Maximum number of changes to return
+        current_user: Authenticated user
+        
+    Returns:
+        LinqContactChangesResponse with the changes and the next cursor
+    """
+    cursor = AcmeService.get_change_cursor()
+    changes = AcmeService.get_changes(since, limit) if since is not None else None
+    if changes is None:
+        return _json_body(
+            LinqContactChangesResponse(resync_required=True, changes=[], next_since=cursor, has_more=False), response
+        )
+    
+    return _json_body(LinqContactChangesResponse(
+        resync_required=False,
+        changes=[_to_linq_change(change) for change in changes],
+        next_since=changes[-1].seq if changes else since,
+        has_more=bool(changes) and changes[-1].seq < cursor
+    ), response)
+
+
+def _to_linq_change(change: ContactChange) -> LinqContactChange:
+    """Convert a recorded change to its Linq-format API model."""
+    return LinqContactChange(
+        seq=change.seq,
+        op=change.op,
+        contact_id=change.contact_id,
+        status=change.status,
+        contact=FieldMapper.map_acme_to_linq(change.contact) if change.contact is not None else None,
+        changed_at=change.at
+    )
+
+
+def _encode_changes(changes: List[ContactChange]) -> bytes:
+    """Encode changes as a JSON array of Linq-format changes."""
+    return b"[" + b",".join(_to_linq_change(change).model_dump_json().encode() for change in changes) + b"]"
+
+
+def _publish_changes(changes: List[ContactChange]) -> None:
+    """AcmeService change listener: encode each write's changes once and fan them out."""
+    if changes and change_broadcaster.subscriber_count:
+        change_broadcaster.publish(changes[0].seq - 1, changes[-1].seq, _encode_changes(changes))
+
+
+async def _change_events(since: Optional[int]) -> AsyncIterator[Tuple[str, int, bytes]]:
+    """
+    Yield live change events, first replaying anything after ``since`` from the change feed.
+    
+    Args:
+        since: Change cursor the client has already applied, or None to only receive new changes
+        
+    Yields:
+        Tuples of (event name, change cursor, JSON data). Event names are "changes",
+        "keepalive", "resync" (the cursor aged out; reload GET /contacts) and
+        "dropped" (the client fell too far behind; reconnect with the last cursor)
+    """
+    # Subscribe before replaying so no change falls between the replay and the live stream
+    subscription = change_broadcaster.subscribe()
+    try:
+        cursor = AcmeService.get_change_cursor() if since is None else since
+        replay = since is not None
+        while True:
+            while replay:
+                changes = AcmeService.get_changes(cursor, MAX_CHANGES_LIMIT)
+                if changes is None:
+                    cursor = AcmeService.get_change_cursor()
+                    yield "resync", cursor, b"[]"
+                    break
+                if not changes:
+                    break
+                cursor = changes[-1].seq
+                yield "changes", cursor, _encode_changes(changes)
+            replay = False
+            
+            message = await subscription.get(EVENT_KEEPALIVE_SECONDS)
+            if message is None:
+                if subscription.dropped:
+                    yield "dropped", cursor, b"[]"
+                    return
+                yield "keepalive", cursor, b"[]"
+                continue
+            previous, seq, data = message
+            if seq <= cursor:
+                continue
+            if previous != cursor:
+                # Partly replayed already, or changes were missed (e.g. the feed was reset):
+                # continue from the change feed, which also tells whether a resync is needed
+                replay = True
+                continue
+            cursor = seq
+            yield "changes", seq, data
+    finally:
+        change_broadcaster.unsubscribe(subscription)
+
+
+async def _stream_sse(since: Optional[int]) -> AsyncIterator[bytes]:
+    """Format change events as server-sent events; the event id is the change cursor."""
+    async with aclosing(_change_events(since)) as events:
+        async for event, cursor, data in events:
+            if event == "keepalive":
+                yield b": keepalive\n\n"
+            else:
+                yield f"event: {event}\nid: {cursor}\ndata: ".encode() + data + b"\n\n"
+                if event == "dropped":
+                    return
+
+
+@app.get("/contacts/events")
+async def stream_contact_events(
+    request: Request,
+    since: Optional[int] = Query(None, description="Change cursor to replay from; defaults to the Last-Event-ID header"),
+    current_user: str = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Push contact creates, status updates and deletes as server-sent events.
+    
+    Each ``changes`` event carries a JSON array of Linq-format changes and
+    uses the change cursor as its id, so a reconnecting EventSource resumes
+    through ``Last-Event-ID`` without missing anything still in the change feed.
+    
+    Args:
+        request: Incoming request, used for the Last-Event-ID header
+        since: Change cursor to replay from
+        current_user: Authenticated user
+        
+    Returns:
+        text/event-stream response
+        
+    Raises:
+        HTTPException: If the Last-Event-ID header is not a change cursor
+    """
+    if since is None and request.headers.get("last-event-id"):
+        try:
+            since = int(request.headers["last-event-id"])
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Last-Event-ID")
+    return StreamingResponse(
+        _stream_sse(since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/contacts/ws")
+async def contact_events_websocket(
+    websocket: WebSocket,
+    token: Optional[str] = Query(None, description="Bearer token (browsers cannot set headers on WebSockets)"),
+    since: Optional[int] = Query(None, description="Change cursor to replay from")
+) -> None:
+    """
+    Push contact changes over a WebSocket.
+    
+    Every text frame is a JSON object ``{"event", "next_since", "changes"}``
+    with the same events as the SSE stream. The token comes from the
+    ``token`` query parameter or the Authorization header.
+    
+    Args:
+        websocket: WebSocket connection
+        token: Bearer token
+        since: Change cursor to replay from
+    """
+    authorization = websocket.headers.get("authorization", "")
+    if token is None and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    try:
+        AuthService.get_current_user(token or "")
+    except HTTPException:
+        await websocket.close(code=1008)
+        return
+    
+    await websocket.accept()
+    
+    async def send_events() -> None:
+        async with aclosing(_change_events(since)) as events:
+            async for event, cursor, data in events:
+                await websocket.send_text(f'{{"event":"{event}","next_since":{cursor},"changes":{data.decode()}}}')
+                if event == "dropped":
+                    await websocket.close(code=1013)
+                    return
+    
+    async def wait_for_disconnect() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    
+    # Watch for the client going away while idle, instead of only noticing on the next send
+    tasks = {asyncio.create_task(send_events()), asyncio.create_task(wait_for_disconnect())}
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+    for task in done:
+        error = task.exception()
+        if error is not None and not isinstance(error, WebSocketDisconnect):
+            raise error
+
+
 @app.get("/contacts/stats")
-async def get_contact_stats(current_user: str = Depends(get_current_user)):
+async def get_contact_stats(
+    request: Request,
+    response: Response,
+    top_companies: int = Query(5, ge=0, le=100, description="Number of companies in the leaderboard"),
+    current_user: str = Depends(get_current_user)
+):
     """
     Get statistics about contacts in AcmeCRM.
     
+    Supports conditional GET: the ETag changes with the store version, so
+    pollers get 304 Not Modified until a contact is written.
+    
     Args:
+        request: Incoming request, used for conditional GET
+        response: Outgoing response, used to set the validator headers
+        top_companies: Number of companies in the leaderboard
         current_user: Authenticated user
         
     Returns:
         Dictionary with contact statistics
     """
+    etag = _etag("stats", AcmeService.get_version(), top_companies, current_user)
+    if _not_modified(request, etag):
+        return _not_modified_response(etag, DATA_CACHE_CONTROL)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = DATA_CACHE_CONTROL
+    
     try:
-        stats = AcmeService.get_storage_stats()
-        return {
+        stats = AcmeService.get_storage_stats(top_companies)
+        return _json_body({
             "user": current_user,
             "acmecrm_stats": stats,
             "integration_status": "active"
-        }
+        }, response)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -176,9 +941,113 @@ async def get_contact_stats(current_user: str = Depends(get_current_user)):
 
 
 @app.get("/mapping/schema")
-async def get_field_mapping_schema():
-    """Get the field mapping schema between Linq and AcmeCRM formats."""
-    return FieldMapper.get_mapping_schema()
+async def get_field_mapping_schema(request: Request):
+    """Get the field mapping schema between Linq and AcmeCRM formats (precomputed and cacheable)."""
+    if _not_modified(request, MAPPING_SCHEMA_ETAG):
+        return _not_modified_response(MAPPING_SCHEMA_ETAG, MAPPING_SCHEMA_CACHE_CONTROL)
+    return Response(
+        content=MAPPING_SCHEMA_BODY,
+        media_type="application/json",
+        headers={"ETag": MAPPING_SCHEMA_ETAG, "Cache-Control": MAPPING_SCHEMA_CACHE_CONTROL}
+    )
+
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    """
+    Expose metrics in the Prometheus text format.
+    
+    Includes request latency histograms per route, method and status,
+    per-stage timings (authentication, field mapping, AcmeService calls),
+    the store size, resident memory and cache hit ratios. Values are kept
+    per worker process; scrape every worker, or aggregate by instance.
+    """
+    return Response(content=REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
+
+
+@app.get("/admin/profile")
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0, le=60, description="How long to sample"),
+    interval_ms: float = Query(5.0, ge=1, le=1000, description="Milliseconds between samples"),
+    idle: bool = Query(False, description="Include threads that are waiting for work"),
+    admin_user: str = Depends(get_admin_user)
+) -> Response:
+    """
+    Sample the stacks of this worker process and return them as collapsed stacks.
+    
+    Sampling runs on a separate thread for the requested time while the
+    worker keeps serving requests, so the profile shows the live load. The
+    result has one ``thread;outer;...;inner count`` line per distinct stack,
+    ready for flamegraph.pl or speedscope. Only the worker that receives
+    this request is profiled.
+    
+    Args:
+        seconds: How long to sample
+        interval_ms: Milliseconds between samples
+        idle: Include threads that are waiting for work
+        admin_user: Authenticated admin
+        
+    Returns:
+        text/plain collapsed stacks
+        
+    Raises:
+        HTTPException: If a profile is already running in this worker
+    """
+    try:
+        stacks = await asyncio.to_thread(profiler.profile, seconds, interval_ms / 1000, idle)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return Response(
+        content=format_collapsed(stacks),
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="profile-{os.getpid()}.collapsed"'}
+    )
+
+
+@app.get("/admin/slow-traces")
+async def get_slow_traces(
+    limit: int = Query(20, ge=1, le=1000, description="Maximum number of traces to return"),
+    admin_user: str = Depends(get_admin_user)
+):
+    """
+    Get the stage breakdown of recent requests over the slow trace threshold, newest first.
+    
+    Each trace lists the timed stages (authentication, field mapping,
+    AcmeService calls) with their offset from the request start, their
+    duration and nesting depth; ``framework_ms`` is the rest of the request
+    (parsing, validation, serialization).
+    
+    Args:
+        limit: Maximum number of traces to return
+        admin_user: Authenticated admin
+        
+    Returns:
+        Dictionary with the threshold (null when tracing is off) and the traces
+    """
+    threshold = SLOW_TRACES.threshold
+    return {
+        "threshold_ms": threshold * 1000 if threshold is not None else None,
+        "traces": SLOW_TRACES.recent(limit)
+    }
+
+
+@app.put("/admin/slow-traces")
+async def configure_slow_traces(
+    threshold_ms: Optional[float] = Query(None, ge=0, description="Latency from which requests are traced; omit to stop"),
+    admin_user: str = Depends(get_admin_user)
+):
+    """
+    Turn slow request tracing on (with a threshold) or off in this worker, without a restart.
+    
+    Args:
+        threshold_ms: Latency in milliseconds from which requests are kept, or None to stop tracing
+        admin_user: Authenticated admin
+        
+    Returns:
+        Dictionary with the new threshold
+    """
+    SLOW_TRACES.configure(threshold_ms / 1000 if threshold_ms is not None else None)
+    return {"threshold_ms": threshold_ms}
 
 
 if __name__ == "__main__":
@@ -1,6 +1,22 @@
 """Data models for Linq-AcmeCRM integration."""
 
-from .linq_models import LinqContact, LinqContactResponse
+from .linq_models import (
+    LinqContact,
+    LinqContactResponse,
+    LinqBulkItemResult,
+    LinqBulkContactResponse,
+    LinqContactChange,
+    LinqContactChangesResponse,
+)
 from .acme_models import AcmeContact, AcmeContactResponse
 
-__all__ = ["LinqContact", "LinqContactResponse", "AcmeContact", "AcmeContactResponse"]
+__all__ = [
+    "LinqContact",
+    "LinqContactResponse",
+    "LinqBulkItemResult",
+    "LinqBulkContactResponse",
+    "LinqContactChange",
+    "LinqContactChangesResponse",
+    "AcmeContact",
+    "AcmeContactResponse",
+]
@@ -1,6 +1,6 @@
 """Pydantic models for Linq contact format."""
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -34,6 +34,11 @@ class LinqContactResponse(BaseModel):
     success: bool = Field(..., description="Whether the operation was successful")
     contact_id: str = Field(..., description="Unique identifier for the contact in AcmeCRM")
     message: str = Field(..., description="Human-readable response message")
+    created: bool = Field(True, description="False when an upsert found an existing contact with the same email")
+    possible_duplicates: List[str] = Field(
+        default_factory=list,
+        description="IDs of other contacts with the same last name and company and a similar first name"
+    )
     
     class Config:
         """Pydantic configuration."""
@@ -41,6 +46,175 @@ class LinqContactResponse(BaseModel):
             "example": {
                 "success": True,
                 "contact_id": "acme_12345",
-                "message": "Contact successfully created in AcmeCRM"
+                "message": "Contact successfully created in AcmeCRM",
+                "created": True,
+                "possible_duplicates": ["acme_0a1b2c3d"]
+            }
+        }
+
+
+class LinqBulkItemResult(BaseModel):
+    """Per-item outcome of a bulk contact import."""
+    
+    index: int = Field(..., description="Position of the item in the submitted payload")
+    success: bool = Field(..., description="Whether the item was created")
+    contact_id: Optional[str] = Field(None, description="Unique identifier for the contact in AcmeCRM")
+    error: Optional[str] = Field(None, description="Validation error for rejected items")
+
+
+class LinqBulkContactResponse(BaseModel):
+    """Response model for bulk Linq contact imports."""
+    
+    success: bool = Field(..., description="Whether every item was created")
+    total: int = Field(..., description="Number of items received")
+    created: int = Field(..., description="Number of contacts created")
+    failed: int = Field(..., description="Number of items rejected")
+    batch_size: int = Field(..., description="Batch size used for validation and insertion")
+    elapsed_ms: float = Field(..., description="Server-side processing time in milliseconds")
+    contacts_per_second: float = Field(..., description="Throughput of the import")
+    results: List[LinqBulkItemResult] = Field(..., description="Per-item results in payload order")
+    
+    class Config:
+        """Pydantic configuration."""
+        json_schema_extra = {
+            "example": {
+                "success": False,
+                "total": 2,
+                "created": 1,
+                "failed": 1,
+                "batch_size": 1000,
+                "elapsed_ms": 1.8,
+                "contacts_per_second": 1111.1,
+                "results": [
+                    {"index": 0, "success": True, "contact_id": "acme_12345", "error": None},
+                    {"index": 1, "success": False, "contact_id": None, "error": "email: value is not a valid email address"}
+                ]
+            }
+        }
+
+
+class LinqImportResponse(BaseModel):
+    """Response model for streamed CSV / NDJSON contact imports."""
+    
+    success: bool = Field(..., description="Whether every record was created")
+    total: int = Field(..., description="Number of records read from the upload")
+    created: int = Field(..., description="Number of contacts created")
+    failed: int = Field(..., description="Number of records rejected")
+    batch_size: int = Field(..., description="Batch size used for validation and insertion")
+    elapsed_ms: float = Field(..., description="Server-side processing time in milliseconds")
+    contacts_per_second: float = Field(..., description="Throughput of the import")
+    errors: List[LinqBulkItemResult] = Field(..., description="Rejected records in upload order, at most the first 100")
+    errors_truncated: bool = Field(..., description="Whether more records were rejected than are listed")
+    
+    class Config:
+        """Pydantic configuration."""
+        json_schema_extra = {
+            "example": {
+                "success": False,
+                "total": 250000,
+                "created": 249999,
+                "failed": 1,
+                "batch_size": 1000,
+                "elapsed_ms": 41250.0,
+                "contacts_per_second": 6060.6,
+                "errors": [
+                    {"index": 1041, "success": False, "contact_id": None, "error": "email: value is not a valid email address"}
+                ],
+                "errors_truncated": False
+            }
+        }
+
+
+class LinqSearchResult(BaseModel):
+    """A single ranked match of a contact search."""
+    
+    contact_id: str = Field(..., description="Unique identifier for the contact in AcmeCRM")
+    score: int = Field(
+        ...,
+        description="Relevance: per query word, the weight of the best matching field (name 4, company 3, email 2, notes 1), doubled for a whole-word match"
+    )
+    contact: LinqContact = Field(..., description="Contact data in Linq format")
+
+
+class LinqSearchResponse(BaseModel):
+    """Response model for contact search."""
+    
+    query: str = Field(..., description="Search text as submitted")
+    results: List[LinqSearchResult] = Field(..., description="Matching contacts, best first")
+    
+    class Config:
+        """Pydantic configuration."""
+        json_schema_extra = {
+            "example": {
+                "query": "john tech",
+                "results": [
+                    {
+                        "contact_id": "acme_12345",
+                        "score": 14,
+                        "contact": {
+                            "firstName": "John",
+                            "lastName": "Doe",
+                            "email": "john.doe@example.com",
+                            "phone": "+1-555-123-4567",
+                            "company": "Tech Corp",
+                            "notes": "Met at networking event"
+                        }
+                    }
+                ]
+            }
+        }
+
+
+class LinqContactChange(BaseModel):
+    """A single change to an AcmeCRM contact, as returned by the delta sync feed."""
+    
+    seq: int = Field(..., description="Change sequence number; pass the last one seen as ``since``")
+    op: str = Field(..., description="Kind of change: create, status or delete")
+    contact_id: str = Field(..., description="Unique identifier for the contact in AcmeCRM")
+    status: Optional[str] = Field(None, description="AcmeCRM status after the change (not set for deletes)")
+    contact: Optional[LinqContact] = Field(None, description="Contact data in Linq format (creates only)")
+    changed_at: str = Field(..., description="Timestamp of the change")
+
+
+class LinqContactChangesResponse(BaseModel):
+    """Response model for contact delta sync."""
+    
+    resync_required: bool = Field(..., description="The cursor is too old or unknown; reload GET /contacts in full, then sync from next_since")
+    changes: List[LinqContactChange] = Field(..., description="Changes after the cursor, oldest first")
+    next_since: int = Field(..., description="Cursor to pass as ``since`` on the next call")
+    has_more: bool = Field(..., description="Whether more changes are available right away")
+    
+    class Config:
+        """Pydantic configuration."""
+        json_schema_extra = {
+            "example": {
+                "resync_required": False,
+                "changes": [
+                    {
+                        "seq": 1753439400000001,
+                        "op": "create",
+                        "contact_id": "acme_12345",
+                        "status": "active",
+                        "contact": {
+                            "firstName": "John",
+                            "lastName": "Doe",
+                            "email": "john.doe@example.com",
+                            "phone": "+1-555-123-4567",
+                            "company": "Tech Corp",
+                            "notes": "Met at networking event"
+                        },
+                        "changed_at": "2025-07-25T10:30:00Z"
+                    },
+                    {
+                        "seq": 1753439400000002,
+                        "op": "status",
+                        "contact_id": "acme_12345",
+                        "status": "inactive",
+                        "contact": None,
+                        "changed_at": "2025-07-25T10:31:00Z"
+                    }
+                ],
+                "next_since": 1753439400000002,
+                "has_more": False
             }
         }
@@ -0,0 +1,357 @@
+"""Async HTTP client for a remote AcmeCRM, mirroring the AcmeService interface."""
+
+import asyncio
+import random
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+from pydantic import TypeAdapter
+from models.acme_models import AcmeContact, AcmeContactResponse
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_CONTACT_LIST_ADAPTER = TypeAdapter(List[AcmeContactResponse])
+_CONTACT_BODY_ADAPTER = TypeAdapter(List[AcmeContact])
+
+# Responses worth retrying: the upstream was overloaded or unreachable and did not apply the request
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class AcmeClientError(Exception):
+    """Raised when AcmeCRM rejects a request or cannot be reached after all retries."""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AcmeClient:
+    """
+    Async client for the AcmeCRM REST API with the same operations as AcmeService.
+    
+    All requests share one pooled ``httpx.AsyncClient`` (keep-alive, HTTP/2
+    when the ``h2`` package is installed). A semaphore caps the number of
+    requests in flight, so a slow upstream queues callers instead of opening
+    ever more connections. Failed attempts are retried with capped,
+    fully-jittered exponential backoff. Creates carry an Idempotency-Key
+    header, so a retried create is never applied twice.
+    
+    Usage:
+        async with AcmeClient("http://localhost:8300") as client:
+            created = await client.create_contact(contact)
+    """
+    
+    DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+    PAGE_SIZE = 1000
+    
+    def __init__(
+        self,
+        base_url: str,
+        max_concurrency: int = 64,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        retries: int = 3,
+        backoff: float = 0.05,
+        max_backoff: float = 2.0,
+        http2: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ) -> None:
+        """
+        Create a client; no connection is opened until the first request.
+        
+        Args:
+            base_url: Root URL of the AcmeCRM API, e.g. "http://localhost:8300"
+            max_concurrency: Maximum number of requests in flight at once
+            max_connections: Maximum number of pooled connections
+            max_keepalive_connections: Idle connections kept open for reuse
+            timeout: Connect/read/write/pool timeouts per attempt
+            retries: Additional attempts after a timeout, connection error or retryable status
+            backoff: Base delay in seconds before the first retry, doubled per attempt
+            max_backoff: Upper bound for a single retry delay
+            http2: Negotiate HTTP/2 when the ``h2`` package is available
+            headers: Extra headers sent with every request (e.g. authorization)
+            transport: Custom transport, e.g. ``httpx.ASGITransport`` for an in-process server
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2 and HTTP2_AVAILABLE and transport is None,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            timeout=timeout,
+            headers=headers,
+            transport=transport
+        )
+    
+    async def __aenter__(self) -> "AcmeClient":
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self._client.aclose()
+    
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Seconds to wait before retry number ``attempt + 1``, honouring a numeric Retry-After header."""
+        if response is not None:
+            try:
+                return min(float(response.headers["retry-after"]), self.max_backoff)
+            except (KeyError, ValueError):
+                pass
+        # Full jitter spreads retries from many callers instead of synchronizing them
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+    
+    async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request, retrying transient failures.
+        
+        Args:
+            method: HTTP method
+            path: Path relative to the base URL
+            **kwargs: Extra arguments for ``httpx.AsyncClient.request``
+            
+        Returns:
+            Final response (any status except retryable ones that ran out of attempts)
+            
+        Raises:
+            AcmeClientError: If every attempt failed with a timeout, connection error or retryable status
+        """
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                # The semaphore is released while backing off, so waiting retries do not hold slots
+                async with self._semaphore:
+                    response = await self._client.request(method, path, **kwargs)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error = AcmeClientError(
+                    f"AcmeCRM {method} {path} failed with status {response.status_code}", response.status_code
+                )
+            except httpx.TransportError as e:
+                error = AcmeClientError(f"AcmeCRM {method} {path} failed: {e!r}")
+            
+            if attempt < self.retries:
+                await asyncio.sleep(self._retry_delay(attempt, response))
+        raise error
+    
+    @staticmethod
+    def _check(response: httpx.Response) -> None:
+        """Raise AcmeClientError for an error status."""
+        if response.is_error:
+            raise AcmeClientError(
+                f"AcmeCRM {response.request.method} {response.request.url.path} failed with status "
+                f"{response.status_code}: {response.text}", response.status_code
+            )
+    
+    async def create_contact(self, contact: AcmeContact) -> AcmeContactResponse:
+        """
+        Create a new contact in AcmeCRM.
+        
+        Args:
+            contact: Contact data in AcmeCRM format
+            
+        Returns:
+            AcmeContactResponse with created contact details
+        """
+        return (await self.create_contacts([contact]))[0]
+    
+    async def create_contacts(self, contacts: List[AcmeContact]) -> List[AcmeContactResponse]:
+        """
+        Create a batch of contacts in AcmeCRM in one request.
+        
+        Args:
+            contacts: Contact data in AcmeCRM format
+            
+        Returns:
+            AcmeContactResponse for each created contact, in input order
+        """
+        response = await self._request(
+            "POST", "/acme/contacts",
+            content=_CONTACT_BODY_ADAPTER.dump_json(contacts),
+            headers={"Content-Type": "application/json", "Idempotency-Key": uuid.uuid4().hex}
+        )
+        self._check(response)
+        return _CONTACT_LIST_ADAPTER.validate_json(response.content)
+    
+    async def get_contact(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        """
+        Retrieve a contact by ID from AcmeCRM.
+        
+        Args:
+            contact_id: Unique contact identifier
+            
+        Returns:
+            AcmeContactResponse if found, None otherwise
+        """
+        response = await self._request("GET", f"/acme/contacts/{contact_id}")
+        if response.status_code == 404:
+            return None
+        self._check(response)
+        return AcmeContactResponse.model_validate_json(response.content)
+    
+    async def get_contacts_page(
+        self,
+        limit: int,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[AcmeContactResponse], Optional[int]]:
+        """
+        Retrieve a single page of contacts.
+        
+        Args:
+            limit: Maximum number of contacts to return
+            after: Sequence number to resume after (exclusive)
+            email: Only include contacts with this email address (case-insensitive)
+            company: Only include contacts at this company (case-insensitive)
+            status: Only include contacts with this status
+            
+        Returns:
+            Tuple of (contacts, sequence number to pass as ``after`` for the next page,
+            or None when there are no further contacts)
+        """
+        params = {"limit": limit, "after": after, "email": email, "company": company, "status": status}
+        response = await self._request(
+            "GET", "/acme/contacts", params={key: value for key, value in params.items() if value is not None}
+        )
+        self._check(response)
+        page = response.json()
+        return _CONTACT_LIST_ADAPTER.validate_python(page["contacts"]), page["next_after"]
+    
+    async def iter_contacts(
+        self,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> AsyncIterator[AcmeContactResponse]:
+        """
+        Lazily iterate over contacts in insertion order, fetching a page at a time.
+        
+        Args:
+            after: Sequence number to resume after (exclusive), or None to start at the beginning
+            email: Only include contacts with this email address (case-insensitive)
+            company: Only include contacts at this company (case-insensitive)
+            status: Only include contacts with this status
+            
+        Yields:
+            Contacts
+        """
+        while True:
+            contacts, after = await self.get_contacts_page(
+                self.PAGE_SIZE, after, email=email, company=company, status=status
+            )
+            for contact in contacts:
+                yield contact
+            if after is None:
+                return
+    
+    async def get_all_contacts(self) -> List[AcmeContactResponse]:
+        """
+        Retrieve all contacts from AcmeCRM.
+        
+        Returns:
+            List of all contacts in AcmeCRM
+        """
+        return [contact async for contact in self.iter_contacts()]
+    
+    async def find_contact_ids(
+        self,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        """
+        Look up contact IDs matching every given filter.
+        
+        Args:
+            email: Email address to match (case-insensitive)
+            company: Company name to match (case-insensitive)
+            status: Status to match
+            
+        Returns:
+            Matching contact IDs in insertion order
+        """
+        if email is None and company is None and status is None:
+            return []
+        return [
+            contact.acme_contact_id
+            async for contact in self.iter_contacts(email=email, company=company, status=status)
+        ]
+    
+    async def find_by_email(self, email: str) -> List[AcmeContactResponse]:
+        """
+        Retrieve contacts with a given email address.
+        
+        Args:
+            email: Email address to match (case-insensitive)
+            
+        Returns:
+            Matching contacts in insertion order
+        """
+        return [contact async for contact in self.iter_contacts(email=email)]
+    
+    async def update_contact_status(self, contact_id: str, status: str) -> bool:
+        """
+        Update the status of a contact in AcmeCRM.
+        
+        Args:
+            contact_id: Unique contact identifier
+            status: New status value
+            
+        Returns:
+            True if update successful, False if contact not found
+        """
+        response = await self._request("PATCH", f"/acme/contacts/{contact_id}", json={"acme_status": status})
+        if response.status_code == 404:
+            return False
+        self._check(response)
+        return True
+    
+    async def delete_contact(self, contact_id: str) -> bool:
+        """
+        Delete a contact from AcmeCRM.
+        
+        Args:
+            contact_id: Unique contact identifier
+            
+        Returns:
+            True if deletion successful, False if contact not found
+        """
+        response = await self._request("DELETE", f"/acme/contacts/{contact_id}")
+        if response.status_code == 404:
+            return False
+        self._check(response)
+        return True
+    
+    async def get_storage_stats(self, top_companies: int = 5) -> Dict[str, Any]:
+        """
+        Get statistics about the contact storage.
+        
+        Args:
+            top_companies: Number of companies to include in the leaderboard
+            
+        Returns:
+            Dictionary with storage statistics
+        """
+        response = await self._request("GET", "/acme/stats", params={"top_companies": top_companies})
+        self._check(response)
+        return response.json()
+    
+    async def clear_storage(self) -> None:
+        """Clear all contacts from storage (for testing)."""
+        self._check(await self._request("DELETE", "/acme/contacts"))
@@ -1,49 +1,249 @@
-"""Mock AcmeCRM service for in-memory contact storage."""
+"""Mock AcmeCRM service for contact storage."""
 
-import uuid
+import base64
+import binascii
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from models.acme_models import AcmeContact, AcmeContactResponse
+from models.linq_models import LinqContact
+from services.change_feed import ChangeFeed, ContactChange
+from services.contact_repository import ContactRepository, InMemoryContactRepository, normalize_key
+from services.contact_store import ContactStore
+from services.duplicate_index import DuplicateIndex
+from services.search_index import SearchIndex
+from services.field_mapper import FieldMapper
+from services.metrics import timed
 
 
 class AcmeService:
-    """Mock service simulating AcmeCRM contact management."""
+    """
+    Mock service simulating AcmeCRM contact management.
     
-    # In-memory storage for contacts
-    _contacts: Dict[str, Dict] = {}
+    Safe to call from multiple threads (FastAPI runs sync endpoints and
+    dependencies in a threadpool): both repositories synchronize their own
+    storage, and updates to the same contact are serialized by lock stripes
+    keyed on the contact ID, so the change feed records them in the order
+    they were applied.
+    """
+    
+    # Storage backend; every contact gets a stable sequence number in insertion
+    # order, which also backs the pagination cursors
+    _repository: ContactRepository = InMemoryContactRepository()
+    
+    # Linq projection of stored contacts and its encoded JSON, keyed by contact ID,
+    # so listing a contact that has not changed skips mapping and serialization
+    _projection_cache: Dict[str, Tuple[LinqContact, bytes]] = {}
+    _projection_lock = threading.Lock()
+    PROJECTION_CACHE_SIZE = 1_000_000
+    _projection_hits = 0
+    _projection_misses = 0
+    
+    # Per-contact write locks, striped by contact ID
+    LOCK_STRIPES = 64
+    _contact_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+    
+    # Upserts of the same email are serialized by lock stripes keyed on the normalized email,
+    # so concurrent upserts cannot both miss the existing contact and create two
+    _email_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+    
+    # Emails and name/company blocks of the stored contacts, for upserts and duplicate checks
+    _duplicates: DuplicateIndex = DuplicateIndex()
+    
+    # Inverted index of names, companies, emails and notes for GET /contacts/search
+    _search: SearchIndex = SearchIndex()
+    
+    # Recent creates, status updates and deletes, for delta sync; the lock keeps
+    # sequence numbers and listener notifications in the same order. Repositories
+    # shared between processes record the feed themselves (records_changes)
+    _changes: ChangeFeed = ChangeFeed()
+    _changes_lock = threading.RLock()
+    
+    # Latest change of such a repository passed to the change listeners, and how many are read at a time
+    _notified = 0
+    CHANGE_NOTIFY_BATCH = 1000
+    
+    # Callbacks notified with the changes of every write, e.g. to push them to live subscribers
+    _change_listeners: List[Callable[[List[ContactChange]], None]] = []
+    
+    @classmethod
+    def use_repository(cls, repository: ContactRepository) -> None:
+        """
+        Switch the storage backend, closing the previous one.
+        
+        Args:
+            repository: Repository to use from now on
+        """
+        cls._repository.close()
+        cls._repository = repository
+        cls._projection_cache.clear()
+        cls._duplicates.reset()
+        cls._search.reset()
+        cls._reset_changes()
+    
+    @classmethod
+    def use_store(cls, store: ContactStore) -> None:
+        """
+        Switch to in-memory storage with the given record layout.
+        
+        Args:
+            store: Empty contact store to use from now on
+        """
+        cls.use_repository(InMemoryContactRepository(store))
     
     @classmethod
-    def create_contact(cls, contact: AcmeContact) -> AcmeContactResponse:
+    def get_contact_count(cls) -> int:
+        """
+        Get the number of stored contacts.
+        
+        Returns:
+            Number of contacts in the repository
+        """
+        return len(cls._repository)
+    
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Get the current store version.
+        
+        Returns:
+            Number that increases whenever any contact is created, updated or deleted
+        """
+        return cls._repository.version
+    
+    @classmethod
+    def create_contact(cls, contact: AcmeContact, upsert: bool = False) -> AcmeContactResponse:
         """
         Create a new contact in AcmeCRM.
         
         Args:
             contact: Contact data in AcmeCRM format
+            upsert: Return the stored contact with the same email instead of creating another, see upsert_contact
             
         Returns:
-            AcmeContactResponse with created contact details
+            AcmeContactResponse with created (or, when upserting, existing) contact details
+        """
+        if upsert:
+            return cls.upsert_contact(contact)[0]
+        return cls.create_contacts([contact])[0]
+    
+    @classmethod
+    @timed("acme_service.upsert_contact")
+    def upsert_contact(cls, contact: AcmeContact) -> Tuple[AcmeContactResponse, bool]:
         """
-        # Generate unique contact ID
-        contact_id = f"acme_{str(uuid.uuid4())[:8]}"
+        Create a contact unless one with the same email (case-insensitive) is already stored.
         
-        # Create contact record
-        contact_record = {
-            "acme_contact": contact,
-            "acme_created_at": datetime.utcnow().isoformat() + "Z",
-            "acme_status": "active"
-        }
+        Repeating the call with the same email is idempotent: it returns the
+        first contact stored with that address, unchanged. The duplicate index
+        answers for new addresses without a repository lookup. Upserts within
+        one process are serialized per email; plain creates and other worker
+        processes of the shared backend are not.
+        
+        Args:
+            contact: Contact data in AcmeCRM format
+            
+        Returns:
+            Tuple of (stored contact, whether it was created by this call)
+        """
+        email = normalize_key(contact.acme_email)
+        with cls._email_locks[hash(email) % cls.LOCK_STRIPES]:
+            if cls._duplicates.may_have_email(cls._repository, email):
+                existing = next(cls._repository.iter_contacts(email=email), None)
+                if existing is not None:
+                    return existing[1], False
+            return cls.create_contacts([contact])[0], True
+    
+    @classmethod
+    @timed("acme_service.find_duplicates")
+    def find_duplicates(cls, contact: AcmeContact) -> List[str]:
+        """
+        Find stored contacts that are probably the same person as a new contact.
+        
+        Compares the first name against contacts with the same normalized last
+        name at the same company (ignoring case, accents, punctuation and
+        legal suffixes such as "Inc"); initials, short forms and small typos
+        match. Contacts without a company are never reported.
+        
+        Args:
+            contact: Contact data in AcmeCRM format
+            
+        Returns:
+            IDs of the possible duplicates, oldest first
+        """
+        return cls._duplicates.similar_contacts(cls._repository, contact)
+    
+    @classmethod
+    @timed("acme_service.search_contacts")
+    def search_contacts(cls, query: str, limit: int) -> List[Tuple[AcmeContactResponse, int]]:
+        """
+        Search contact names, companies, emails and notes, see SearchIndex.search.
+        
+        Args:
+            query: Search text; every word must match, the last one also as a name or company prefix
+            limit: Maximum number of results
+            
+        Returns:
+            List of (contact, score) tuples, best first
+        """
+        results = []
+        for contact_id, score in cls._search.search(cls._repository, query, limit):
+            contact = cls._repository.get(contact_id)
+            # Another worker process of the shared backend may have deleted it since it was indexed
+            if contact is not None:
+                results.append((contact, score))
+        return results
+    
+    @classmethod
+    def sync_search_index(cls) -> Dict[str, int]:
+        """
+        Index every stored contact for search, so the first search does not pay for it.
+        
+        Returns:
+            Dictionary with the searchable contact and prefix word counts
+        """
+        return cls._search.sync(cls._repository)
+    
+    @classmethod
+    def sync_duplicate_index(cls) -> Dict[str, int]:
+        """
+        Index every stored contact for duplicate checks, so the first create does not pay for it.
+        
+        Returns:
+            Dictionary with the indexed key and block counts and the Bloom filter size
+        """
+        return cls._duplicates.sync(cls._repository)
+    
+    @classmethod
+    @timed("acme_service.create_contacts")
+    def create_contacts(cls, contacts: List[AcmeContact]) -> List[AcmeContactResponse]:
+        """
+        Create a batch of contacts in AcmeCRM in a single store update.
         
-        # Store in memory
-        cls._contacts[contact_id] = contact_record
+        Args:
+            contacts: Contact data in AcmeCRM format
+            
+        Returns:
+            AcmeContactResponse for each created contact, in input order
+        """
+        created_at = datetime.utcnow().isoformat() + "Z"
+        contact_ids = cls._repository.insert(contacts, created_at, "active")
+        cls._record_changes([
+            ("create", contact_id, created_at, "active", contact)
+            for contact_id, contact in zip(contact_ids, contacts)
+        ])
         
-        return AcmeContactResponse(
-            acme_contact_id=contact_id,
-            acme_contact=contact,
-            acme_created_at=contact_record["acme_created_at"],
-            acme_status=contact_record["acme_status"]
-        )
+        return [
+            AcmeContactResponse(
+                acme_contact_id=contact_id,
+                acme_contact=contact,
+                acme_created_at=created_at,
+                acme_status="active"
+            )
+            for contact_id, contact in zip(contact_ids, contacts)
+        ]
     
     @classmethod
+    @timed("acme_service.get_contact")
     def get_contact(cls, contact_id: str) -> Optional[AcmeContactResponse]:
         """
         Retrieve a contact by ID from AcmeCRM.
@@ -54,16 +254,7 @@ class AcmeService:
         Returns:
             AcmeContactResponse if found, None otherwise
         """
-        if contact_id not in cls._contacts:
-            return None
-        
-        contact_record = cls._contacts[contact_id]
-        return AcmeContactResponse(
-            acme_contact_id=contact_id,
-            acme_contact=contact_record["acme_contact"],
-            acme_created_at=contact_record["acme_created_at"],
-            acme_status=contact_record["acme_status"]
-        )
+        return cls._repository.get(contact_id)
     
     @classmethod
     def get_all_contacts(cls) -> List[AcmeContactResponse]:
@@ -73,19 +264,342 @@ class AcmeService:
         Returns:
             List of all contacts in AcmeCRM
         """
+        return [contact for _, contact in cls._repository.iter_contacts()]
+    
+    @classmethod
+    def iter_contacts(
+        cls,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[int, AcmeContactResponse]]:
+        """
+        Lazily iterate over contacts in insertion order.
+        
+        When any filter is given the matching contacts are resolved through the
+        repository's indexes instead of walking every contact.
+        
+        Args:
+            after: Sequence number to resume after (exclusive), or None to start at the beginning
+            email: Only include contacts with this email address (case-insensitive)
+            company: Only include contacts at this company (case-insensitive)
+            status: Only include contacts with this status
+            
+        Yields:
+            Tuples of (sequence number, contact)
+        """
+        return cls._repository.iter_contacts(after, email=email, company=company, status=status)
+    
+    @classmethod
+    def find_contact_ids(
+        cls,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[str]:
+        """
+        Look up contact IDs through the secondary indexes.
+        
+        Args:
+            email: Email address to match (case-insensitive)
+            company: Company name to match (case-insensitive)
+            status: Status to match
+            
+        Returns:
+            IDs of contacts matching every given filter, in insertion order
+        """
+        return [
+            contact.acme_contact_id
+            for _, contact in cls.iter_contacts(email=email, company=company, status=status)
+        ]
+    
+    @classmethod
+    def find_by_email(cls, email: str) -> List[AcmeContactResponse]:
+        """
+        Retrieve contacts with a given email address.
+        
+        Args:
+            email: Email address to match (case-insensitive)
+            
+        Returns:
+            Matching contacts in insertion order
+        """
+        return [contact for _, contact in cls.iter_contacts(email=email)]
+    
+    @classmethod
+    @timed("acme_service.get_contacts_page")
+    def get_contacts_page(
+        cls,
+        limit: int,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[List[AcmeContactResponse], Optional[int]]:
+        """
+        Retrieve a single page of contacts.
+        
+        Args:
+            limit: Maximum number of contacts to return
+            after: Sequence number to resume after (exclusive)
+            email: Only include contacts with this email address (case-insensitive)
+            company: Only include contacts at this company (case-insensitive)
+            status: Only include contacts with this status
+            
+        Returns:
+            Tuple of (contacts, sequence number to pass as ``after`` for the next page,
+            or None when there are no further contacts)
+        """
         contacts = []
-        for contact_id, contact_record in cls._contacts.items():
-            contacts.append(
-                AcmeContactResponse(
-                    acme_contact_id=contact_id,
-                    acme_contact=contact_record["acme_contact"],
-                    acme_created_at=contact_record["acme_created_at"],
-                    acme_status=contact_record["acme_status"]
-                )
-            )
-        return contacts
+        last_seq = None
+        for seq, contact in cls.iter_contacts(after, email=email, company=company, status=status):
+            if len(contacts) == limit:
+                return contacts, last_seq
+            contacts.append(contact)
+            last_seq = seq
+        return contacts, None
+    
+    @classmethod
+    def get_linq_projection(cls, contact: AcmeContactResponse) -> Tuple[LinqContact, bytes]:
+        """
+        Get a stored contact in Linq format together with its encoded JSON.
+        
+        Args:
+            contact: Stored contact
+            
+        Returns:
+            Tuple of (Linq contact, UTF-8 JSON object bytes)
+        """
+        cached = cls._projection_cache.get(contact.acme_contact_id)
+        if cached is not None:
+            cls._projection_hits += 1
+        else:
+            cls._projection_misses += 1
+            linq_contact = FieldMapper.map_acme_to_linq(contact.acme_contact)
+            cached = (linq_contact, linq_contact.model_dump_json().encode())
+            with cls._projection_lock:
+                if len(cls._projection_cache) >= cls.PROJECTION_CACHE_SIZE:
+                    # Evict the oldest entry; dicts keep insertion order
+                    del cls._projection_cache[next(iter(cls._projection_cache))]
+                cls._projection_cache[contact.acme_contact_id] = cached
+        return cached
+    
+    @classmethod
+    def get_projection_cache_stats(cls) -> Dict[str, float]:
+        """
+        Get Linq projection cache counters.
+        
+        The counters are updated without a lock, so under concurrent reads a
+        few increments may be lost; they are meant for monitoring only.
+        
+        Returns:
+            Dictionary with hits, misses, hit_ratio and the current number of cached contacts
+        """
+        lookups = cls._projection_hits + cls._projection_misses
+        return {
+            "hits": cls._projection_hits,
+            "misses": cls._projection_misses,
+            "hit_ratio": round(cls._projection_hits / lookups, 4) if lookups else 0.0,
+            "size": len(cls._projection_cache)
+        }
     
     @classmethod
+    @timed("acme_service.get_contacts_page_json")
+    def get_contacts_page_json(
+        cls,
+        limit: int,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[bytes, Optional[int]]:
+        """
+        Retrieve a single page of contacts as a ready-to-send JSON array in Linq format.
+        
+        The array is stitched together from cached per-contact JSON, so
+        unchanged contacts are neither mapped nor serialized again.
+        
+        Args:
+            limit: Maximum number of contacts to return
+            after: Sequence number to resume after (exclusive)
+            email: Only include contacts with this email address (case-insensitive)
+            company: Only include contacts at this company (case-insensitive)
+            status: Only include contacts with this status
+            
+        Returns:
+            Tuple of (JSON array bytes, sequence number for the next page or None)
+        """
+        contacts, next_seq = cls.get_contacts_page(limit, after, email=email, company=company, status=status)
+        body = b"[" + b",".join(cls.get_linq_projection(contact)[1] for contact in contacts) + b"]"
+        return body, next_seq
+    
+    @classmethod
+    @timed("acme_service.get_changes")
+    def get_changes(cls, since: int, limit: int) -> Optional[List[ContactChange]]:
+        """
+        Get the contact changes recorded after a change cursor.
+        
+        Args:
+            since: Sequence number of the last change the caller has applied
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Changes in order, or None if the cursor has aged out of the change
+            feed and the caller has to resync from a full listing
+        """
+        if cls._repository.records_changes:
+            return cls._repository.changes_since(since, limit)
+        with cls._changes_lock:
+            return cls._changes.since(since, limit)
+    
+    @classmethod
+    def get_change_cursor(cls) -> int:
+        """
+        Get the cursor of the latest recorded change.
+        
+        Take it before a full listing, then pass it to ``get_changes`` to
+        catch up on anything that changed during and after the listing.
+        
+        Returns:
+            Sequence number of the latest change
+        """
+        if cls._repository.records_changes:
+            return cls._repository.change_cursor
+        return cls._changes.last_seq
+    
+    @classmethod
+    def add_change_listener(cls, listener: Callable[[List[ContactChange]], None]) -> None:
+        """
+        Register a callback invoked with the changes recorded by each write.
+        
+        Listeners run synchronously inside the write (or ``poll_changes``, for
+        other processes' writes to a shared repository), so they should only
+        hand the changes off (e.g. enqueue them) rather than do slow work.
+        Successive calls continue each other's sequence numbers unless the
+        feed was reset in between, e.g. by a clear.
+        
+        Args:
+            listener: Callable receiving the changes of one create, update or delete call
+        """
+        cls._change_listeners.append(listener)
+    
+    @classmethod
+    def remove_change_listener(cls, listener: Callable[[List[ContactChange]], None]) -> None:
+        """
+        Unregister a callback added with ``add_change_listener``.
+        
+        Args:
+            listener: Previously registered callable
+        """
+        if listener in cls._change_listeners:
+            cls._change_listeners.remove(listener)
+    
+    @classmethod
+    def _record_changes(cls, entries: List[Tuple[str, str, str, Optional[str], Optional[AcmeContact]]]) -> None:
+        """Record (op, contact ID, timestamp, status, contact) changes in the feed and notify every listener."""
+        with cls._changes_lock:
+            if cls._repository.records_changes:
+                # Already recorded by the repository, in order with the writes of other processes
+                cls._notify_recorded_changes()
+                return
+            changes = [
+                cls._changes.record(op, contact_id, at, status=status, contact=contact)
+                for op, contact_id, at, status, contact in entries
+            ]
+            cls._notify(changes)
+    
+    @classmethod
+    def poll_changes(cls) -> None:
+        """
+        Notify the change listeners of writes made by other processes sharing the repository.
+        
+        Only repositories that record their own change feed (the shared
+        backend) see such writes; call this periodically to push them live.
+        """
+        if cls._repository.records_changes:
+            with cls._changes_lock:
+                cls._notify_recorded_changes()
+    
+    @classmethod
+    def _notify_recorded_changes(cls) -> None:
+        """Pass the changes the repository recorded since the last call to every listener; the caller holds ``_changes_lock``."""
+        while True:
+            changes = cls._repository.changes_since(cls._notified, cls.CHANGE_NOTIFY_BATCH)
+            if changes is None:
+                # No longer retained: listeners see the gap in the next changes and resync
+                cls._notified = cls._repository.change_cursor
+                return
+            if not changes:
+                return
+            cls._notified = changes[-1].seq
+            cls._notify(changes)
+    
+    @classmethod
+    def _notify(cls, changes: List[ContactChange]) -> None:
+        """Pass freshly recorded changes to every change listener."""
+        for listener in cls._change_listeners:
+            listener(changes)
+    
+    @classmethod
+    def _reset_changes(cls) -> None:
+        """Forget all recorded changes, so every change cursor has to resync."""
+        with cls._changes_lock:
+            cls._changes.reset()
+            if cls._repository.records_changes:
+                cls._notified = cls._repository.change_cursor
+    
+    @classmethod
+    def _contact_lock(cls, contact_id: str) -> threading.Lock:
+        """Return the write lock stripe for a contact."""
+        return cls._contact_locks[hash(contact_id) % cls.LOCK_STRIPES]
+    
+    @classmethod
+    def _invalidate_projection(cls, contact_id: str) -> None:
+        """Drop a contact's cached Linq projection."""
+        cls._projection_cache.pop(contact_id, None)
+    
+    @staticmethod
+    def encode_cursor(seq: int) -> str:
+        """
+        Encode a sequence number as an opaque pagination cursor.
+        
+        Args:
+            seq: Sequence number of the last contact returned
+            
+        Returns:
+            URL-safe cursor string
+        """
+        return base64.urlsafe_b64encode(f"c:{seq}".encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        """
+        Decode an opaque pagination cursor back into a sequence number.
+        
+        Args:
+            cursor: Cursor previously returned by ``encode_cursor``
+            
+        Returns:
+            Sequence number encoded in the cursor
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            prefix, _, value = base64.urlsafe_b64decode(padded).decode().partition(":")
+            if prefix != "c":
+                raise ValueError
+            seq = int(value)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if seq < 0:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        return seq
+    
+    @classmethod
+    @timed("acme_service.update_contact_status")
     def update_contact_status(cls, contact_id: str, status: str) -> bool:
         """
         Update the status of a contact in AcmeCRM.
@@ -97,13 +611,15 @@ class AcmeService:
         Returns:
             True if update successful, False if contact not found
         """
-        if contact_id not in cls._contacts:
-            return False
-        
-        cls._contacts[contact_id]["acme_status"] = status
+        with cls._contact_lock(contact_id):
+            cls._invalidate_projection(contact_id)
+            if not cls._repository.set_status(contact_id, status):
+                return False
+            cls._record_changes([("status", contact_id, datetime.utcnow().isoformat() + "Z", status, None)])
         return True
     
     @classmethod
+    @timed("acme_service.delete_contact")
     def delete_contact(cls, contact_id: str) -> bool:
         """
         Delete a contact from AcmeCRM.
@@ -114,27 +630,70 @@ class AcmeService:
         Returns:
             True if deletion successful, False if contact not found
         """
-        if contact_id not in cls._contacts:
-            return False
-        
-        del cls._contacts[contact_id]
+        with cls._contact_lock(contact_id):
+            cls._invalidate_projection(contact_id)
+            cls._search.remove(cls._repository, contact_id)
+            if not cls._repository.delete(contact_id):
+                return False
+            cls._record_changes([("delete", contact_id, datetime.utcnow().isoformat() + "Z", None, None)])
         return True
     
     @classmethod
-    def get_storage_stats(cls) -> Dict[str, int]:
+    @timed("acme_service.get_storage_stats")
+    def get_storage_stats(cls, top_companies: int = 5) -> Dict[str, Any]:
         """
-        Get statistics about the in-memory storage.
+        Get statistics about the contact storage.
         
+        The in-memory backend answers from counters maintained on every write;
+        the SQLite backend from count tables its triggers update on every write.
+        Every backend counts the contacts currently stored: companies by
+        normalized name, as the company filter matches them, shown with their
+        most common spelling, and creation minutes without deleted contacts.
+        
+        Args:
+            top_companies: Number of companies to include in the leaderboard
+            
         Returns:
             Dictionary with storage statistics
         """
-        return {
-            "total_contacts": len(cls._contacts),
-            "active_contacts": sum(1 for c in cls._contacts.values() if c["acme_status"] == "active"),
-            "inactive_contacts": sum(1 for c in cls._contacts.values() if c["acme_status"] != "active")
-        }
+        return cls._repository.stats(top_companies)
     
     @classmethod
     def clear_storage(cls) -> None:
-        """Clear all contacts from in-memory storage (for testing)."""
-        cls._contacts.clear()
+        """Clear all contacts from storage (for testing)."""
+        cls._repository.clear()
+        cls._projection_cache.clear()
+        cls._duplicates.reset()
+        cls._search.reset()
+        cls._reset_changes()
+    
+    @classmethod
+    def enable_persistence(cls, directory: str, **journal_options: Any) -> None:
+        """
+        Restore in-memory contacts from disk and journal every later change.
+        
+        Args:
+            directory: Directory holding the journal and snapshots
+            **journal_options: Extra ContactJournal settings (flush_interval, snapshot_every, sync_commit)
+            
+        Raises:
+            ValueError: If the current backend is not the in-memory repository
+        """
+        if not isinstance(cls._repository, InMemoryContactRepository):
+            raise ValueError("Journal persistence only applies to the in-memory contact repository")
+        cls._repository.enable_persistence(directory, **journal_options)
+        cls._projection_cache.clear()
+        cls._duplicates.reset()
+        cls._search.reset()
+        cls._reset_changes()
+    
+    @classmethod
+    def disable_persistence(cls) -> None:
+        """Flush and close the journal, if one is attached."""
+        if isinstance(cls._repository, InMemoryContactRepository):
+            cls._repository.disable_persistence()
+    
+    @classmethod
+    def close(cls) -> None:
+        """Flush and release the storage backend on shutdown."""
+        cls._repository.close()
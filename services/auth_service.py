@@ -1,10 +1,13 @@
 """Mock JWT authentication service for Linq-AcmeCRM integration."""
 
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from pydantic import BaseModel
+from services.metrics import timed
 
 
 class TokenData(BaseModel):
@@ -27,6 +30,14 @@ class AuthService:
         "linq-sales-engineer": "sales_user"
     }
     
+    # Verified JWTs mapped to (username, expiry as epoch seconds), least recently used first;
+    # a cached entry never outlives the token's own exp claim
+    TOKEN_CACHE_SIZE = 1024
+    TOKEN_CACHE_MAX_TTL = 300
+    _token_cache: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+    _cache_hits = 0
+    _cache_misses = 0
+    
     @classmethod
     def create_access_token(cls, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         """
@@ -54,6 +65,9 @@ class AuthService:
         """
         Verify a JWT token and return token data.
         
+        Successfully verified JWTs are kept in a bounded LRU cache until they
+        expire, so repeated requests with the same token skip jwt.decode.
+        
         Args:
             token: JWT token to verify
             
@@ -73,16 +87,67 @@ class AuthService:
         if token in cls.MOCK_VALID_TOKENS:
             return TokenData(username=cls.MOCK_VALID_TOKENS[token])
         
+        # Skip signature verification and claim parsing for recently verified tokens
+        cached = cls._token_cache.get(token)
+        if cached is not None:
+            if cached[1] > time.time():
+                cls._token_cache.move_to_end(token)
+                cls._cache_hits += 1
+                return TokenData(username=cached[0])
+            del cls._token_cache[token]
+        cls._cache_misses += 1
+        
         try:
             payload = jwt.decode(token, cls.SECRET_KEY, algorithms=[cls.ALGORITHM])
             username: str = payload.get("sub")
             if username is None:
                 raise credentials_exception
-            return TokenData(username=username)
         except JWTError:
             raise credentials_exception
+        
+        cls._cache_token(token, username, payload.get("exp"))
+        return TokenData(username=username)
+    
+    @classmethod
+    def _cache_token(cls, token: str, username: str, exp: Optional[float]) -> None:
+        """Remember a verified token until its exp claim (capped at TOKEN_CACHE_MAX_TTL), evicting the LRU entry."""
+        if cls.TOKEN_CACHE_SIZE <= 0:
+            return
+        expires_at = time.time() + cls.TOKEN_CACHE_MAX_TTL
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        if expires_at <= time.time():
+            return
+        cls._token_cache[token] = (username, expires_at)
+        cls._token_cache.move_to_end(token)
+        while len(cls._token_cache) > cls.TOKEN_CACHE_SIZE:
+            cls._token_cache.popitem(last=False)
+    
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, float]:
+        """
+        Get token verification cache counters.
+        
+        Returns:
+            Dictionary with hits, misses, hit_ratio and the current number of cached tokens
+        """
+        lookups = cls._cache_hits + cls._cache_misses
+        return {
+            "hits": cls._cache_hits,
+            "misses": cls._cache_misses,
+            "hit_ratio": round(cls._cache_hits / lookups, 4) if lookups else 0.0,
+            "size": len(cls._token_cache)
+        }
+    
+    @classmethod
+    def clear_token_cache(cls) -> None:
+        """Drop all cached tokens and reset the counters."""
+        cls._token_cache.clear()
+        cls._cache_hits = 0
+        cls._cache_misses = 0
     
     @classmethod
+    @timed("auth.get_current_user")
     def get_current_user(cls, token: str) -> str:
         """
         Get the current authenticated user from token.
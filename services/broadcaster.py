@@ -0,0 +1,121 @@
+"""Asyncio fan-out of contact change messages to live subscribers."""
+
+import asyncio
+from typing import Optional, Set, Tuple
+
+# (sequence number of the change before the message, of the last change in the message, encoded message)
+ChangeMessage = Tuple[int, int, bytes]
+
+
+class Subscription:
+    """A subscriber's bounded queue of pending change messages."""
+    
+    def __init__(self, queue_size: int) -> None:
+        self._queue: "asyncio.Queue[Optional[ChangeMessage]]" = asyncio.Queue(queue_size)
+        self.dropped = False
+    
+    async def get(self, timeout: Optional[float] = None) -> Optional[ChangeMessage]:
+        """
+        Wait for the next message.
+        
+        Args:
+            timeout: Seconds to wait before giving up, or None to wait indefinitely
+            
+        Returns:
+            The next message, or None on timeout or once the subscriber has been dropped
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    def _offer(self, message: ChangeMessage) -> bool:
+        """Queue a message without waiting, returning False when the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def _drop(self) -> None:
+        """Discard pending messages and wake the consumer with the end-of-stream marker."""
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class ChangeBroadcaster:
+    """
+    Fans each published message out to every subscriber's bounded queue.
+    
+    Messages are encoded once by the publisher and shared by all subscribers.
+    A subscriber whose queue is full is dropped instead of buffering without
+    limit: its pending messages are discarded and its stream ends, so the
+    client reconnects and catches up from the change feed.
+    """
+    
+    def __init__(self, queue_size: int = 256) -> None:
+        """
+        Create a broadcaster without subscribers.
+        
+        Args:
+            queue_size: Maximum number of undelivered messages per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.dropped = 0
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of live subscribers."""
+        return len(self._subscribers)
+    
+    def subscribe(self) -> Subscription:
+        """
+        Register a new subscriber; must be called from the event loop that consumes it.
+        
+        Returns:
+            Subscription receiving every message published from now on
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; safe to call more than once."""
+        self._subscribers.discard(subscription)
+    
+    def publish(self, since: int, seq: int, message: bytes) -> None:
+        """
+        Deliver a message to all subscribers.
+        
+        Safe to call from any thread; calls from outside the event loop are
+        handed over to it.
+        
+        Args:
+            since: Sequence number of the change before the first one in the message
+            seq: Sequence number of the last change in the message
+            message: Encoded message
+        """
+        if not self._subscribers or self._loop is None:
+            return
+        try:
+            on_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._deliver((since, seq, message))
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, (since, seq, message))
+    
+    def _deliver(self, message: ChangeMessage) -> None:
+        self.published += 1
+        slow = [subscription for subscription in self._subscribers if not subscription._offer(message)]
+        for subscription in slow:
+            self._subscribers.discard(subscription)
+            subscription._drop()
+            self.dropped += 1
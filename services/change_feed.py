@@ -0,0 +1,119 @@
+"""Bounded feed of recent contact changes for delta sync."""
+
+import time
+from typing import List, NamedTuple, Optional
+from models.acme_models import AcmeContact
+
+
+class ContactChange(NamedTuple):
+    """A single recorded change to a stored contact."""
+    
+    seq: int
+    op: str
+    contact_id: str
+    status: Optional[str]
+    contact: Optional[AcmeContact]
+    at: str
+
+
+class ChangeFeed:
+    """
+    Ring buffer of the most recent contact changes, numbered consecutively.
+    
+    The change with sequence number ``seq`` lives in slot ``seq % capacity``,
+    so finding where a reader resumes is a single index calculation. Once a
+    reader's cursor is older than the oldest retained change, the feed can no
+    longer tell it what it missed and it has to resync from a full listing.
+    """
+    
+    def __init__(self, capacity: int = 100_000) -> None:
+        """
+        Create an empty feed.
+        
+        Args:
+            capacity: Number of most recent changes retained
+        """
+        self.capacity = capacity
+        self._ring: List[Optional[ContactChange]] = [None] * capacity
+        # Seeded from the clock (in microseconds, so cursors stay exact in JavaScript numbers)
+        # so that cursors handed out by a previous run are recognised as aged out
+        self._last_seq = time.time_ns() // 1000
+        self._first_seq = self._last_seq + 1
+    
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest change, usable as a cursor for 'nothing missed so far'."""
+        return self._last_seq
+    
+    @property
+    def first_seq(self) -> int:
+        """Sequence number of the oldest retained change."""
+        return self._first_seq
+    
+    def record(
+        self,
+        op: str,
+        contact_id: str,
+        at: str,
+        status: Optional[str] = None,
+        contact: Optional[AcmeContact] = None
+    ) -> ContactChange:
+        """
+        Append a change, overwriting the oldest one when the feed is full.
+        
+        Args:
+            op: Kind of change: "create", "status" or "delete"
+            contact_id: Contact the change applies to
+            at: ISO-8601 timestamp of the change
+            status: Contact status after the change, if it still exists
+            contact: Contact data, for creates
+            
+        Returns:
+            The recorded change, with its assigned sequence number
+        """
+        self._last_seq += 1
+        seq = self._last_seq
+        change = ContactChange(seq, op, contact_id, status, contact, at)
+        self._ring[seq % self.capacity] = change
+        if seq - self._first_seq >= self.capacity:
+            self._first_seq = seq - self.capacity + 1
+        return change
+    
+    def since(self, seq: int, limit: int) -> Optional[List[ContactChange]]:
+        """
+        Get the changes recorded after a cursor.
+        
+        Args:
+            seq: Sequence number of the last change the reader has seen
+            limit: Maximum number of changes to return
+            
+        Returns:
+            Up to ``limit`` changes in order, or None if the reader must resync
+            because changes after ``seq`` are no longer retained (or ``seq`` is unknown)
+        """
+        if seq < self._first_seq - 1 or seq > self._last_seq:
+            return None
+        stop = min(self._last_seq, seq + limit)
+        return [self._ring[s % self.capacity] for s in range(seq + 1, stop + 1)]
+    
+    def reset(self) -> None:
+        """Forget all retained changes, so every existing cursor has to resync."""
+        self._ring = [None] * self.capacity
+        # Skip a number so that even a cursor at the latest change falls behind the retained range
+        self._last_seq += 1
+        self._first_seq = self._last_seq + 1
+    
+    def restart(self, last_seq: int) -> None:
+        """
+        Forget all retained changes and continue numbering after ``last_seq``.
+        
+        For feeds whose numbers are handed out elsewhere, e.g. by the shared
+        backend's log: a cursor at ``last_seq`` is still up to date, older ones
+        have to resync.
+        
+        Args:
+            last_seq: Sequence number of the latest change made so far
+        """
+        self._ring = [None] * self.capacity
+        self._last_seq = last_seq
+        self._first_seq = last_seq + 1
@@ -0,0 +1,638 @@
+"""Storage backends behind AcmeService."""
+
+import bisect
+import gc
+import heapq
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.change_feed import ContactChange
+from services.contact_store import ContactStore, DictContactStore, contact_from_tuple, contact_to_tuple
+from services.persistence import ContactJournal, SnapshotRow
+
+# Contacts read per store lock acquisition while iterating; the first chunk covers
+# a default page, later ones grow so long scans take the lock less often
+_FIRST_CHUNK = 128
+_MAX_CHUNK = 2048
+
+
+def normalize_key(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize an email or company name for case-insensitive lookups.
+    
+    Args:
+        value: Raw email address or company name
+        
+    Returns:
+        Normalized key, or None for empty values
+    """
+    return value.strip().casefold() if value else None
+
+
+def company_leaderboard(counts: Dict[str, int], spellings: Callable[[str], Counter], limit: int) -> List[Dict[str, Any]]:
+    """
+    Build the ``top_companies`` stats entries from contact counts per normalized company name.
+    
+    Args:
+        counts: Contacts per company, keyed by ``normalize_key`` as in the company filter
+        spellings: Returns the contacts per spelling of a normalized company name
+        limit: Number of companies to include
+        
+    Returns:
+        The most common spelling of each company with its contact count, most contacts
+        first; ties go to the alphabetically first normalized name and spelling
+    """
+    return [
+        {"company": min(spellings(key).items(), key=lambda item: (-item[1], item[0]))[0], "contacts": count}
+        for key, count in heapq.nsmallest(limit, counts.items(), key=lambda item: (-item[1], item[0]))
+    ]
+
+
+def new_contact_ids(count: int, in_use: Callable[[str], bool]) -> List[str]:
+    """
+    Generate contact IDs that are not already in use (8 hex digits collide at scale).
+    
+    Args:
+        count: Number of IDs to generate
+        in_use: Returns True for IDs already taken by a stored contact
+        
+    Returns:
+        Distinct unused contact IDs
+    """
+    contact_ids: List[str] = []
+    seen: Set[str] = set()
+    while len(contact_ids) < count:
+        contact_id = f"acme_{str(uuid.uuid4())[:8]}"
+        if contact_id not in seen and not in_use(contact_id):
+            seen.add(contact_id)
+            contact_ids.append(contact_id)
+    return contact_ids
+
+
+class ContactRepository(ABC):
+    """
+    Storage backend for AcmeCRM contacts.
+    
+    Every contact gets a sequence number in insertion order that is never
+    reused, which backs the pagination cursors handed out by AcmeService.
+    """
+    
+    # Number of per-minute creation buckets kept for the stats histogram
+    STATS_HISTORY_MINUTES = 60
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored contacts."""
+    
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Number that increases on every change to the stored contacts."""
+    
+    @property
+    def generation(self) -> int:
+        """
+        Number of times the store was cleared, by this or another process.
+        
+        Process-local indexes that follow the repository by sequence number
+        start over when it changes, since what they indexed is gone.
+        """
+        return 0
+    
+    # Whether the backend records the change feed itself, for every process sharing the store
+    # (see changes_since); AcmeService keeps one per process for the other backends
+    records_changes = False
+    
+    def changes_since(self, seq: int, limit: int) -> Optional[List[ContactChange]]:
+        """
+        Get the changes made by any process after a change cursor, see ChangeFeed.since.
+        
+        Only implemented by backends that set ``records_changes``.
+        """
+        raise NotImplementedError
+    
+    @property
+    def change_cursor(self) -> int:
+        """Sequence number of the latest change made by any process; only for backends that set ``records_changes``."""
+        raise NotImplementedError
+    
+    @abstractmethod
+    def insert(self, contacts: List[AcmeContact], created_at: str, status: str) -> List[str]:
+        """
+        Store new contacts.
+        
+        Args:
+            contacts: Contact data in AcmeCRM format
+            created_at: Creation timestamp shared by the batch
+            status: Initial status
+            
+        Returns:
+            Generated contact IDs, in input order
+        """
+    
+    @abstractmethod
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        """Return a contact by ID, or None if it does not exist."""
+    
+    @abstractmethod
+    def iter_contacts(
+        self,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[int, AcmeContactResponse]]:
+        """Lazily yield (sequence number, contact) pairs in insertion order, see AcmeService.iter_contacts."""
+    
+    @abstractmethod
+    def set_status(self, contact_id: str, status: str) -> bool:
+        """Update a contact's status, returning False if it does not exist."""
+    
+    @abstractmethod
+    def delete(self, contact_id: str) -> bool:
+        """Delete a contact, returning False if it does not exist."""
+    
+    @abstractmethod
+    def stats(self, top_companies: int = 5) -> Dict[str, Any]:
+        """Return storage statistics, see AcmeService.get_storage_stats."""
+    
+    @abstractmethod
+    def clear(self) -> None:
+        """Delete all contacts."""
+    
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class _Shard:
+    """Secondary indexes and stats counters for the contacts in one lock stripe."""
+    
+    __slots__ = (
+        "lock", "email_index", "company_index", "status_index",
+        "status_counts", "company_counts", "company_spellings", "created_per_minute"
+    )
+    
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        
+        # Secondary hash indexes mapping a lookup key to the sequence numbers of matching contacts
+        self.email_index: Dict[str, Set[int]] = {}
+        self.company_index: Dict[str, Set[int]] = {}
+        self.status_index: Dict[str, Set[int]] = {}
+        
+        # Running counters behind stats(), updated on every write; companies are counted
+        # by normalized name, and per spelling for display
+        self.status_counts: Counter = Counter()
+        self.company_counts: Counter = Counter()
+        self.company_spellings: Dict[str, Counter] = {}
+        self.created_per_minute: "OrderedDict[str, int]" = OrderedDict()
+    
+    def clear(self) -> None:
+        self.email_index.clear()
+        self.company_index.clear()
+        self.status_index.clear()
+        self.status_counts.clear()
+        self.company_counts.clear()
+        self.company_spellings.clear()
+        self.created_per_minute.clear()
+
+
+class InMemoryContactRepository(ContactRepository):
+    """
+    Contacts kept in a process-local ContactStore.
+    
+    Filters are answered from hash indexes and stats from counters that are
+    both maintained on every write. Durability is optional, through a
+    ContactJournal attached with ``enable_persistence``.
+    
+    Safe to use from many threads. The indexes and counters are split into
+    lock stripes by contact ID, so writers to different contacts only
+    serialize on the brief ContactStore update. Locks are always taken in
+    the same order (stripes by ascending number, then the store lock), so
+    writers cannot deadlock.
+    """
+    
+    # Number of lock stripes the indexes and counters are sharded into
+    LOCK_STRIPES = 16
+    
+    def __init__(self, store: Optional[ContactStore] = None) -> None:
+        """
+        Create an empty repository.
+        
+        Args:
+            store: Empty contact store defining the record layout (dict layout by default)
+        """
+        self._store: ContactStore = store if store is not None else DictContactStore()
+        
+        # Guards the store itself, the version and the order of journal records
+        self._store_lock = threading.Lock()
+        self._shards = [_Shard() for _ in range(self.LOCK_STRIPES)]
+        
+        # Write-ahead journal, set when persistence is enabled
+        self._journal: Optional[ContactJournal] = None
+        
+        # Seeded from the clock so versions keep increasing across restarts
+        self._version = time.time_ns()
+    
+    def __len__(self) -> int:
+        return len(self._store)
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def _stripe(self, contact_id: str) -> int:
+        """Return the number of the lock stripe owning a contact."""
+        return hash(contact_id) % self.LOCK_STRIPES
+    
+    @contextmanager
+    def _locked(self, stripes: Iterable[int]) -> Iterator[None]:
+        """Hold the given lock stripes, acquired in ascending order."""
+        locks = [self._shards[stripe].lock for stripe in sorted(set(stripes))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+    
+    def _all_stripes(self) -> ContextManager[None]:
+        """Hold every lock stripe, for operations that need a consistent view of all contacts."""
+        return self._locked(range(self.LOCK_STRIPES))
+    
+    @staticmethod
+    def _index_add(index: Dict[str, Set[int]], key: Optional[str], seq: int) -> None:
+        """Add a contact's sequence number under a key in a secondary index."""
+        if key is not None:
+            index.setdefault(key, set()).add(seq)
+    
+    @staticmethod
+    def _index_discard(index: Dict[str, Set[int]], key: Optional[str], seq: int) -> None:
+        """Remove a contact's sequence number from a key in a secondary index, dropping empty keys."""
+        seqs = index.get(key)
+        if seqs is not None:
+            seqs.discard(seq)
+            if not seqs:
+                del index[key]
+    
+    @classmethod
+    def _index_contact(cls, shard: _Shard, seq: int, contact: AcmeContact, status: str) -> None:
+        """Register a newly stored contact in all secondary indexes of its shard."""
+        cls._index_add(shard.email_index, normalize_key(contact.acme_email), seq)
+        cls._index_add(shard.company_index, normalize_key(contact.acme_company_name), seq)
+        cls._index_add(shard.status_index, status, seq)
+    
+    @staticmethod
+    def _decrement(counter: Counter, key: Optional[str]) -> None:
+        """Decrement a running counter, dropping keys that reach zero."""
+        if key is None:
+            return
+        counter[key] -= 1
+        if counter[key] <= 0:
+            del counter[key]
+    
+    @classmethod
+    def _count_company(cls, shard: _Shard, company: Optional[str], delta: int) -> None:
+        """Add or remove a contact at a company in a shard's company counters."""
+        key = normalize_key(company)
+        if key is None:
+            return
+        spellings = shard.company_spellings.setdefault(key, Counter())
+        if delta > 0:
+            shard.company_counts[key] += delta
+            spellings[company] += delta
+            return
+        cls._decrement(shard.company_counts, key)
+        cls._decrement(spellings, company)
+        if not spellings:
+            del shard.company_spellings[key]
+    
+    def _count_created(self, shard: _Shard, contacts: List[AcmeContact], created_at: str, status: str) -> None:
+        """Update a shard's running stats counters for newly stored contacts."""
+        shard.status_counts[status] += len(contacts)
+        for contact in contacts:
+            self._count_company(shard, contact.acme_company_name, 1)
+        
+        # Bucket by minute, e.g. "2025-07-25T10:30Z"
+        minute = created_at[:16] + "Z"
+        shard.created_per_minute[minute] = shard.created_per_minute.get(minute, 0) + len(contacts)
+        shard.created_per_minute.move_to_end(minute)
+        while len(shard.created_per_minute) > self.STATS_HISTORY_MINUTES:
+            shard.created_per_minute.popitem(last=False)
+    
+    def _apply_create(
+        self, contact_ids: List[str], contacts: List[AcmeContact], created_at: str, status: str
+    ) -> int:
+        """Store new contacts and bump the version, returning the first sequence number; the caller holds the store lock."""
+        first_seq = self._store.insert_many(contact_ids, contacts, created_at, status)
+        self._version += 1
+        return first_seq
+    
+    def _index_created(
+        self, first_seq: int, contact_ids: List[str], contacts: List[AcmeContact], created_at: str, status: str
+    ) -> None:
+        """Register new contacts in the indexes and counters; the caller holds their lock stripes."""
+        by_stripe: Dict[int, List[AcmeContact]] = {}
+        for offset, (contact_id, contact) in enumerate(zip(contact_ids, contacts)):
+            stripe = self._stripe(contact_id)
+            self._index_contact(self._shards[stripe], first_seq + offset, contact, status)
+            by_stripe.setdefault(stripe, []).append(contact)
+        for stripe, stripe_contacts in by_stripe.items():
+            self._count_created(self._shards[stripe], stripe_contacts, created_at, status)
+    
+    def _log(self, record: Dict[str, Any]) -> int:
+        """
+        Append a mutation to the journal when persistence is enabled.
+        
+        Called under the store lock so records are logged in the order they
+        were applied; returns the log sequence number to pass to ``_wait_durable``
+        once the lock is released (0 without a journal).
+        """
+        if self._journal is None:
+            return 0
+        return self._journal.append(record, wait=False)
+    
+    def _wait_durable(self, lsn: int) -> None:
+        """Block until a logged mutation is durable, if the journal commits synchronously."""
+        journal = self._journal
+        if lsn and journal is not None:
+            journal.wait_durable(lsn)
+    
+    def insert(self, contacts: List[AcmeContact], created_at: str, status: str) -> List[str]:
+        while True:
+            contact_ids = new_contact_ids(len(contacts), self._store.__contains__)
+            with self._locked(self._stripe(contact_id) for contact_id in contact_ids):
+                with self._store_lock:
+                    # Another writer may have taken one of the IDs since they were generated
+                    if any(contact_id in self._store for contact_id in contact_ids):
+                        continue
+                    first_seq = self._apply_create(contact_ids, contacts, created_at, status)
+                    lsn = self._log({"op": "create", "seq": first_seq, "ids": contact_ids, "at": created_at,
+                                     "contacts": [contact_to_tuple(contact) for contact in contacts]})
+                self._index_created(first_seq, contact_ids, contacts, created_at, status)
+            self._wait_durable(lsn)
+            return contact_ids
+    
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        with self._store_lock:
+            return self._store.get(contact_id)
+    
+    def iter_contacts(
+        self,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[int, AcmeContactResponse]]:
+        """
+        Lazily yield (sequence number, contact) pairs in insertion order, see AcmeService.iter_contacts.
+        
+        Contacts created after the iteration starts are not included. The
+        contacts are read in chunks under the store lock, each chunk a
+        point-in-time snapshot; the first chunk covers a default page, so a
+        page is consistent as a whole and writers never break a long scan.
+        """
+        if email is not None or company is not None or status is not None:
+            seqs = self._find_seqs(email=email, company=company, status=status)
+            if after is not None:
+                seqs = seqs[bisect.bisect_right(seqs, after):]
+        else:
+            seqs = range(0 if after is None else after + 1, self._store.end_seq)
+        
+        position = 0
+        chunk = _FIRST_CHUNK
+        while position < len(seqs):
+            for seq, contact in self._read_chunk(seqs[position:position + chunk]):
+                # Skip contacts deleted, or moved out of the status filter, since the scan started
+                if contact is not None and (status is None or contact.acme_status == status):
+                    yield seq, contact
+            position += chunk
+            chunk = min(chunk * 2, _MAX_CHUNK)
+    
+    def _find_seqs(
+        self,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[int]:
+        """Intersect the secondary indexes for the given filters, returning sorted sequence numbers."""
+        if email is None and company is None and status is None:
+            return []
+        
+        email_key = normalize_key(email)
+        company_key = normalize_key(company)
+        matches: List[int] = []
+        with self._all_stripes():
+            # Every contact lives in exactly one shard, so the matches are the union of per-shard intersections
+            for shard in self._shards:
+                candidates = []
+                if email is not None:
+                    candidates.append(shard.email_index.get(email_key, set()))
+                if company is not None:
+                    candidates.append(shard.company_index.get(company_key, set()))
+                if status is not None:
+                    candidates.append(shard.status_index.get(status, set()))
+                
+                # Intersect starting from the smallest set so the cost is bounded by the rarest key
+                candidates.sort(key=len)
+                matches.extend(set(candidates[0]).intersection(*candidates[1:]))
+        matches.sort()
+        return matches
+    
+    def set_status(self, contact_id: str, status: str) -> bool:
+        shard = self._shards[self._stripe(contact_id)]
+        with shard.lock:
+            with self._store_lock:
+                if contact_id not in self._store:
+                    return False
+                seq = self._store.seq_of(contact_id)
+                old_status = self._store.status_of(contact_id)
+                self._store.set_status(contact_id, status)
+                self._version += 1
+                lsn = self._log({"op": "status", "id": contact_id, "status": status})
+            
+            self._index_discard(shard.status_index, old_status, seq)
+            self._index_add(shard.status_index, status, seq)
+            self._decrement(shard.status_counts, old_status)
+            shard.status_counts[status] += 1
+        self._wait_durable(lsn)
+        return True
+    
+    def delete(self, contact_id: str) -> bool:
+        shard = self._shards[self._stripe(contact_id)]
+        with shard.lock:
+            with self._store_lock:
+                if contact_id not in self._store:
+                    return False
+                seq = self._store.seq_of(contact_id)
+                removed = self._store.remove(contact_id)
+                self._version += 1
+                lsn = self._log({"op": "delete", "id": contact_id})
+            
+            contact = removed.acme_contact
+            self._index_discard(shard.email_index, normalize_key(contact.acme_email), seq)
+            self._index_discard(shard.company_index, normalize_key(contact.acme_company_name), seq)
+            self._index_discard(shard.status_index, removed.acme_status, seq)
+            self._decrement(shard.status_counts, removed.acme_status)
+            self._count_company(shard, contact.acme_company_name, -1)
+            # Like the other backends, stats only count the contacts still stored
+            minute = removed.acme_created_at[:16] + "Z"
+            if minute in shard.created_per_minute:
+                shard.created_per_minute[minute] -= 1
+                if not shard.created_per_minute[minute]:
+                    del shard.created_per_minute[minute]
+        self._wait_durable(lsn)
+        return True
+    
+    def stats(self, top_companies: int = 5) -> Dict[str, Any]:
+        # All figures come from the running counters, so this does not scan the store;
+        # holding every stripe makes them a consistent snapshot
+        status_counts: Counter = Counter()
+        company_counts: Counter = Counter()
+        minutes: Counter = Counter()
+        with self._all_stripes():
+            for shard in self._shards:
+                status_counts.update(shard.status_counts)
+                company_counts.update(shard.company_counts)
+                minutes.update(shard.created_per_minute)
+            
+            def spellings(key: str) -> Counter:
+                merged: Counter = Counter()
+                for shard in self._shards:
+                    merged.update(shard.company_spellings.get(key, {}))
+                return merged
+            
+            companies = company_leaderboard(company_counts, spellings, top_companies)
+        
+        total = sum(status_counts.values())
+        active = status_counts.get("active", 0)
+        return {
+            "total_contacts": total,
+            "active_contacts": active,
+            "inactive_contacts": total - active,
+            "contacts_by_status": dict(status_counts),
+            "top_companies": companies,
+            "created_per_minute": {
+                minute: minutes[minute] for minute in sorted(minutes)[-self.STATS_HISTORY_MINUTES:]
+            }
+        }
+    
+    def clear(self) -> None:
+        with self._all_stripes():
+            with self._store_lock:
+                self._store.clear()
+                self._version += 1
+                lsn = self._log({"op": "clear"})
+            for shard in self._shards:
+                shard.clear()
+        self._wait_durable(lsn)
+    
+    def close(self) -> None:
+        self.disable_persistence()
+    
+    def enable_persistence(self, directory: str, **journal_options: Any) -> None:
+        """
+        Restore contacts from disk and journal every later change.
+        
+        Loads the latest snapshot, replays the log written after it, then
+        attaches a ContactJournal so that creates, status updates and deletes
+        are appended to the write-ahead log.
+        
+        Args:
+            directory: Directory holding the journal and snapshots
+            **journal_options: Extra ContactJournal settings (flush_interval, snapshot_every, sync_commit)
+        """
+        self.disable_persistence()
+        journal = ContactJournal(directory, **journal_options)
+        snapshot, records = journal.recover()
+        self.clear()
+        
+        # Restoring allocates millions of long-lived objects; skip the GC passes that would repeatedly scan them
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            if snapshot is not None:
+                self._restore_snapshot(*snapshot)
+            for record in records:
+                self._replay(record)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        
+        self._journal = journal
+        journal.attach_snapshot_source(self._snapshot_rows)
+    
+    def disable_persistence(self) -> None:
+        """Flush and close the journal, if one is attached."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def _restore_snapshot(self, end_seq: int, chunks: Iterator[List[SnapshotRow]]) -> None:
+        """Load snapshot rows into the empty store, rebuilding indexes and counters in bulk."""
+        minutes: List[Counter] = [Counter() for _ in self._shards]
+        with self._all_stripes():
+            with self._store_lock:
+                for rows in chunks:
+                    self._store.restore_rows(rows)
+                    for seq, contact_id, _, _, email, _, company, _, created_at, status in rows:
+                        stripe = self._stripe(contact_id)
+                        shard = self._shards[stripe]
+                        self._index_add(shard.email_index, normalize_key(email), seq)
+                        self._index_add(shard.company_index, normalize_key(company), seq)
+                        self._index_add(shard.status_index, status, seq)
+                        self._count_company(shard, company, 1)
+                        minutes[stripe][created_at[:16] + "Z"] += 1
+                self._store.pad_to(end_seq)
+                self._version += 1
+            
+            for shard, shard_minutes in zip(self._shards, minutes):
+                shard.status_counts.update({status: len(seqs) for status, seqs in shard.status_index.items()})
+                for minute in sorted(shard_minutes)[-self.STATS_HISTORY_MINUTES:]:
+                    shard.created_per_minute[minute] = shard_minutes[minute]
+    
+    def _replay(self, record: Dict[str, Any]) -> None:
+        """Re-apply a journal record; records already reflected in the snapshot are skipped."""
+        op = record["op"]
+        if op == "create":
+            if record["seq"] < self._store.end_seq:
+                return
+            contact_ids = record["ids"]
+            contacts = [contact_from_tuple(values) for values in record["contacts"]]
+            with self._locked(self._stripe(contact_id) for contact_id in contact_ids):
+                with self._store_lock:
+                    self._store.pad_to(record["seq"])
+                    first_seq = self._apply_create(contact_ids, contacts, record["at"], "active")
+                self._index_created(first_seq, contact_ids, contacts, record["at"], "active")
+        elif op == "status":
+            self.set_status(record["id"], record["status"])
+        elif op == "delete":
+            self.delete(record["id"])
+        elif op == "clear":
+            self.clear()
+    
+    def _read_chunk(self, seqs: Sequence[int]) -> List[Tuple[int, Optional[AcmeContactResponse]]]:
+        """Read the contacts at the given sequence numbers in one store lock acquisition (None where gone)."""
+        with self._store_lock:
+            end_seq = self._store.end_seq
+            return [(seq, self._store.get_at(seq) if seq < end_seq else None) for seq in seqs]
+    
+    def _snapshot_rows(self) -> Tuple[int, Iterator[SnapshotRow]]:
+        """Describe the current store contents for ContactJournal snapshots."""
+        end_seq = self._store.end_seq
+        
+        def rows() -> Iterator[SnapshotRow]:
+            # Runs on the snapshot thread, so read in chunks under the store lock
+            for start in range(0, end_seq, _MAX_CHUNK):
+                for seq, contact in self._read_chunk(range(start, min(start + _MAX_CHUNK, end_seq))):
+                    if contact is not None:
+                        yield [seq, contact.acme_contact_id, *contact_to_tuple(contact.acme_contact),
+                               contact.acme_created_at, contact.acme_status]
+        
+        return end_seq, rows()
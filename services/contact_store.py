@@ -0,0 +1,484 @@
+"""Record layouts backing the mock AcmeCRM contact storage."""
+
+import re
+from array import array
+from itertools import accumulate, islice
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from models.acme_models import AcmeContact, AcmeContactResponse
+
+_EPOCH = datetime(1970, 1, 1)
+
+_HEX_SUFFIX = re.compile(r"[0-9a-f]{8}")
+
+# AcmeContact fields in the order used by compact tuple encodings
+CONTACT_FIELDS = (
+    "acme_first_name",
+    "acme_last_name",
+    "acme_email",
+    "acme_phone_number",
+    "acme_company_name",
+    "acme_notes",
+)
+
+
+def contact_to_tuple(contact: AcmeContact) -> Tuple[Optional[str], ...]:
+    """
+    Encode a contact as a plain tuple of field values in CONTACT_FIELDS order.
+    
+    Args:
+        contact: Contact data in AcmeCRM format
+        
+    Returns:
+        Tuple of field values
+    """
+    return tuple(getattr(contact, field) for field in CONTACT_FIELDS)
+
+
+def contact_from_tuple(values: Sequence[Optional[str]]) -> AcmeContact:
+    """
+    Rebuild a contact from values produced by ``contact_to_tuple``.
+    
+    The values were validated when the contact was first created, so the
+    model is constructed without re-running validation.
+    
+    Args:
+        values: Field values in CONTACT_FIELDS order
+        
+    Returns:
+        Contact data in AcmeCRM format
+    """
+    return AcmeContact.model_construct(**dict(zip(CONTACT_FIELDS, values)))
+
+
+def iso_to_epoch_us(timestamp: str) -> int:
+    """
+    Convert an ISO-8601 UTC timestamp to integer epoch microseconds.
+    
+    Args:
+        timestamp: Timestamp such as "2025-07-25T10:30:00.123456Z"
+        
+    Returns:
+        Microseconds since the Unix epoch
+    """
+    delta = datetime.fromisoformat(timestamp.rstrip("Z")) - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def epoch_us_to_iso(epoch_us: int) -> str:
+    """
+    Convert integer epoch microseconds back to an ISO-8601 UTC timestamp.
+    
+    Args:
+        epoch_us: Microseconds since the Unix epoch
+        
+    Returns:
+        Timestamp in the same format AcmeService generates
+    """
+    return (_EPOCH + timedelta(microseconds=epoch_us)).isoformat() + "Z"
+
+
+class DictContactStore:
+    """Contact records kept as one dict per contact, keyed by contact ID."""
+    
+    __slots__ = ("_records", "_sequence")
+    
+    def __init__(self) -> None:
+        self._records: Dict[str, Dict] = {}
+        # Contact IDs in insertion order; deleted contacts leave a None tombstone so
+        # that sequence numbers (and therefore pagination cursors) stay stable
+        self._sequence: List[Optional[str]] = []
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __contains__(self, contact_id: str) -> bool:
+        return contact_id in self._records
+    
+    @property
+    def end_seq(self) -> int:
+        """Sequence number the next inserted contact will receive."""
+        return len(self._sequence)
+    
+    def insert_many(
+        self, contact_ids: List[str], contacts: List[AcmeContact], created_at: str, status: str
+    ) -> int:
+        """
+        Store a batch of contacts sharing a creation time and status.
+        
+        Args:
+            contact_ids: Public IDs for the new contacts
+            contacts: Contact data in AcmeCRM format
+            created_at: ISO-8601 creation timestamp
+            status: Initial status
+            
+        Returns:
+            Sequence number of the first inserted contact
+        """
+        first_seq = len(self._sequence)
+        self._records.update(
+            (contact_id, {
+                "acme_contact": contact,
+                "acme_created_at": created_at,
+                "acme_status": status,
+                "seq": first_seq + offset
+            })
+            for offset, (contact_id, contact) in enumerate(zip(contact_ids, contacts))
+        )
+        self._sequence.extend(contact_ids)
+        return first_seq
+    
+    def pad_to(self, seq: int) -> None:
+        """Skip sequence numbers so the next inserted contact receives ``seq`` (used when restoring)."""
+        if seq > len(self._sequence):
+            self._sequence.extend([None] * (seq - len(self._sequence)))
+    
+    def restore_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Re-insert persisted contacts at their original sequence numbers.
+        
+        Args:
+            rows: Rows of [seq, contact_id, *CONTACT_FIELDS values, created_at, status]
+                in ascending sequence order
+        """
+        for seq, contact_id, *values, created_at, status in rows:
+            self.pad_to(seq)
+            self._records[contact_id] = {
+                "acme_contact": contact_from_tuple(values),
+                "acme_created_at": created_at,
+                "acme_status": status,
+                "seq": seq
+            }
+            self._sequence.append(contact_id)
+    
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        """Build the response model for a contact, or None if it does not exist."""
+        record = self._records.get(contact_id)
+        return self._to_response(contact_id, record) if record is not None else None
+    
+    def get_at(self, seq: int) -> Optional[AcmeContactResponse]:
+        """Build the response model for the contact at a sequence number, if still stored."""
+        contact_id = self._sequence[seq]
+        return self.get(contact_id) if contact_id is not None else None
+    
+    def seq_of(self, contact_id: str) -> int:
+        """Return the sequence number of a stored contact."""
+        return self._records[contact_id]["seq"]
+    
+    def status_of(self, contact_id: str) -> str:
+        """Return the current status of a stored contact."""
+        return self._records[contact_id]["acme_status"]
+    
+    def set_status(self, contact_id: str, status: str) -> None:
+        """Update the status of a stored contact."""
+        self._records[contact_id]["acme_status"] = status
+    
+    def remove(self, contact_id: str) -> AcmeContactResponse:
+        """Remove a stored contact and return its last state."""
+        record = self._records.pop(contact_id)
+        self._sequence[record["seq"]] = None
+        return self._to_response(contact_id, record)
+    
+    def items(self) -> Iterator[Tuple[str, AcmeContactResponse]]:
+        """Iterate over (contact ID, contact) pairs in insertion order."""
+        for contact_id, record in self._records.items():
+            yield contact_id, self._to_response(contact_id, record)
+    
+    def clear(self) -> None:
+        """Remove every stored contact."""
+        self._records.clear()
+        self._sequence.clear()
+    
+    @staticmethod
+    def _to_response(contact_id: str, record: Dict) -> AcmeContactResponse:
+        return AcmeContactResponse(
+            acme_contact_id=contact_id,
+            acme_contact=record["acme_contact"],
+            acme_created_at=record["acme_created_at"],
+            acme_status=record["acme_status"]
+        )
+
+
+class _StringColumn:
+    """Append-only column of optional strings packed into a single UTF-8 buffer."""
+    
+    __slots__ = ("_data", "_ends", "_nulls")
+    
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._ends = array("Q")
+        self._nulls = bytearray()
+    
+    def append(self, value: Optional[str]) -> None:
+        if value is not None:
+            self._data += value.encode()
+        self._ends.append(len(self._data))
+        self._nulls.append(value is None)
+    
+    def extend(self, values: Sequence[Optional[str]]) -> None:
+        encoded = [value.encode() if value is not None else b"" for value in values]
+        self._ends.extend(islice(accumulate(map(len, encoded), initial=len(self._data)), 1, None))
+        self._data += b"".join(encoded)
+        self._nulls.extend(value is None for value in values)
+    
+    def __getitem__(self, row: int) -> Optional[str]:
+        if self._nulls[row]:
+            return None
+        start = self._ends[row - 1] if row else 0
+        return self._data[start:self._ends[row]].decode()
+    
+    def clear(self) -> None:
+        self._data = bytearray()
+        self._ends = array("Q")
+        self._nulls = bytearray()
+
+
+class _InternTable:
+    """Bidirectional mapping between repeated strings and small integer codes."""
+    
+    __slots__ = ("_values", "_codes")
+    
+    def __init__(self) -> None:
+        self._values: List[str] = []
+        self._codes: Dict[str, int] = {}
+    
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+    
+    def value(self, code: int) -> Optional[str]:
+        return self._values[code] if code >= 0 else None
+    
+    def clear(self) -> None:
+        self._values.clear()
+        self._codes.clear()
+
+
+class ColumnarContactStore:
+    """
+    Contact records laid out column by column in compact arrays.
+    
+    Each contact gets an integer row (its sequence number). Free-text fields are
+    packed into UTF-8 buffers, company names and statuses are interned to small
+    integer codes, and creation times are kept as epoch microseconds. Pydantic
+    models are only built when a contact is read.
+    """
+    
+    __slots__ = (
+        "_ids", "_row_by_id", "_first_names", "_last_names", "_emails", "_phones",
+        "_notes", "_companies", "_statuses", "_company_codes", "_status_codes",
+        "_created_at_us", "_live", "_size"
+    )
+    
+    def __init__(self) -> None:
+        self._ids = _StringColumn()
+        self._row_by_id: Dict[Union[int, str], int] = {}
+        self._first_names = _StringColumn()
+        self._last_names = _StringColumn()
+        self._emails = _StringColumn()
+        self._phones = _StringColumn()
+        self._notes = _StringColumn()
+        self._companies = _InternTable()
+        self._statuses = _InternTable()
+        self._company_codes = array("l")
+        self._status_codes = array("l")
+        self._created_at_us = array("q")
+        self._live = bytearray()
+        self._size = 0
+    
+    @staticmethod
+    def _key(contact_id: str) -> Union[int, str]:
+        """Use the 32-bit value of "acme_xxxxxxxx" IDs as the lookup key to avoid keeping str keys."""
+        # int() alone would also take "0x", "_" and whitespace, mapping distinct IDs to one key
+        if contact_id.startswith("acme_") and _HEX_SUFFIX.fullmatch(contact_id, 5):
+            return int(contact_id[5:], 16)
+        return contact_id
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __contains__(self, contact_id: str) -> bool:
+        return self._key(contact_id) in self._row_by_id
+    
+    @property
+    def end_seq(self) -> int:
+        """Sequence number the next inserted contact will receive."""
+        return len(self._live)
+    
+    def insert_many(
+        self, contact_ids: List[str], contacts: List[AcmeContact], created_at: str, status: str
+    ) -> int:
+        """
+        Store a batch of contacts sharing a creation time and status.
+        
+        Args:
+            contact_ids: Public IDs for the new contacts
+            contacts: Contact data in AcmeCRM format
+            created_at: ISO-8601 creation timestamp
+            status: Initial status
+            
+        Returns:
+            Sequence number of the first inserted contact
+        """
+        first_row = len(self._live)
+        created_at_us = iso_to_epoch_us(created_at)
+        status_code = self._statuses.code(status)
+        
+        for offset, (contact_id, contact) in enumerate(zip(contact_ids, contacts)):
+            self._row_by_id[self._key(contact_id)] = first_row + offset
+            self._ids.append(contact_id)
+            self._first_names.append(contact.acme_first_name)
+            self._last_names.append(contact.acme_last_name)
+            self._emails.append(contact.acme_email)
+            self._phones.append(contact.acme_phone_number)
+            self._notes.append(contact.acme_notes)
+            self._company_codes.append(self._companies.code(contact.acme_company_name))
+            self._status_codes.append(status_code)
+            self._created_at_us.append(created_at_us)
+            self._live.append(1)
+        
+        self._size += len(contacts)
+        return first_row
+    
+    def restore_rows(self, rows: Sequence[Sequence[Any]]) -> None:
+        """
+        Re-insert persisted contacts at their original sequence numbers.
+        
+        Writes each column in one pass without building Pydantic models.
+        
+        Args:
+            rows: Rows of [seq, contact_id, *CONTACT_FIELDS values, created_at, status]
+                in ascending sequence order
+        """
+        # One slot per sequence number, with None for contacts deleted before the snapshot
+        slots: List[Optional[Sequence[Any]]] = []
+        next_seq = len(self._live)
+        for row in rows:
+            slots.extend([None] * (row[0] - next_seq))
+            slots.append(row)
+            next_seq = row[0] + 1
+        self._extend_slots(slots)
+        self._row_by_id.update((self._key(row[1]), row[0]) for row in rows)
+        self._size += len(rows)
+    
+    def pad_to(self, seq: int) -> None:
+        """Skip sequence numbers so the next inserted contact receives ``seq`` (used when restoring)."""
+        if seq > len(self._live):
+            self._extend_slots([None] * (seq - len(self._live)))
+    
+    def _extend_slots(self, slots: Sequence[Optional[Sequence[Any]]]) -> None:
+        """Append rows (or None for empty rows) to every column."""
+        def column(position: int) -> List[Any]:
+            return [slot[position] if slot is not None else None for slot in slots]
+        
+        for position, strings in enumerate(
+            (self._ids, self._first_names, self._last_names, self._emails, self._phones), start=1
+        ):
+            strings.extend(column(position))
+        self._notes.extend(column(7))
+        self._company_codes.extend(self._companies.code(company) for company in column(6))
+        self._status_codes.extend(self._statuses.code(status) for status in column(9))
+        # Contacts from the same bulk import share a timestamp, so convert each distinct value once
+        timestamps = column(8)
+        epoch_us = {created_at: iso_to_epoch_us(created_at) for created_at in set(timestamps) if created_at}
+        self._created_at_us.extend(epoch_us.get(created_at, 0) for created_at in timestamps)
+        self._live.extend(slot is not None for slot in slots)
+    
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        """Build the response model for a contact, or None if it does not exist."""
+        row = self._row_by_id.get(self._key(contact_id))
+        return self._to_response(row) if row is not None else None
+    
+    def get_at(self, seq: int) -> Optional[AcmeContactResponse]:
+        """Build the response model for the contact at a sequence number, if still stored."""
+        return self._to_response(seq) if self._live[seq] else None
+    
+    def seq_of(self, contact_id: str) -> int:
+        """Return the sequence number of a stored contact."""
+        return self._row_by_id[self._key(contact_id)]
+    
+    def status_of(self, contact_id: str) -> str:
+        """Return the current status of a stored contact."""
+        return self._statuses.value(self._status_codes[self.seq_of(contact_id)])
+    
+    def set_status(self, contact_id: str, status: str) -> None:
+        """Update the status of a stored contact."""
+        self._status_codes[self.seq_of(contact_id)] = self._statuses.code(status)
+    
+    def remove(self, contact_id: str) -> AcmeContactResponse:
+        """Remove a stored contact and return its last state."""
+        row = self._row_by_id.pop(self._key(contact_id))
+        response = self._to_response(row)
+        # Column data stays in place so that later rows keep their sequence numbers
+        self._live[row] = 0
+        self._size -= 1
+        return response
+    
+    def items(self) -> Iterator[Tuple[str, AcmeContactResponse]]:
+        """Iterate over (contact ID, contact) pairs in insertion order."""
+        for row in range(len(self._live)):
+            if self._live[row]:
+                response = self._to_response(row)
+                yield response.acme_contact_id, response
+    
+    def clear(self) -> None:
+        """Remove every stored contact."""
+        for column in (self._ids, self._first_names, self._last_names, self._emails, self._phones, self._notes):
+            column.clear()
+        self._row_by_id.clear()
+        self._companies.clear()
+        self._statuses.clear()
+        self._company_codes = array("l")
+        self._status_codes = array("l")
+        self._created_at_us = array("q")
+        self._live = bytearray()
+        self._size = 0
+    
+    def _to_response(self, row: int) -> AcmeContactResponse:
+        # Values were validated on the way in, so skip re-validation here
+        contact = AcmeContact.model_construct(
+            acme_first_name=self._first_names[row],
+            acme_last_name=self._last_names[row],
+            acme_email=self._emails[row],
+            acme_phone_number=self._phones[row],
+            acme_company_name=self._companies.value(self._company_codes[row]),
+            acme_notes=self._notes[row]
+        )
+        return AcmeContactResponse.model_construct(
+            acme_contact_id=self._ids[row],
+            acme_contact=contact,
+            acme_created_at=epoch_us_to_iso(self._created_at_us[row]),
+            acme_status=self._statuses.value(self._status_codes[row])
+        )
+
+
+ContactStore = Union[DictContactStore, ColumnarContactStore]
+
+CONTACT_STORES = {
+    "dict": DictContactStore,
+    "columnar": ColumnarContactStore,
+}
+
+
+def create_contact_store(layout: str) -> ContactStore:
+    """
+    Create an empty contact store for a named layout.
+    
+    Args:
+        layout: "dict" for one dict per contact, "columnar" for the compact layout
+        
+    Returns:
+        Empty contact store
+        
+    Raises:
+        ValueError: If the layout is unknown
+    """
+    try:
+        return CONTACT_STORES[layout]()
+    except KeyError:
+        raise ValueError(f"Unknown contact store layout: {layout}")
@@ -0,0 +1,443 @@
+"""Streaming CSV and NDJSON import and export of contacts."""
+
+import codecs
+import csv
+import heapq
+import io
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+from multipart.multipart import MultipartParser, parse_options_header
+from models.linq_models import LinqBulkItemResult, LinqImportResponse
+from services.acme_service import AcmeService
+from services.bulk_service import BulkService
+from services.field_mapper import FieldMapper
+from services.json_response import encode_json
+
+# File formats accepted by imports and produced by exports, with their media types
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Rejected records listed in an import response; any further ones are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Longest record an import accepts, so an unterminated quote or line cannot buffer the whole upload
+MAX_RECORD_BYTES = 1024 * 1024
+
+# Size of the chunks an export is sent in
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def export_columns() -> List[str]:
+    """Column layout of exports: the contact ID, the Linq fields from FieldMapper's mapping, then status and creation time."""
+    return ["contact_id", *FieldMapper.ACME_TO_LINQ_MAPPING.values(), "status", "created_at"]
+
+
+def detect_format(requested: Optional[str], content_type: str, filename: Optional[str]) -> str:
+    """
+    Work out the format of an upload.
+    
+    Args:
+        requested: Format given explicitly by the client, if any
+        content_type: Content-Type of the body or of the uploaded file part
+        filename: Name of the uploaded file, if any
+        
+    Returns:
+        "csv" or "ndjson"
+        
+    Raises:
+        ValueError: If the format cannot be told from the request
+    """
+    if requested is not None:
+        return requested
+    name = (filename or "").lower()
+    if name.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in content_type or "jsonl" in content_type:
+        return "ndjson"
+    raise ValueError("Cannot tell the upload format; send a .csv or .ndjson file or pass format=csv|ndjson")
+
+
+class _Malformed:
+    """A record that could not be decoded, kept in place so record numbers stay aligned."""
+    
+    __slots__ = ("error",)
+    
+    def __init__(self, error: str) -> None:
+        self.error = error
+
+
+class _RecordDecoder(ABC):
+    """Split an upload into text lines as bytes arrive, holding back only the incomplete last line."""
+    
+    def __init__(self) -> None:
+        # utf-8-sig drops the byte order mark spreadsheet programs put in front of CSV files
+        self._text = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        self._partial = ""
+    
+    def _lines(self, data: bytes, final: bool) -> List[str]:
+        """Decode the next piece of the upload into complete lines."""
+        lines = (self._partial + self._text.decode(data, final)).split("\n")
+        self._partial = "" if final else lines.pop()
+        if len(self._partial) > MAX_RECORD_BYTES:
+            raise ValueError(f"Record longer than {MAX_RECORD_BYTES} bytes; is the file truncated or binary?")
+        return lines
+    
+    @abstractmethod
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        """
+        Decode the next piece of the upload.
+        
+        Args:
+            data: Next bytes of the file
+            final: Whether this is the end of the file
+            
+        Returns:
+            Raw contact items of the records completed by this piece, with
+            ``_Malformed`` in place of records that could not be decoded
+        """
+
+
+class _NDJSONDecoder(_RecordDecoder):
+    """One JSON object per line; blank lines are skipped."""
+    
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        items: List[Any] = []
+        for line in self._lines(data, final):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                items.append(_Malformed(f"item: Malformed JSON: {e}"))
+        return items
+
+
+class _CSVDecoder(_RecordDecoder):
+    """
+    CSV with a header row naming the Linq fields, as written by the export.
+    
+    Quoted values may span lines: a record ends at the first line break
+    after an even number of quote characters. Empty values are left out,
+    so optional fields are None rather than "".
+    """
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._columns: Optional[List[str]] = None
+        self._record: List[str] = []
+        self._quotes = 0
+    
+    def feed(self, data: bytes, final: bool = False) -> List[Any]:
+        items: List[Any] = []
+        for line in self._lines(data, final):
+            self._record.append(line)
+            self._quotes += line.count('"')
+            if self._quotes % 2 and not final:
+                continue
+            record = "\n".join(self._record)
+            self._record, self._quotes = [], 0
+            if record.strip():
+                items.append(self._decode(record))
+        if sum(map(len, self._record)) > MAX_RECORD_BYTES:
+            raise ValueError(f"Record longer than {MAX_RECORD_BYTES} bytes; is a closing quote missing?")
+        # The header is not a contact
+        return [item for item in items if item is not None]
+    
+    def _decode(self, record: str) -> Any:
+        """Turn one record into a raw contact item, or remember it as the header."""
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            return _Malformed(f"item: Malformed CSV: {e}")
+        if self._columns is None:
+            self._columns = [column.strip() for column in values]
+            return None
+        if len(values) > len(self._columns):
+            return _Malformed(f"item: {len(values)} values for {len(self._columns)} columns")
+        return {column: value for column, value in zip(self._columns, values) if value != ""}
+
+
+class ContactImporter:
+    """
+    Ingest an upload incrementally, one batch of records at a time.
+    
+    Every record is stored as a new active contact with a new ID; the
+    contact_id, status and created_at columns of an export are ignored, so
+    importing an export into the store it came from duplicates its contacts.
+    
+    ``feed`` only returns once every batch completed by the new bytes is
+    stored, so a caller reading the request body between calls applies
+    backpressure to the client and memory stays bounded by the batch size,
+    not the file size. Batches go through ``BulkService.ingest_offloaded``
+    and so use the worker pool when it is running.
+    """
+    
+    def __init__(self, format: str, batch_size: int = BulkService.DEFAULT_BATCH_SIZE) -> None:
+        """
+        Start an import.
+        
+        Args:
+            format: "csv" or "ndjson"
+            batch_size: Number of records validated and inserted per batch
+        """
+        self.batch_size = batch_size
+        self._decoder = _CSVDecoder() if format == "csv" else _NDJSONDecoder()
+        self._started = time.perf_counter()
+        # Well-formed records awaiting ingestion, with their record numbers
+        self._batch: List[Tuple[int, Any]] = []
+        self.total = 0
+        self.created = 0
+        self.failed = 0
+        # Max-heap (by negated record number) of the earliest rejections: malformed records are
+        # rejected as they are decoded but invalid ones only when their batch is flushed
+        self._errors: List[Tuple[int, str]] = []
+    
+    def _reject(self, index: int, error: str) -> None:
+        """Count a rejected record, keeping the MAX_REPORTED_ERRORS earliest errors in the upload."""
+        self.failed += 1
+        if len(self._errors) < MAX_REPORTED_ERRORS:
+            heapq.heappush(self._errors, (-index, error))
+        elif -self._errors[0][0] > index:
+            heapq.heapreplace(self._errors, (-index, error))
+    
+    async def feed(self, data: bytes, final: bool = False) -> None:
+        """
+        Decode the next piece of the upload and store every batch it completes.
+        
+        Args:
+            data: Next bytes of the file
+            final: Whether this is the end of the file
+            
+        Raises:
+            ValueError: If a record exceeds MAX_RECORD_BYTES
+        """
+        for item in self._decoder.feed(data, final):
+            index = self.total
+            self.total += 1
+            if isinstance(item, _Malformed):
+                self._reject(index, item.error)
+                continue
+            self._batch.append((index, item))
+            if len(self._batch) >= self.batch_size:
+                await self._flush()
+    
+    async def _flush(self) -> None:
+        """Validate, map and store the pending batch."""
+        batch, self._batch = self._batch, []
+        if not batch:
+            return
+        result = await BulkService.ingest_offloaded([item for _, item in batch], len(batch))
+        self.created += result.created
+        for item_result in result.results:
+            if not item_result.success:
+                self._reject(batch[item_result.index][0], item_result.error)
+    
+    async def finish(self) -> LinqImportResponse:
+        """
+        Store the records left at the end of the upload and summarize the import.
+        
+        Returns:
+            LinqImportResponse with counts and the first rejected records
+        """
+        await self.feed(b"", final=True)
+        await self._flush()
+        elapsed = time.perf_counter() - self._started
+        return LinqImportResponse(
+            success=self.failed == 0,
+            total=self.total,
+            created=self.created,
+            failed=self.failed,
+            batch_size=self.batch_size,
+            elapsed_ms=round(elapsed * 1000, 3),
+            contacts_per_second=round(self.total / elapsed, 1) if elapsed > 0 else 0.0,
+            errors=[
+                LinqBulkItemResult(index=-index, success=False, error=error)
+                for index, error in sorted(self._errors, reverse=True)
+            ],
+            errors_truncated=self.failed > len(self._errors)
+        )
+
+
+class MultipartUpload:
+    """
+    Stream the first file of a multipart/form-data body as it arrives.
+    
+    python-multipart parses the body incrementally; form fields and any
+    further files are skipped. ``filename`` and ``content_type`` describe
+    the file once its headers have been read, i.e. before its first bytes
+    are yielded.
+    """
+    
+    def __init__(self, chunks: AsyncIterator[bytes], content_type: str) -> None:
+        """
+        Args:
+            chunks: Request body chunks
+            content_type: Content-Type header of the request, carrying the boundary
+            
+        Raises:
+            ValueError: If the Content-Type has no multipart boundary
+        """
+        _, options = parse_options_header(content_type)
+        boundary = options.get(b"boundary")
+        if not boundary:
+            raise ValueError("multipart/form-data body without a boundary")
+        self.filename: Optional[str] = None
+        self.content_type = ""
+        self._chunks = chunks
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+        # None until a part's headers are read, then whether that part is the file
+        self._in_file: Optional[bool] = None
+        self._file_done = False
+        self._pending: List[bytes] = []
+        self._parser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._append_to("_field"),
+            "on_header_value": self._append_to("_value"),
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+    
+    def _append_to(self, attribute: str) -> Callable[[bytes, int, int], None]:
+        """Callback accumulating a header name or value, which may arrive split across chunks."""
+        def append(data: bytes, start: int, end: int) -> None:
+            setattr(self, attribute, getattr(self, attribute) + data[start:end])
+        return append
+    
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+        self._in_file = None
+    
+    def _on_header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+    
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        filename = options.get(b"filename")
+        self._in_file = filename is not None and self.filename is None
+        if self._in_file:
+            self.filename = filename.decode("utf-8", "replace")
+            self.content_type = self._headers.get(b"content-type", b"").decode("latin-1")
+    
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self._pending.append(data[start:end])
+    
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._file_done = True
+        self._in_file = None
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._chunks:
+            self._parser.write(chunk)
+            if self._pending:
+                data, self._pending = b"".join(self._pending), []
+                yield data
+            if self._file_done:
+                return
+        self._parser.finalize()
+        if self._pending:
+            yield b"".join(self._pending)
+        if self.filename is None:
+            raise ValueError("multipart/form-data body without a file")
+
+
+async def import_contacts(
+    chunks: AsyncIterator[bytes],
+    content_type: str,
+    format: Optional[str] = None,
+    batch_size: int = BulkService.DEFAULT_BATCH_SIZE
+) -> LinqImportResponse:
+    """
+    Import a CSV or NDJSON upload, either as the raw request body or as a multipart/form-data file.
+    
+    Args:
+        chunks: Request body chunks
+        content_type: Content-Type header of the request
+        format: "csv" or "ndjson", or None to tell from the file name or Content-Type
+        batch_size: Number of records validated and inserted per batch
+        
+    Returns:
+        LinqImportResponse with counts and the first rejected records
+        
+    Raises:
+        ValueError: If the upload is not a readable CSV / NDJSON file; batches
+            stored before the problem was found stay stored
+    """
+    if content_type.startswith("multipart/form-data"):
+        upload = MultipartUpload(chunks, content_type)
+        importer: Optional[ContactImporter] = None
+        async for data in upload:
+            if importer is None:
+                importer = ContactImporter(detect_format(format, upload.content_type, upload.filename), batch_size)
+            await importer.feed(data)
+        if importer is None:
+            importer = ContactImporter(detect_format(format, upload.content_type, upload.filename), batch_size)
+    else:
+        importer = ContactImporter(detect_format(format, content_type, None), batch_size)
+        async for data in chunks:
+            await importer.feed(data)
+    return await importer.finish()
+
+
+def export_contacts(format: str, filters: Dict[str, Optional[str]]) -> Iterator[bytes]:
+    """
+    Yield every matching contact as CSV or NDJSON, in chunks of about EXPORT_CHUNK_BYTES.
+    
+    Contacts are read lazily from AcmeService and mapped field by field with
+    FieldMapper's mapping, bypassing the Linq projection cache so an export
+    does not evict the contacts other requests are reading.
+    
+    Args:
+        format: "csv" or "ndjson"
+        filters: Email, company and status filters passed to AcmeService
+        
+    Yields:
+        Encoded chunks of the file; CSV starts with the header row
+    """
+    fields = list(FieldMapper.ACME_TO_LINQ_MAPPING.items())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    lines: List[bytes] = []
+    size = 0
+    if format == "csv":
+        writer.writerow(export_columns())
+    
+    for _, contact in AcmeService.iter_contacts(**filters):
+        acme_contact = contact.acme_contact
+        if format == "csv":
+            writer.writerow([
+                contact.acme_contact_id,
+                *(getattr(acme_contact, acme_field) for acme_field, _ in fields),
+                contact.acme_status,
+                contact.acme_created_at
+            ])
+            if buffer.tell() < EXPORT_CHUNK_BYTES:
+                continue
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        else:
+            record = {"contact_id": contact.acme_contact_id}
+            for acme_field, linq_field in fields:
+                record[linq_field] = getattr(acme_contact, acme_field)
+            record["status"] = contact.acme_status
+            record["created_at"] = contact.acme_created_at
+            line = encode_json(record) + b"\n"
+            lines.append(line)
+            size += len(line)
+            if size < EXPORT_CHUNK_BYTES:
+                continue
+            yield b"".join(lines)
+            lines, size = [], 0
+    
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+    if lines:
+        yield b"".join(lines)
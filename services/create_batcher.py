@@ -0,0 +1,101 @@
+"""Coalescing of concurrent contact creates into batched AcmeCRM calls."""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+from models.acme_models import AcmeContact, AcmeContactResponse
+
+# Creates a batch of contacts, returning one response per contact in input order
+BatchCreate = Callable[[List[AcmeContact]], Awaitable[List[AcmeContactResponse]]]
+
+
+class CreateBatcher:
+    """
+    Write-behind micro-batcher for contact creates.
+    
+    Callers ``await submit(contact)`` and the contacts submitted within a short
+    window are sent upstream as one batch; each caller gets its own response.
+    A batch is flushed when it reaches ``max_batch_size`` or ``max_latency``
+    seconds after its first contact arrived, whichever comes first, so a lone
+    create waits at most ``max_latency``. A window of 0 still coalesces
+    everything submitted in the same event loop iteration.
+    """
+    
+    def __init__(self, create_many: BatchCreate, max_batch_size: int = 100, max_latency: float = 0.002) -> None:
+        """
+        Create a batcher; it must be used from a single event loop.
+        
+        Args:
+            create_many: Coroutine function creating a batch of contacts upstream
+            max_batch_size: Largest number of contacts per upstream call
+            max_latency: Longest time in seconds a contact waits for its batch to fill
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_latency < 0:
+            raise ValueError("max_latency must not be negative")
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._create_many = create_many
+        self._pending: List[Tuple[AcmeContact, "asyncio.Future[AcmeContactResponse]"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.contacts = 0
+    
+    async def submit(self, contact: AcmeContact) -> AcmeContactResponse:
+        """
+        Queue a contact for the next batch and wait for its result.
+        
+        Args:
+            contact: Contact data in AcmeCRM format
+            
+        Returns:
+            AcmeContactResponse for this contact
+            
+        Raises:
+            Exception: Whatever the batch call raised, for every contact in the failed batch
+        """
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[AcmeContactResponse]" = loop.create_future()
+        self._pending.append((contact, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._flush)
+        return await future
+    
+    def _flush(self) -> None:
+        """Send the pending contacts upstream as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+    
+    async def _send(self, batch: List[Tuple[AcmeContact, "asyncio.Future[AcmeContactResponse]"]]) -> None:
+        """Create a batch and resolve each caller's future with its own response (or the batch's error)."""
+        self.batches += 1
+        self.contacts += len(batch)
+        try:
+            results = await self._create_many([contact for contact, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch create returned {len(results)} results for {len(batch)} contacts")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), result in zip(batch, results):
+            # A caller that went away (e.g. client disconnect) has a cancelled future
+            if not future.done():
+                future.set_result(result)
+    
+    async def aclose(self) -> None:
+        """Flush pending contacts and wait for every batch in flight."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
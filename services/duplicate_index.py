@@ -0,0 +1,304 @@
+"""Duplicate detection for new contacts: known email addresses and similar names at the same company."""
+
+import difflib
+import hashlib
+import math
+import re
+import threading
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.contact_repository import ContactRepository, normalize_key
+
+# Keys the Bloom filter of an empty index is sized for; sync() sizes it from the repository instead
+BLOOM_INITIAL_CAPACITY = 1 << 20
+
+# Share of the filter's capacity at which a twice as large one starts being built in the background
+BLOOM_GROW_AT = 0.75
+
+# False positive rate of the Bloom filter at capacity
+BLOOM_ERROR_RATE = 0.01
+
+# Legal-form words dropped from the end of company names, so "Acme, Inc." and "ACME" share a block
+COMPANY_SUFFIXES = frozenset({
+    "ag", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated", "llc", "ltd", "limited", "plc", "sa"
+})
+
+# Lowest difflib similarity at which two different first names still count as the same person
+FIRST_NAME_SIMILARITY = 0.75
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def name_tokens(value: Optional[str]) -> List[str]:
+    """
+    Split a name into lowercase ASCII words, dropping accents and punctuation.
+    
+    Args:
+        value: Raw first, last or company name
+        
+    Returns:
+        Words of the name, empty for missing values
+    """
+    if not value:
+        return []
+    folded = unicodedata.normalize("NFKD", value.casefold())
+    folded = "".join(char for char in folded if not unicodedata.combining(char))
+    return [token for token in _NON_ALNUM.split(folded) if token]
+
+
+def block_key(contact: AcmeContact) -> Optional[str]:
+    """
+    Blocking key of a contact: its normalized last name and company.
+    
+    Only contacts in the same block are compared by first name, so a check
+    looks at a handful of candidates however many contacts are stored.
+    
+    Args:
+        contact: Contact in AcmeCRM format
+        
+    Returns:
+        Key, or None for contacts without a company (they are never reported as fuzzy duplicates)
+    """
+    last_name = "".join(name_tokens(contact.acme_last_name))
+    company = name_tokens(contact.acme_company_name)
+    while len(company) > 1 and company[-1] in COMPANY_SUFFIXES:
+        company.pop()
+    if not last_name or not company:
+        return None
+    return f"{last_name}|{' '.join(company)}"
+
+
+def bloom_keys(contact: AcmeContact) -> List[str]:
+    """Keys a contact adds to the duplicate index's Bloom filter: its email and its block."""
+    keys = []
+    email = normalize_key(contact.acme_email)
+    if email:
+        keys.append("e:" + email)
+    block = block_key(contact)
+    if block is not None:
+        keys.append("b:" + block)
+    return keys
+
+
+def similar_first_names(first: str, second: str) -> bool:
+    """
+    Whether two normalized first names may belong to the same person.
+    
+    Matches equal names, an initial against a full name ("j" and "john"),
+    short forms ("jon" and "jonathan") and small typos.
+    """
+    if first == second:
+        return True
+    shorter, longer = sorted((first, second), key=len)
+    if not shorter:
+        return False
+    if len(shorter) == 1 or len(shorter) >= 3:
+        if longer.startswith(shorter):
+            return True
+    return difflib.SequenceMatcher(None, first, second).ratio() >= FIRST_NAME_SIMILARITY
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+    
+    Never misses a key that was added; answers yes for a key that was not
+    in about BLOOM_ERROR_RATE of cases once ``capacity`` keys are added.
+    Keys cannot be removed.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE) -> None:
+        self.capacity = capacity
+        self.count = 0
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, key: str) -> List[int]:
+        # Double hashing: two 64-bit halves of one digest give every probe position
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+    
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, key: str) -> bool:
+        """Whether the key may have been added; False is certain."""
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+    
+    @property
+    def size_bytes(self) -> int:
+        """Memory taken by the bit array."""
+        return len(self._bits)
+
+
+class DuplicateIndex:
+    """
+    Email and name/company index of the stored contacts for duplicate checks.
+    
+    The index follows the repository by sequence number: before every check
+    it adds the contacts inserted since the last one, whichever request,
+    bulk import or worker process stored them, so writers need no hooks.
+    A Bloom filter over emails and blocking keys answers the common case, a
+    contact unlike any stored one, without touching the repository or the
+    block lists. Deleted contacts are not removed; they stay in the filter
+    as false positives and are dropped from a block when they come up as a
+    candidate.
+    
+    When the filter nears capacity, a twice as large one is built from the
+    repository in a background thread and swapped in, so no request waits
+    for a rescan; until then the old filter keeps taking keys at a slowly
+    rising false positive rate.
+    """
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Incremented by every reset, so a filter built in the background for older contents is dropped
+        self._epoch = 0
+        # Repository generation the indexed contacts belong to
+        self._generation = 0
+        self._reset(BLOOM_INITIAL_CAPACITY)
+    
+    def _reset(self, capacity: int) -> None:
+        self._bloom = BloomFilter(capacity)
+        # Blocking key -> (contact ID, normalized first name) of the contacts in that block
+        self._blocks: Dict[str, List[Tuple[str, str]]] = {}
+        self._last_seq = -1
+        self._epoch += 1
+        self._grower: Optional[threading.Thread] = None
+    
+    def reset(self) -> None:
+        """Forget every indexed contact, e.g. after the repository was switched or cleared."""
+        with self._lock:
+            self._reset(BLOOM_INITIAL_CAPACITY)
+    
+    def _add(self, contact: AcmeContactResponse) -> None:
+        for key in bloom_keys(contact.acme_contact):
+            self._bloom.add(key)
+        block = block_key(contact.acme_contact)
+        if block is not None:
+            first_name = "".join(name_tokens(contact.acme_contact.acme_first_name))
+            self._blocks.setdefault(block, []).append((contact.acme_contact_id, first_name))
+    
+    def _catch_up(self, repository: ContactRepository) -> None:
+        """Index the contacts inserted since the last check (caller holds the lock)."""
+        if repository.generation != self._generation:
+            # Cleared, possibly by another worker process: everything indexed is gone
+            self._reset(BLOOM_INITIAL_CAPACITY)
+            self._generation = repository.generation
+        for seq, contact in repository.iter_contacts(after=self._last_seq):
+            self._add(contact)
+            self._last_seq = seq
+        if self._grower is None and self._bloom.count >= self._bloom.capacity * BLOOM_GROW_AT:
+            self._grower = threading.Thread(
+                target=self._grow,
+                args=(repository, self._epoch, self._bloom.capacity * 2, self._last_seq),
+                name="duplicate-index-grow",
+                daemon=True
+            )
+            self._grower.start()
+    
+    def _grow(self, repository: ContactRepository, epoch: int, capacity: int, last_seq: int) -> None:
+        """
+        Build a larger filter without holding the lock, then swap it in.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            epoch: Epoch of the index when the build started
+            capacity: Keys the new filter is sized for
+            last_seq: Last sequence number indexed when the build started
+        """
+        bloom = BloomFilter(capacity)
+        try:
+            for seq, contact in repository.iter_contacts():
+                if seq > last_seq:
+                    break
+                for key in bloom_keys(contact.acme_contact):
+                    bloom.add(key)
+        except Exception:
+            with self._lock:
+                if epoch == self._epoch:
+                    # The next check starts another build
+                    self._grower = None
+            raise
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            # Only the contacts indexed while the filter was being built are added under the lock
+            for seq, contact in repository.iter_contacts(after=last_seq):
+                if seq > self._last_seq:
+                    break
+                for key in bloom_keys(contact.acme_contact):
+                    bloom.add(key)
+            self._bloom = bloom
+            self._grower = None
+    
+    def sync(self, repository: ContactRepository) -> Dict[str, int]:
+        """
+        Index every contact not indexed yet, e.g. at startup before the first check.
+        
+        An empty index first sizes its filter for the stored contacts, with
+        room for as many again, so a restart over a large repository does not
+        start growing the filter right away.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            
+        Returns:
+            Dictionary with the indexed key and block counts and the filter size
+        """
+        with self._lock:
+            if self._bloom.count == 0:
+                # Up to two keys per contact, for twice the contacts stored now
+                capacity = BLOOM_INITIAL_CAPACITY
+                while capacity * BLOOM_GROW_AT < 4 * len(repository):
+                    capacity *= 2
+                if capacity != self._bloom.capacity:
+                    self._reset(capacity)
+            self._catch_up(repository)
+            return {"keys": self._bloom.count, "blocks": len(self._blocks), "bloom_bytes": self._bloom.size_bytes}
+    
+    def may_have_email(self, repository: ContactRepository, email: str) -> bool:
+        """
+        Whether a contact with this normalized email may be stored; False is certain.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            email: Normalized email address
+        """
+        with self._lock:
+            self._catch_up(repository)
+            return "e:" + email in self._bloom
+    
+    def similar_contacts(self, repository: ContactRepository, contact: AcmeContact) -> List[str]:
+        """
+        Find stored contacts at the same company with the same last name and a similar first name.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            contact: Contact about to be stored
+            
+        Returns:
+            IDs of the possible duplicates, oldest first
+        """
+        block = block_key(contact)
+        if block is None:
+            return []
+        first_name = "".join(name_tokens(contact.acme_first_name))
+        with self._lock:
+            self._catch_up(repository)
+            if "b:" + block not in self._bloom or block not in self._blocks:
+                return []
+            members = self._blocks[block]
+            matches = [member for member in members if similar_first_names(first_name, member[1])]
+            # Only matches are checked against the repository; those deleted since they were indexed are dropped
+            deleted = {member for member in matches if repository.get(member[0]) is None}
+            if deleted:
+                members[:] = [member for member in members if member not in deleted]
+            return [member[0] for member in matches if member not in deleted]
@@ -1,8 +1,52 @@
 """Field mapping service for translating between Linq and AcmeCRM formats."""
 
-from typing import Dict, Any
+from operator import attrgetter
+from typing import Callable, Dict, Any, List, Type, TypeVar
+from pydantic import BaseModel
 from models.linq_models import LinqContact
 from models.acme_models import AcmeContact
+from services.metrics import timed
+
+TargetModel = TypeVar("TargetModel", bound=BaseModel)
+
+_new_instance = object.__new__
+_set_attribute = object.__setattr__
+
+
+def _compile_mapping(mapping: Dict[str, str], target: Type[TargetModel]) -> Callable[[BaseModel], TargetModel]:
+    """
+    Build a mapper that copies attributes from a validated model into a new ``target`` model.
+    
+    LinqContact and AcmeContact carry the same field constraints, so a source
+    model that passed validation needs no second pass. The mapper reads every
+    source field with one attrgetter call and fills the new instance's
+    ``__dict__`` directly, which is what ``model_construct`` does minus its
+    per-call field bookkeeping.
+    
+    Args:
+        mapping: Source field name to target field name, covering every target field
+        target: Model class to build
+        
+    Returns:
+        Function mapping a source model instance to a ``target`` instance
+    """
+    if set(mapping.values()) != set(target.model_fields):
+        raise ValueError(f"Mapping must cover exactly the fields of {target.__name__}")
+    if target.model_config.get("extra") == "allow" or target.__private_attributes__:
+        raise ValueError(f"{target.__name__} needs model_construct; extra and private attributes are not copied")
+    
+    read_source = attrgetter(*mapping)
+    target_fields = tuple(mapping.values())
+    
+    def mapper(source: BaseModel) -> TargetModel:
+        instance = _new_instance(target)
+        _set_attribute(instance, "__dict__", dict(zip(target_fields, read_source(source))))
+        _set_attribute(instance, "__pydantic_fields_set__", set(target_fields))
+        _set_attribute(instance, "__pydantic_extra__", None)
+        _set_attribute(instance, "__pydantic_private__", None)
+        return instance
+    
+    return mapper
 
 
 class FieldMapper:
@@ -29,6 +73,7 @@ class FieldMapper:
     }
     
     @classmethod
+    @timed("field_mapper.map_linq_to_acme")
     def map_linq_to_acme(cls, linq_contact: LinqContact) -> AcmeContact:
         """
         Map contact data from Linq format to AcmeCRM format.
@@ -39,16 +84,24 @@ class FieldMapper:
         Returns:
             Contact data in AcmeCRM format
         """
-        linq_dict = linq_contact.model_dump()
-        acme_dict = {}
-        
-        for linq_field, acme_field in cls.LINQ_TO_ACME_MAPPING.items():
-            if linq_field in linq_dict:
-                acme_dict[acme_field] = linq_dict[linq_field]
+        return _linq_to_acme(linq_contact)
+    
+    @classmethod
+    @timed("field_mapper.map_linq_to_acme_many")
+    def map_linq_to_acme_many(cls, linq_contacts: List[LinqContact]) -> List[AcmeContact]:
+        """
+        Map a batch of contacts from Linq format to AcmeCRM format.
         
-        return AcmeContact(**acme_dict)
+        Args:
+            linq_contacts: Contacts in Linq format
+            
+        Returns:
+            Contacts in AcmeCRM format, in the same order
+        """
+        return list(map(_linq_to_acme, linq_contacts))
     
     @classmethod
+    @timed("field_mapper.map_acme_to_linq")
     def map_acme_to_linq(cls, acme_contact: AcmeContact) -> LinqContact:
         """
         Map contact data from AcmeCRM format to Linq format.
@@ -59,14 +112,21 @@ class FieldMapper:
         Returns:
             Contact data in Linq format
         """
-        acme_dict = acme_contact.model_dump()
-        linq_dict = {}
-        
-        for acme_field, linq_field in cls.ACME_TO_LINQ_MAPPING.items():
-            if acme_field in acme_dict:
-                linq_dict[linq_field] = acme_dict[acme_field]
+        return _acme_to_linq(acme_contact)
+    
+    @classmethod
+    @timed("field_mapper.map_acme_to_linq_many")
+    def map_acme_to_linq_many(cls, acme_contacts: List[AcmeContact]) -> List[LinqContact]:
+        """
+        Map a batch of contacts from AcmeCRM format to Linq format.
         
-        return LinqContact(**linq_dict)
+        Args:
+            acme_contacts: Contacts in AcmeCRM format
+            
+        Returns:
+            Contacts in Linq format, in the same order
+        """
+        return list(map(_acme_to_linq, acme_contacts))
     
     @classmethod
     def get_mapping_schema(cls) -> Dict[str, Any]:
@@ -105,3 +165,8 @@ class FieldMapper:
                 return False
         
         return True
+
+
+# Mappers compiled once from the class-level mappings
+_linq_to_acme = _compile_mapping(FieldMapper.LINQ_TO_ACME_MAPPING, AcmeContact)
+_acme_to_linq = _compile_mapping(FieldMapper.ACME_TO_LINQ_MAPPING, LinqContact)
@@ -0,0 +1,57 @@
+"""Fast JSON encoding of API responses."""
+
+import json
+from typing import Any
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _encode_model(value: Any) -> Any:
+    """orjson fallback for values it cannot encode natively, e.g. a model nested in a dict."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(content: Any) -> bytes:
+    """
+    Encode a response body as compact UTF-8 JSON in a single pass.
+    
+    Pydantic models are serialized by pydantic-core straight from their
+    fields; other data (dicts, lists, scalars) by orjson when it is
+    installed, otherwise by the stdlib encoder with the same settings as
+    JSONResponse. Neither path goes through FastAPI's jsonable_encoder.
+    
+    Args:
+        content: Model or JSON-compatible data
+        
+    Returns:
+        Encoded body
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json(by_alias=True).encode()
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_encode_model)
+    return json.dumps(
+        content, default=_encode_model, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with ``encode_json``.
+    
+    Returned from an endpoint it bypasses FastAPI's response model
+    re-validation and jsonable_encoder, so the content must already be the
+    declared response model (or data matching it); the OpenAPI schema still
+    comes from the route's ``response_model``.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
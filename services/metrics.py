@@ -0,0 +1,415 @@
+"""Low-overhead in-process metrics with Prometheus text exposition."""
+
+import contextvars
+import functools
+import os
+import threading
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = Tuple[str, ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the exposition format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Render a Prometheus label set, e.g. {route="/contacts",status="200"}."""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Labelled histogram recorded into per-thread shards.
+    
+    Every thread writes only to its own shard, so observations need no lock
+    and none are lost; a scrape sums the shards. With the GIL an observation
+    is a dict lookup, a bisect and two list updates.
+    """
+    
+    def __init__(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Create an empty histogram.
+        
+        Args:
+            name: Metric name
+            help: Help text shown in the exposition
+            label_names: Names of the labels passed to ``observe``
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.name = name
+        self.help = help
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, List[float]]] = []
+        self._shards_lock = threading.Lock()
+    
+    def _shard(self) -> Dict[Labels, List[float]]:
+        """Return this thread's series, registering it on first use."""
+        try:
+            return self._local.series
+        except AttributeError:
+            series: Dict[Labels, List[float]] = {}
+            self._local.series = series
+            with self._shards_lock:
+                self._shards.append(series)
+            return series
+    
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """
+        Record one observation.
+        
+        Args:
+            value: Observed value in seconds
+            labels: Label values, in ``label_names`` order
+        """
+        try:
+            series = self._local.series
+        except AttributeError:
+            series = self._shard()
+        row = series.get(labels)
+        if row is None:
+            # One count per bucket plus +Inf, then the running sum
+            row = series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+    
+    def _merged(self) -> Dict[Labels, List[float]]:
+        """Sum the per-thread shards."""
+        merged: Dict[Labels, List[float]] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for series in shards:
+            for labels, row in list(series.items()):
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(row)
+                else:
+                    for i, value in enumerate(row):
+                        total[i] += value
+        return merged
+    
+    def collect(self) -> Iterator[str]:
+        """Yield the exposition lines for this histogram."""
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, row in sorted(self._merged().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                yield f"{self.name}_bucket{_format_labels(self.label_names, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {row[-1]!r}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+
+class CallbackMetric:
+    """Gauge or counter whose value is read from a callback at scrape time."""
+    
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        kind: str,
+        callback: Callable[[], Union[float, Dict[Labels, float]]],
+        label_names: Sequence[str] = ()
+    ) -> None:
+        """
+        Create a metric read on every scrape.
+        
+        Args:
+            name: Metric name
+            help: Help text shown in the exposition
+            kind: "gauge" or "counter"
+            callback: Returns the value, or a mapping of label values to values
+            label_names: Names of the labels in the callback's mapping keys
+        """
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.callback = callback
+        self.label_names = tuple(label_names)
+    
+    def collect(self) -> Iterator[str]:
+        """Yield the exposition lines for this metric."""
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        value = self.callback()
+        samples = value.items() if isinstance(value, dict) else [((), value)]
+        for labels, sample in samples:
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(sample)}"
+
+
+class MetricsRegistry:
+    """Named collection of metrics rendered together for /metrics."""
+    
+    # Starlette appends "; charset=utf-8" to text media types
+    CONTENT_TYPE = "text/plain; version=0.0.4"
+    
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Union[Histogram, CallbackMetric]] = {}
+    
+    def histogram(self, name: str, help: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram, see Histogram."""
+        histogram = Histogram(name, help, label_names, buckets)
+        self._metrics[name] = histogram
+        return histogram
+    
+    def gauge(
+        self, name: str, help: str, callback: Callable[[], Union[float, Dict[Labels, float]]], label_names: Sequence[str] = ()
+    ) -> None:
+        """Register a gauge read from ``callback`` at scrape time."""
+        self._metrics[name] = CallbackMetric(name, help, "gauge", callback, label_names)
+    
+    def counter(
+        self, name: str, help: str, callback: Callable[[], Union[float, Dict[Labels, float]]], label_names: Sequence[str] = ()
+    ) -> None:
+        """Register a monotonically increasing counter read from ``callback`` at scrape time."""
+        self._metrics[name] = CallbackMetric(name, help, "counter", callback, label_names)
+    
+    def render(self) -> bytes:
+        """
+        Render every registered metric in the Prometheus text format.
+        
+        Returns:
+            UTF-8 exposition body
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.collect())
+        return ("\n".join(lines) + "\n").encode()
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "acme_http_request_duration_seconds", "HTTP request latency by route, method and status",
+    ("route", "method", "status")
+)
+FRAMEWORK_SECONDS = REGISTRY.histogram(
+    "acme_http_framework_seconds",
+    "Part of each request not spent in a timed stage (request parsing and validation, response serialization)",
+    ("route",)
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "acme_stage_duration_seconds", "Time spent in instrumented hot-path stages", ("stage",)
+)
+
+
+class _RequestTiming:
+    """Stage time of the request being handled, shared by its timed stages."""
+    
+    __slots__ = ("stage_seconds", "depth", "spans")
+    
+    def __init__(self, spans: Optional[List[Tuple[str, int, float, float]]]) -> None:
+        # Seconds in outermost timed stages
+        self.stage_seconds = 0.0
+        # Nesting depth of the stage currently running
+        self.depth = 0
+        # (stage, depth, start, seconds) of every stage, only while slow tracing is on
+        self.spans = spans
+
+
+# Timing of the current request, set by MetricsMiddleware
+_request_timing: contextvars.ContextVar[Optional[_RequestTiming]] = contextvars.ContextVar(
+    "request_timing", default=None
+)
+
+
+class SlowTraceLog:
+    """
+    Recent requests slower than a threshold, with the span of every timed stage.
+    
+    Tracing is off until a threshold is set. While it is on, each request
+    keeps a list of its stage spans (a tuple per timed call) and only
+    requests at or above the threshold are kept, newest last.
+    """
+    
+    def __init__(self, capacity: int = 100) -> None:
+        """
+        Create a disabled trace log.
+        
+        Args:
+            capacity: Number of slow requests kept
+        """
+        self.threshold: Optional[float] = None
+        self.recorded = 0
+        self._traces: "deque[Dict[str, Any]]" = deque(maxlen=capacity)
+    
+    def configure(self, threshold: Optional[float], capacity: Optional[int] = None) -> None:
+        """
+        Turn tracing on or off.
+        
+        Args:
+            threshold: Latency in seconds from which a request is kept, or None to stop tracing
+            capacity: New number of slow requests kept, or None to keep the current one
+        """
+        if threshold is not None and threshold < 0:
+            raise ValueError("threshold must not be negative")
+        if capacity is not None:
+            self._traces = deque(self._traces, maxlen=capacity)
+        self.threshold = threshold
+    
+    def record(self, trace: Dict[str, Any]) -> None:
+        """Keep a slow request's trace, evicting the oldest one when full."""
+        self._traces.append(trace)
+        self.recorded += 1
+    
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the kept traces, newest first.
+        
+        Args:
+            limit: Maximum number of traces to return
+            
+        Returns:
+            Trace dictionaries
+        """
+        traces = list(self._traces)[::-1]
+        return traces[:limit] if limit is not None else traces
+    
+    def clear(self) -> None:
+        """Drop all kept traces."""
+        self._traces.clear()
+
+
+SLOW_TRACES = SlowTraceLog()
+
+
+def timed(stage: str) -> Callable[[F], F]:
+    """
+    Decorate a function so each call is recorded as a stage.
+    
+    Inside a request, the time of the outermost stage is also subtracted from
+    the request's framework time; nested stages are not counted twice.
+    
+    Args:
+        stage: Stage name, used as the ``stage`` label
+        
+    Returns:
+        Decorator
+    """
+    labels = (stage,)
+    observe = STAGE_SECONDS.observe
+    
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            timing = _request_timing.get()
+            if timing is not None:
+                timing.depth += 1
+            started = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - started
+                if timing is not None:
+                    timing.depth -= 1
+                    if not timing.depth:
+                        timing.stage_seconds += elapsed
+                    if timing.spans is not None:
+                        timing.spans.append((stage, timing.depth, started, elapsed))
+                observe(elapsed, labels)
+        return wrapper  # type: ignore[return-value]
+    
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route, method and status.
+    
+    The route label is the matched path template (e.g. "/contacts"), so
+    label cardinality stays bounded; unmatched paths share one label.
+    Requests at or above the SLOW_TRACES threshold are also kept with
+    their stage spans.
+    """
+    
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[..., Awaitable[Any]], send: Callable[..., Awaitable[None]]) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status_code = 500
+        threshold = SLOW_TRACES.threshold
+        timing = _RequestTiming([] if threshold is not None else None)
+        token = _request_timing.set(timing)
+        
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            _request_timing.reset(token)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            framework = max(0.0, elapsed - timing.stage_seconds)
+            REQUEST_SECONDS.observe(elapsed, (path, scope["method"], str(status_code)))
+            FRAMEWORK_SECONDS.observe(framework, (path,))
+            if threshold is not None and elapsed >= threshold:
+                SLOW_TRACES.record(_trace(scope, path, status_code, started, elapsed, framework, timing.spans or []))
+
+
+def _trace(
+    scope: Dict[str, Any],
+    route: str,
+    status_code: int,
+    started: float,
+    elapsed: float,
+    framework: float,
+    spans: List[Tuple[str, int, float, float]]
+) -> Dict[str, Any]:
+    """Build the trace of a slow request; span offsets are relative to the request start."""
+    return {
+        "at": datetime.utcnow().isoformat() + "Z",
+        "method": scope["method"],
+        "route": route,
+        "path": scope["path"],
+        "status": status_code,
+        "duration_ms": round(elapsed * 1000, 3),
+        "framework_ms": round(framework * 1000, 3),
+        "spans": [
+            {
+                "stage": stage,
+                "depth": depth,
+                "start_ms": round((start - started) * 1000, 3),
+                "duration_ms": round(seconds * 1000, 3)
+            }
+            for stage, depth, start, seconds in sorted(spans, key=lambda span: span[2])
+        ]
+    }
+
+
+def process_rss_bytes() -> float:
+    """Resident set size of this process (Linux /proc; 0 where unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
@@ -0,0 +1,269 @@
+"""Append-only journal and snapshots for durable AcmeCRM contact storage."""
+
+import glob
+import json
+import mmap
+import os
+import threading
+import time
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Snapshot rows: [seq, contact_id, first, last, email, phone, company, notes, created_at, status]
+SnapshotRow = List[Any]
+SnapshotSource = Callable[[], Tuple[int, Iterator[SnapshotRow]]]
+
+_SNAPSHOT_FORMAT = 1
+
+# Snapshot rows are decoded this many at a time with a single json.loads call
+_RESTORE_CHUNK_SIZE = 10_000
+
+
+def _read_lines(path: str) -> Iterator[bytes]:
+    """Yield the non-empty lines of a file through a read-only memory map."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                if line.strip():
+                    yield line
+
+
+class ContactJournal:
+    """
+    Write-ahead log with group commit and periodic compacted snapshots.
+    
+    Records are appended to an in-memory buffer and a background thread writes
+    and fsyncs everything buffered since the last flush in one go, so many
+    writes share a single fsync. The log is split into numbered segments; a
+    snapshot N holds the store contents as of the start of segment N, after
+    which older segments and snapshots are deleted.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        flush_interval: float = 0.005,
+        snapshot_every: int = 100_000,
+        sync_commit: bool = True
+    ) -> None:
+        """
+        Open (or create) a journal directory.
+        
+        Args:
+            directory: Directory holding log segments and snapshots
+            flush_interval: Seconds between group commits
+            snapshot_every: Number of logged records that triggers a new snapshot
+            sync_commit: Block writers until their record has been fsynced (default);
+                False acknowledges writes before the group fsync, so a crash within
+                ``flush_interval`` loses them
+        """
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.sync_commit = sync_commit
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Condition()
+        # Serializes fsync with segment rotation so a file is never synced after it is closed
+        self._io_lock = threading.Lock()
+        self._pending: List[bytes] = []
+        self._appended_lsn = 0
+        self._durable_lsn = 0
+        self._records_since_snapshot = 0
+        self._closed = False
+        self._snapshot_source: Optional[SnapshotSource] = None
+        self._snapshot_thread: Optional[threading.Thread] = None
+        
+        segments = self._list("wal", ".log")
+        self._segment = segments[-1] if segments else 1
+        self._file = open(self._path("wal", self._segment, ".log"), "ab")
+        self._flusher = threading.Thread(target=self._flush_loop, name="contact-journal-flusher", daemon=True)
+        self._flusher.start()
+    
+    def _path(self, prefix: str, number: int, suffix: str) -> str:
+        return os.path.join(self.directory, f"{prefix}-{number:08d}{suffix}")
+    
+    def _list(self, prefix: str, suffix: str) -> List[int]:
+        """Return the numbers of existing files of a kind, in ascending order."""
+        paths = glob.glob(os.path.join(self.directory, f"{prefix}-*{suffix}"))
+        return sorted(int(os.path.basename(p)[len(prefix) + 1:-len(suffix)]) for p in paths)
+    
+    def recover(self) -> Tuple[Optional[Tuple[int, Iterator[List[SnapshotRow]]]], Iterator[Dict[str, Any]]]:
+        """
+        Read back the latest snapshot and the log records written after it.
+        
+        Returns:
+            Tuple of ((end_seq, chunks of snapshot rows) or None, log records to replay in order)
+        """
+        snapshots = self._list("snapshot", ".jsonl")
+        start_segment = snapshots[-1] if snapshots else 0
+        snapshot = self._read_snapshot(snapshots[-1]) if snapshots else None
+        
+        def records() -> Iterator[Dict[str, Any]]:
+            for segment in self._list("wal", ".log"):
+                if segment < start_segment:
+                    continue
+                for line in _read_lines(self._path("wal", segment, ".log")):
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn write at the tail of the last segment; nothing after it was acknowledged
+                        return
+        
+        return snapshot, records()
+    
+    def _read_snapshot(self, number: int) -> Tuple[int, Iterator[List[SnapshotRow]]]:
+        lines = _read_lines(self._path("snapshot", number, ".jsonl"))
+        header = json.loads(next(lines))
+        if header.get("format") != _SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported snapshot format: {header.get('format')}")
+        
+        def chunks() -> Iterator[List[SnapshotRow]]:
+            while True:
+                chunk = list(islice(lines, _RESTORE_CHUNK_SIZE))
+                if not chunk:
+                    return
+                yield json.loads(b"[" + b",".join(chunk) + b"]")
+        
+        return header["end_seq"], chunks()
+    
+    def append(self, record: Dict[str, Any], wait: bool = True) -> int:
+        """
+        Append a record to the log.
+        
+        Args:
+            record: JSON-serializable description of a store mutation
+            wait: With sync_commit, block until the record is durable; pass False to
+                append under a caller's lock and call ``wait_durable`` once it is released
+                
+        Returns:
+            Log sequence number of the record
+        """
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Contact journal is closed")
+            self._pending.append(line)
+            self._appended_lsn += 1
+            self._records_since_snapshot += 1
+            lsn = self._appended_lsn
+        if wait:
+            self.wait_durable(lsn)
+        return lsn
+    
+    def wait_durable(self, lsn: int) -> None:
+        """
+        Block until a record has been fsynced, if sync_commit is enabled.
+        
+        Args:
+            lsn: Log sequence number returned by ``append``
+        """
+        if not self.sync_commit:
+            return
+        with self._lock:
+            # Wake the flusher now; records appended while it syncs join the next group
+            self._lock.notify_all()
+            while self._durable_lsn < lsn and not self._closed:
+                self._lock.wait()
+    
+    def attach_snapshot_source(self, source: SnapshotSource) -> None:
+        """
+        Register the callback used to dump the store when a snapshot is due.
+        
+        Args:
+            source: Callable returning (end_seq, iterator of snapshot rows)
+        """
+        self._snapshot_source = source
+    
+    def _flush_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._pending and not self._closed:
+                    self._lock.wait(self.flush_interval)
+                batch, self._pending = self._pending, []
+                lsn = self._appended_lsn
+                closed = self._closed
+                snapshot_due = (
+                    self._snapshot_source is not None
+                    and self._records_since_snapshot >= self.snapshot_every
+                    and (self._snapshot_thread is None or not self._snapshot_thread.is_alive())
+                )
+                # Write under the lock so records reach the file in append order
+                log_file = self._file
+                if batch:
+                    log_file.write(b"".join(batch))
+                    log_file.flush()
+            
+            if batch:
+                # fsync outside the main lock so writers can keep buffering the next group
+                with self._io_lock:
+                    if not log_file.closed:
+                        os.fsync(log_file.fileno())
+            self._mark_durable(lsn)
+            
+            if closed:
+                return
+            if snapshot_due:
+                self._snapshot_thread = threading.Thread(
+                    target=self.snapshot, name="contact-journal-snapshot", daemon=True
+                )
+                self._snapshot_thread.start()
+    
+    def _mark_durable(self, lsn: int) -> None:
+        with self._lock:
+            self._durable_lsn = max(self._durable_lsn, lsn)
+            self._lock.notify_all()
+    
+    def snapshot(self) -> None:
+        """
+        Write a compacted snapshot of the store and drop the log it replaces.
+        
+        The store keeps changing while the snapshot is written, so the snapshot
+        may already contain some records of the new segment; replay is idempotent
+        for that reason.
+        """
+        if self._snapshot_source is None:
+            return
+        
+        # Start a new segment; everything in older segments is reflected in the store already
+        with self._io_lock, self._lock:
+            pending, self._pending = self._pending, []
+            self._file.write(b"".join(pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._path("wal", self._segment, ".log"), "ab")
+            self._records_since_snapshot = 0
+            self._durable_lsn = self._appended_lsn
+            self._lock.notify_all()
+            segment = self._segment
+        
+        end_seq, rows = self._snapshot_source()
+        path = self._path("snapshot", segment, ".jsonl")
+        with open(path + ".tmp", "wb") as f:
+            f.write(json.dumps({"format": _SNAPSHOT_FORMAT, "end_seq": end_seq, "created": time.time()}).encode() + b"\n")
+            for row in rows:
+                f.write(json.dumps(row, separators=(",", ":")).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+        
+        for number in self._list("snapshot", ".jsonl"):
+            if number < segment:
+                os.remove(self._path("snapshot", number, ".jsonl"))
+        for number in self._list("wal", ".log"):
+            if number < segment:
+                os.remove(self._path("wal", number, ".log"))
+    
+    def close(self) -> None:
+        """Flush outstanding records and stop the background threads."""
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        self._flusher.join()
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+        self._file.close()
@@ -0,0 +1,130 @@
+"""In-process sampling profiler producing collapsed stacks."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+# Bounds for a single profile, so a request cannot keep the sampler running indefinitely
+MAX_PROFILE_SECONDS = 60.0
+MIN_INTERVAL_SECONDS = 0.001
+
+# Path segments after which library file names are shown
+_LIBRARY_DIRS = ("/site-packages/", "/dist-packages/", f"/lib/python{sys.version_info[0]}.{sys.version_info[1]}/")
+
+# Innermost functions of a thread that is waiting for work rather than doing it
+_IDLE_FUNCTIONS = frozenset({"select", "wait", "_worker"})
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+class SamplingProfiler:
+    """
+    Stack-sampling profiler for the running process.
+    
+    The thread calling ``profile`` (e.g. a threadpool worker) reads the
+    stack of every other thread at a fixed interval (``sys._current_frames``)
+    and counts identical stacks. Nothing is instrumented, so the profiled
+    code runs at full speed between samples; the cost is one stack walk per
+    thread per interval. Results are collapsed stacks
+    (``thread;outer;...;inner count`` per line), the input format of
+    flamegraph.pl, speedscope and similar tools.
+    """
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Frame labels by code object, so each function is formatted once
+        self._labels: Dict[CodeType, str] = {}
+        self._root = os.getcwd() + os.sep
+    
+    @property
+    def running(self) -> bool:
+        """Whether a profile is being taken."""
+        return self._lock.locked()
+    
+    def _label(self, code: CodeType) -> str:
+        """Format a frame as ``qualified name (file:line)``, with paths relative to the app or library root."""
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename.removeprefix(self._root)
+            # Keep library paths short: "starlette/routing.py" rather than the full site-packages path
+            for marker in _LIBRARY_DIRS:
+                if marker in filename:
+                    filename = filename.rsplit(marker, 1)[1]
+                    break
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+        return label
+    
+    def _collapse(self, thread_name: str, frame: Optional[FrameType]) -> str:
+        """Render one thread's stack root first."""
+        labels: List[str] = []
+        while frame is not None:
+            labels.append(self._label(frame.f_code))
+            frame = frame.f_back
+        labels.append(thread_name.replace(";", ":").replace(" ", "_"))
+        return ";".join(reversed(labels))
+    
+    def profile(self, seconds: float, interval: float = 0.005, include_idle: bool = False) -> "Counter[str]":
+        """
+        Sample every thread's stack for a while; blocks the calling thread meanwhile.
+        
+        Args:
+            seconds: How long to sample (at most MAX_PROFILE_SECONDS)
+            interval: Seconds between samples (at least MIN_INTERVAL_SECONDS)
+            include_idle: Keep samples of threads waiting for work (event loop selector, idle pool workers)
+            
+        Returns:
+            Number of samples per collapsed stack
+            
+        Raises:
+            ProfilerBusyError: If another profile is running
+        """
+        seconds = min(seconds, MAX_PROFILE_SECONDS)
+        interval = max(interval, MIN_INTERVAL_SECONDS)
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            stacks: "Counter[str]" = Counter()
+            own_thread = threading.get_ident()
+            deadline = time.monotonic() + seconds
+            next_sample = time.monotonic()
+            while next_sample < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident == own_thread:
+                        continue
+                    if not include_idle and _is_idle(frame):
+                        continue
+                    stacks[self._collapse(names.get(ident, f"thread-{ident}"), frame)] += 1
+                next_sample += interval
+                time.sleep(max(0.0, next_sample - time.monotonic()))
+            return stacks
+        finally:
+            self._lock.release()
+
+
+def _is_idle(frame: FrameType) -> bool:
+    """Whether a thread is parked in the event loop selector or a lock/queue wait."""
+    code = frame.f_code
+    return code.co_name in _IDLE_FUNCTIONS and (
+        code.co_filename.endswith(("selectors.py", "threading.py", "thread.py"))
+    )
+
+
+def format_collapsed(stacks: "Counter[str]") -> bytes:
+    """
+    Encode collapsed stacks, one ``stack count`` line each, most frequent first.
+    
+    Args:
+        stacks: Number of samples per collapsed stack
+        
+    Returns:
+        UTF-8 text ready for flamegraph.pl or speedscope
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()).encode()
@@ -0,0 +1,415 @@
+"""In-process full-text and prefix search over contacts."""
+
+import bisect
+import heapq
+import threading
+from array import array
+from itertools import groupby, repeat
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.contact_repository import ContactRepository
+from services.duplicate_index import name_tokens
+
+# Weight of a query word matching each field; matching a whole word counts twice as much as a prefix
+FIELD_WEIGHTS = {"name": 4, "company": 3, "email": 2, "notes": 1}
+
+# Fields whose words also match the last query word by prefix (type-ahead); email and notes words match whole
+PREFIX_FIELDS = ("name", "company")
+
+# Completions of the last query word that are searched, most frequent first, so one-letter prefixes stay cheap
+MAX_PREFIX_TERMS = 64
+
+# New prefix words go to a small sorted list that is merged into the vocabulary once it holds this many
+VOCABULARY_MERGE_SIZE = 4096
+
+# Cost of one step of walking a multi-word query's candidates, in postings read into sets; the walk
+# is chosen when the steps expected until ``limit`` hits (assuming independent words) cost less than
+# reading the rarest word's postings
+WALK_STEP_COST = 20
+
+# A word's postings are turned into a set for intersecting when they are at most this many times the candidates
+SET_INTERSECTION_RATIO = 8
+
+# Deleted contacts are skipped in results until they make up this share of the index, which is then
+# rebuilt without them in the background
+REBUILD_DELETED_RATIO = 0.25
+
+
+def contact_terms(contact: AcmeContact) -> Dict[str, Set[str]]:
+    """
+    Split the searchable fields of a contact into words.
+    
+    Args:
+        contact: Contact in AcmeCRM format
+        
+    Returns:
+        Distinct lowercase ASCII words per field (name, company, email, notes)
+    """
+    return {
+        "name": set(name_tokens(contact.acme_first_name) + name_tokens(contact.acme_last_name)),
+        "company": set(name_tokens(contact.acme_company_name)),
+        "email": set(name_tokens(contact.acme_email)),
+        "notes": set(name_tokens(contact.acme_notes))
+    }
+
+
+def _prefix_end(prefix: str) -> str:
+    """Smallest string above every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class SearchIndex:
+    """
+    Inverted index of contact names, companies, emails and notes.
+    
+    Indexed contacts are numbered densely in insertion order, whatever gaps
+    the repository's sequence numbers have (every backend leaves the numbers
+    of deleted contacts unused, so the gaps grow with deletes), and every
+    word maps to the numbers of the contacts containing it, per field, in
+    compact arrays. Name and company words also go into a sorted
+    vocabulary (a flattened prefix trie: a prefix is a contiguous range found
+    by bisection), so the last query word completes as the user types.
+    
+    Like the duplicate index, it follows the repository by sequence number:
+    every search first indexes the contacts inserted since the last one,
+    which also picks up bulk imports and other worker processes, so creates
+    never wait for the index lock.
+    Deleted contacts are recorded by AcmeService and skipped in results;
+    once they make up REBUILD_DELETED_RATIO of the index, an index without
+    them is built in a background thread and swapped in. Status is not
+    searched, so status updates leave it unchanged.
+    """
+    
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Incremented by every reset, so an index rebuilt in the background for older contents is dropped
+        self._epoch = 0
+        # Repository generation the indexed contacts belong to
+        self._generation = 0
+        self._reset()
+    
+    def _reset(self) -> None:
+        # Field -> word -> numbers of the contacts containing it, ascending
+        self._postings: Dict[str, Dict[str, array]] = {field: {} for field in FIELD_WEIGHTS}
+        self._vocabulary: List[str] = []
+        self._new_words: List[str] = []
+        # Contact ID and repository sequence number by contact number
+        self._contact_ids: List[str] = []
+        self._seqs = array("q")
+        self._deleted: Set[int] = set()
+        self._indexed = 0
+        self._last_seq = -1
+        self._epoch += 1
+        self._rebuilder: Optional[threading.Thread] = None
+        # Sequence numbers removed while the rebuild runs, to be removed from the rebuilt index too
+        self._removed_seqs: List[int] = []
+    
+    def reset(self) -> None:
+        """Forget every indexed contact, e.g. after the repository was switched or cleared."""
+        with self._lock:
+            self._reset()
+    
+    def _add(self, seq: int, contact: AcmeContactResponse) -> None:
+        number = self._indexed
+        self._contact_ids.append(contact.acme_contact_id)
+        self._seqs.append(seq)
+        for field, terms in contact_terms(contact.acme_contact).items():
+            postings = self._postings[field]
+            for term in terms:
+                entries = postings.get(term)
+                if entries is None:
+                    postings[term] = entries = array("I")
+                    # New to the vocabulary unless the other prefix field already has it
+                    if field in PREFIX_FIELDS and sum(term in self._postings[other] for other in PREFIX_FIELDS) == 1:
+                        bisect.insort(self._new_words, term)
+                entries.append(number)
+        self._indexed += 1
+        if len(self._new_words) >= VOCABULARY_MERGE_SIZE:
+            # Both lists are sorted, which the sort detects as two runs and merges in linear time
+            self._vocabulary = sorted(self._vocabulary + self._new_words)
+            self._new_words = []
+    
+    def _catch_up(self, repository: ContactRepository) -> None:
+        """Index the contacts inserted since the last call (caller holds the lock)."""
+        if repository.generation != self._generation:
+            # Cleared, possibly by another worker process: everything indexed is gone
+            self._reset()
+            self._generation = repository.generation
+        for seq, contact in repository.iter_contacts(after=self._last_seq):
+            self._add(seq, contact)
+            self._last_seq = seq
+    
+    def sync(self, repository: ContactRepository) -> Dict[str, int]:
+        """
+        Index every contact not indexed yet.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            
+        Returns:
+            Dictionary with the searchable contact and prefix word counts
+        """
+        with self._lock:
+            self._catch_up(repository)
+            return {
+                "contacts": self._indexed - len(self._deleted),
+                "prefix_words": len(self._vocabulary) + len(self._new_words)
+            }
+    
+    def _number(self, seq: int) -> Optional[int]:
+        """Number of the indexed contact with this sequence number, or None if it is not indexed."""
+        number = bisect.bisect_left(self._seqs, seq)
+        return number if number < self._indexed and self._seqs[number] == seq else None
+    
+    def remove(self, repository: ContactRepository, contact_id: str) -> None:
+        """
+        Exclude a contact from results; call before deleting it from the repository.
+        
+        Args:
+            repository: Repository the contact is stored in
+            contact_id: Unique contact identifier
+        """
+        contact = repository.get(contact_id)
+        if contact is None:
+            return
+        with self._lock:
+            # The email index finds the contact's sequence number without a reverse map of every ID
+            seqs = []
+            for seq, candidate in repository.iter_contacts(email=contact.acme_contact.acme_email):
+                if candidate.acme_contact_id != contact_id:
+                    continue
+                number = self._number(seq)
+                if number is not None:
+                    self._deleted.add(number)
+                seqs.append(seq)
+            if self._rebuilder is None and len(self._deleted) > self._indexed * REBUILD_DELETED_RATIO:
+                self._rebuilder = threading.Thread(
+                    target=self._rebuild,
+                    args=(repository, self._epoch, self._last_seq),
+                    name="search-index-rebuild",
+                    daemon=True
+                )
+                self._rebuilder.start()
+            if self._rebuilder is not None:
+                # Including the contact that started the rebuild: it is still stored while the rebuild reads
+                self._removed_seqs.extend(seqs)
+    
+    def _rebuild(self, repository: ContactRepository, epoch: int, last_seq: int) -> None:
+        """
+        Build an index of the contacts still stored without holding the lock, then swap it in.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            epoch: Epoch of the index when the rebuild started
+            last_seq: Last sequence number indexed when the rebuild started
+        """
+        rebuilt = SearchIndex()
+        try:
+            for seq, contact in repository.iter_contacts():
+                if seq > last_seq:
+                    break
+                rebuilt._add(seq, contact)
+                rebuilt._last_seq = seq
+        except Exception:
+            with self._lock:
+                if epoch == self._epoch:
+                    # The next delete starts another rebuild
+                    self._rebuilder = None
+                    self._removed_seqs = []
+            raise
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            # Only the contacts indexed or removed while the rebuild ran are applied under the lock
+            for seq, contact in repository.iter_contacts(after=rebuilt._last_seq):
+                if seq > self._last_seq:
+                    break
+                rebuilt._add(seq, contact)
+                rebuilt._last_seq = seq
+            rebuilt._last_seq = self._last_seq
+            for seq in self._removed_seqs:
+                number = rebuilt._number(seq)
+                if number is not None:
+                    rebuilt._deleted.add(number)
+            self._postings, self._vocabulary, self._new_words = rebuilt._postings, rebuilt._vocabulary, rebuilt._new_words
+            self._contact_ids, self._seqs, self._deleted = rebuilt._contact_ids, rebuilt._seqs, rebuilt._deleted
+            self._indexed = rebuilt._indexed
+            self._rebuilder = None
+            self._removed_seqs = []
+    
+    def _frequency(self, term: str) -> int:
+        return sum(len(self._postings[field].get(term, ())) for field in PREFIX_FIELDS)
+    
+    def _completions(self, prefix: str) -> List[str]:
+        """Name and company words starting with ``prefix``, other than the prefix itself."""
+        end = _prefix_end(prefix)
+        terms: List[str] = []
+        for words in (self._vocabulary, self._new_words):
+            start, stop = bisect.bisect_left(words, prefix), bisect.bisect_left(words, end)
+            terms.extend(term for term in words[start:stop] if term != prefix)
+        if len(terms) > MAX_PREFIX_TERMS:
+            terms = heapq.nlargest(MAX_PREFIX_TERMS, terms, key=self._frequency)
+        return terms
+    
+    def _matches(self, word: str, prefix: bool) -> Tuple[List[Tuple[int, array]], int]:
+        """
+        Find every way a query word matches.
+        
+        Returns:
+            Tuple of (score, postings) pairs, best score first, and an estimate of the contacts
+            matched: the most postings in one field, as a contact's first name is often in its
+            email too but rarely twice in the same field
+        """
+        matches: List[Tuple[int, array]] = []
+        field_sizes = dict.fromkeys(FIELD_WEIGHTS, 0)
+        for field, weight in FIELD_WEIGHTS.items():
+            entries = self._postings[field].get(word)
+            if entries is not None:
+                matches.append((2 * weight, entries))
+                field_sizes[field] += len(entries)
+        if prefix:
+            for term in self._completions(word):
+                for field in PREFIX_FIELDS:
+                    entries = self._postings[field].get(term)
+                    if entries is not None:
+                        matches.append((FIELD_WEIGHTS[field], entries))
+                        field_sizes[field] += len(entries)
+        matches.sort(key=lambda match: -match[0])
+        return matches, max(field_sizes.values())
+    
+    def _rank_one(self, word: str, limit: int) -> List[Tuple[int, int]]:
+        # A contact scores its best match, so walking the score tiers best first, each in insertion order, can stop at ``limit``
+        ranked: List[Tuple[int, int]] = []
+        seen: Set[int] = set()
+        for score, tier in groupby(self._matches(word, prefix=True)[0], key=lambda match: match[0]):
+            for number, _ in self._walk(list(tier)):
+                if number not in seen and number not in self._deleted:
+                    seen.add(number)
+                    ranked.append((number, score))
+                    if len(ranked) == limit:
+                        return ranked
+        return ranked
+    
+    @staticmethod
+    def _walk(matches: List[Tuple[int, array]]) -> Iterator[Tuple[int, int]]:
+        """Yield (contact number, best score) of every contact in ``matches``, in insertion order."""
+        if len(matches) == 1:
+            score, entries = matches[0]
+            for number in entries:
+                yield number, score
+            return
+        previous = -1
+        # Equal contact numbers come out best score first
+        for number, negative_score in heapq.merge(*[zip(entries, repeat(-score)) for score, entries in matches]):
+            if number != previous:
+                previous = number
+                yield number, -negative_score
+    
+    @staticmethod
+    def _size(matches: List[Tuple[int, array]]) -> int:
+        """Number of postings in ``matches``."""
+        return sum(len(entries) for _, entries in matches)
+    
+    @staticmethod
+    def _score_of(matches: List[Tuple[int, array]], number: int) -> int:
+        """Best score of a contact in ``matches`` (postings are sorted, so bisection finds it), or 0."""
+        for score, entries in matches:
+            position = bisect.bisect_left(entries, number)
+            if position < len(entries) and entries[position] == number:
+                return score
+        return 0
+    
+    def _best_scores(self, matches: List[Tuple[int, array]], candidates: Dict[int, int]) -> Dict[int, int]:
+        """Best score in ``matches`` of each candidate that has one."""
+        if self._size(matches) > SET_INTERSECTION_RATIO * len(candidates):
+            # Far more postings than candidates: looking each candidate up is cheaper than reading them all
+            return {number: score for number in candidates if (score := self._score_of(matches, number))}
+        # Worst match first, so each candidate keeps its best score
+        scores: Dict[int, int] = {}
+        for score, entries in reversed(matches):
+            scores.update(dict.fromkeys(candidates.keys() & entries, score))
+        return scores
+    
+    def _rank_sparse(
+        self, driver: List[Tuple[int, array]], matches: List[List[Tuple[int, array]]], limit: int
+    ) -> List[Tuple[int, int]]:
+        """Rank when few contacts match every word: intersect and score with set operations, then pick the best."""
+        totals: Dict[int, int] = {}
+        for score, entries in reversed(driver):
+            totals.update(dict.fromkeys(entries, score))
+        for number in self._deleted & totals.keys():
+            del totals[number]
+        for word_matches in sorted(matches, key=self._size):
+            word_scores = self._best_scores(word_matches, totals)
+            totals = {number: totals[number] + score for number, score in word_scores.items()}
+            if not totals:
+                return []
+        return heapq.nlargest(limit, totals.items(), key=lambda item: (item[1], -item[0]))
+    
+    def _rank_all(self, words: List[str], limit: int) -> List[Tuple[int, int]]:
+        matches, estimates = [], []
+        for position, word in enumerate(words):
+            word_matches, estimate = self._matches(word, prefix=position == len(words) - 1)
+            if not word_matches:
+                return []
+            matches.append(word_matches)
+            estimates.append(estimate)
+        
+        # The rarest word drives: its contacts are the candidates the other words are checked against
+        sizes = [self._size(word_matches) for word_matches in matches]
+        driver_index = sizes.index(min(sizes))
+        hit_rate = 1.0
+        for position, estimate in enumerate(estimates):
+            if position != driver_index:
+                hit_rate *= estimate / max(self._indexed, 1)
+        driver = matches.pop(driver_index)
+        if limit / max(hit_rate, 1e-9) * WALK_STEP_COST > sizes[driver_index]:
+            return self._rank_sparse(driver, matches, limit)
+        
+        # Many expected hits: walk the candidates in insertion order and stop once the results cannot improve
+        best_score = driver[0][0] + sum(word_matches[0][0] for word_matches in matches)
+        # Min-heap of the best results so far as (score, -number): its root is the result to drop first
+        heap: List[Tuple[int, int]] = []
+        for number, score in self._walk(driver):
+            if number in self._deleted:
+                continue
+            for word_matches in matches:
+                word_score = self._score_of(word_matches, number)
+                if not word_score:
+                    break
+                score += word_score
+            else:
+                if len(heap) < limit:
+                    heapq.heappush(heap, (score, -number))
+                elif (score, -number) > heap[0]:
+                    heapq.heapreplace(heap, (score, -number))
+                # Later contacts can at best tie, and lose the tie on insertion order
+                if len(heap) == limit and heap[0][0] == best_score:
+                    break
+        return [(-negative_number, score) for score, negative_number in sorted(heap, reverse=True)]
+    
+    def search(self, repository: ContactRepository, query: str, limit: int) -> List[Tuple[str, int]]:
+        """
+        Find the contacts matching every word of a query, best first.
+        
+        Each query word matches a whole word of the name, company, email or
+        notes; the last one also matches name and company words it is a
+        prefix of. A contact scores, per query word, the weight of its best
+        matching field (FIELD_WEIGHTS), doubled for a whole-word match. Ties
+        are broken by insertion order.
+        
+        Args:
+            repository: Repository the contacts are stored in
+            query: Search text; case, accents and punctuation are ignored
+            limit: Maximum number of results
+            
+        Returns:
+            List of (contact ID, score) tuples
+        """
+        words = list(dict.fromkeys(name_tokens(query)))
+        if not words:
+            return []
+        with self._lock:
+            self._catch_up(repository)
+            ranked = self._rank_one(words[0], limit) if len(words) == 1 else self._rank_all(words, limit)
+            return [(self._contact_ids[number], score) for number, score in ranked]
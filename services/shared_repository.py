@@ -0,0 +1,644 @@
+"""Shared-memory storage backend for running AcmeCRM contacts across worker processes."""
+
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.change_feed import ChangeFeed, ContactChange
+from services.contact_repository import ContactRepository, company_leaderboard, new_contact_ids, normalize_key
+from services.contact_store import contact_from_tuple, contact_to_tuple
+
+# Header at the start of the file: magic, committed end offset, store version, generation (bumped
+# whenever the log is rewritten), next sequence number, clear count, the end offset before
+# and after the last compaction, and next change number
+_MAGIC = b"ACMESHM3"
+_HEADER = struct.Struct("<8sQQQQQQQQ")
+_HEADER_SIZE = 72
+_END_OFFSET = 8
+_VERSION_OFFSET = 16
+_GENERATION_OFFSET = 24
+_NEXT_SEQ_OFFSET = 32
+_CLEARS_OFFSET = 40
+_COMPACTED_FROM_OFFSET = 48
+_COMPACTED_TO_OFFSET = 56
+_NEXT_CHANGE_OFFSET = 64
+
+# Each record is a payload length, a kind byte, the sequence number of the contact it is about and
+# its change number, followed by a compact JSON array. Change numbers count every record appended,
+# so they number the change feed the same way in every worker
+_RECORD = struct.Struct("<IBQQ")
+_CREATE = 1
+_STATUS = 2
+_DELETE = 3
+
+# Initial file size; the file is sparse and grows by doubling, so unused space costs nothing
+DEFAULT_INITIAL_SIZE = 64 * 1024 * 1024
+
+# The log is compacted in the background once it is this many times the size of the live
+# contacts' create records, and at least DEFAULT_COMPACT_MIN_SIZE bytes
+COMPACT_RATIO = 2
+DEFAULT_COMPACT_MIN_SIZE = 16 * 1024 * 1024
+
+# Contacts decoded per lock acquisition while iterating, as in the in-memory backend
+_FIRST_CHUNK = 128
+_MAX_CHUNK = 2048
+
+
+_T = TypeVar("_T")
+
+
+def _encode(kind: int, seq: int, change: int, payload: List[Any]) -> bytes:
+    """Encode one log record."""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    return _RECORD.pack(len(body), kind, seq, change) + body
+
+
+class SharedContactRepository(ContactRepository):
+    """
+    Contacts kept in an mmap'd append-only log shared by every worker process.
+    
+    Put the file on a tmpfs such as /dev/shm and it is a shared-memory
+    segment that every ``uvicorn --workers N`` process maps. All workers see
+    the same contacts, and reads in different processes never contend.
+    
+    Single writer, many readers: a writer holds an exclusive ``flock`` on
+    the file, appends create, status and delete records after the committed
+    end and only then publishes the new end offset in the header. Readers
+    take no cross-process lock: they read the committed end and apply the
+    records they have not seen yet to process-local indexes, which map
+    contact IDs and filter keys to sequence numbers and those to record
+    offsets. Contact data stays in the shared mapping and is decoded on
+    read. A batch of creates becomes visible to other workers all at once.
+    
+    Deleted contacts and superseded status records are dropped by
+    compaction, which a writer runs in a background thread once the log is
+    COMPACT_RATIO times the size of the live contacts; the freed tail of
+    the file is handed back to tmpfs. ``clear`` rewinds the log. Both start
+    a new generation: readers re-check the generation after every read of
+    the mapping, so they never return a record that was overwritten
+    meanwhile, and wait on a shared ``flock`` until the rewritten log is
+    published. A reader that was caught up with the compacted log only
+    re-reads record offsets, without decoding any contact.
+    
+    Sequence numbers are handed out by the writer from a counter in the
+    header and stored in the records, so they are the same in every worker,
+    survive compaction and clears, and pagination cursors work across
+    workers. So are change numbers: every worker records the changes it
+    applies from the log in a process-local ChangeFeed under those numbers,
+    so change cursors and live push cover the writes of all workers. A view
+    that is reset by a clear, or by a compaction it had not caught up with,
+    starts its feed over at the header's change counter, and older cursors
+    resync there.
+    """
+    
+    records_changes = True
+    
+    def __init__(
+        self,
+        path: str,
+        initial_size: int = DEFAULT_INITIAL_SIZE,
+        compact_min_size: int = DEFAULT_COMPACT_MIN_SIZE
+    ) -> None:
+        """
+        Open (or create) a shared contact log.
+        
+        Args:
+            path: File to map, e.g. "/dev/shm/acme-contacts"
+            initial_size: Size in bytes reserved when the file is created
+            compact_min_size: Size in bytes below which the log is never compacted
+            
+        Raises:
+            ValueError: If the file exists but is not a contact log
+        """
+        self.path = path
+        self.compact_min_size = compact_min_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Guards the mapping and the local view between threads of this process;
+        # the flock on the file serializes writers across processes
+        self._lock = threading.RLock()
+        # Whether this process holds the exclusive flock, i.e. the log cannot change under it
+        self._writer = False
+        self._compactor: Optional[threading.Thread] = None
+        # Changes applied from the log, numbered by the change numbers of their records
+        self._changes = ChangeFeed()
+        
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size < _HEADER_SIZE:
+                os.ftruncate(self._fd, max(initial_size, _HEADER_SIZE))
+                self._mm = mmap.mmap(self._fd, 0)
+                # Seeded from the clock so a recreated log never reuses an old version or change number
+                # (microseconds for change numbers, so change cursors stay exact in JavaScript numbers)
+                _HEADER.pack_into(
+                    self._mm, 0, _MAGIC, _HEADER_SIZE, time.time_ns(), 0, 0, 0, 0, _HEADER_SIZE, time.time_ns() // 1000
+                )
+            else:
+                self._mm = mmap.mmap(self._fd, 0)
+                if self._mm[:len(_MAGIC)] != _MAGIC:
+                    raise ValueError(f"{path} is not a shared contact store")
+        except BaseException:
+            os.close(self._fd)
+            raise
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        
+        self._generation = -1
+        self._reset_view()
+    
+    def _reset_view(self) -> None:
+        """Forget everything applied from the log, e.g. after a clear."""
+        self._applied = _HEADER_SIZE
+        # Live contacts: ID -> sequence number, sequence number -> ID and create record offset, and current status
+        self._seq_of: Dict[str, int] = {}
+        self._id_of: Dict[int, str] = {}
+        self._offset_of: Dict[int, int] = {}
+        self._status_of: Dict[str, str] = {}
+        # Sequence numbers in order, including deleted ones until the next compaction
+        self._seqs: List[int] = []
+        # Live contacts with status records, and the size of the live contacts' create records
+        self._status_changed: Set[int] = set()
+        self._live_bytes = 0
+        
+        # Secondary hash indexes mapping a lookup key to the sequence numbers of matching contacts
+        self._email_index: Dict[str, Set[int]] = {}
+        self._company_index: Dict[str, Set[int]] = {}
+        self._status_index: Dict[str, Set[int]] = {}
+        
+        # Running counters behind stats(); companies are counted by normalized name, and per spelling for display
+        self._status_counts: Counter = Counter()
+        self._company_counts: Counter = Counter()
+        self._company_spellings: Dict[str, Counter] = {}
+        self._created_per_minute: Counter = Counter()
+    
+    def _header(self) -> Tuple[int, int, int]:
+        """Read (committed end, version, generation); the caller holds ``_lock``."""
+        _, end, version, generation, *_ = _HEADER.unpack_from(self._mm, 0)
+        return end, version, generation
+    
+    def _field(self, offset: int) -> int:
+        """Read one header field; the caller holds ``_lock``."""
+        return struct.unpack_from("<Q", self._mm, offset)[0]
+    
+    def _set_field(self, offset: int, value: int) -> None:
+        """Write one header field; the caller is the writer."""
+        struct.pack_into("<Q", self._mm, offset, value)
+    
+    def _remap(self, size: int) -> None:
+        """Map at least ``size`` bytes after the file has grown; the caller holds ``_lock``."""
+        if len(self._mm) < size:
+            self._mm.close()
+            self._mm = mmap.mmap(self._fd, 0)
+    
+    def _read(self, offset: int) -> Tuple[int, int, int, List[Any], int]:
+        """Decode the record at an offset, returning (kind, sequence number, change number, payload, offset of the next record)."""
+        length, kind, seq, change = _RECORD.unpack_from(self._mm, offset)
+        start = offset + _RECORD.size
+        return kind, seq, change, json.loads(self._mm[start:start + length]), start + length
+    
+    def _catch_up(self) -> None:
+        """Apply records committed by any process since the last call; the caller holds ``_lock``."""
+        while True:
+            end, _, generation = self._header()
+            if generation != self._generation:
+                self._follow_rewrite()
+                continue
+            self._remap(end)
+            try:
+                offset = self._applied
+                while offset < end:
+                    kind, seq, change, payload, next_offset = self._read(offset)
+                    self._apply(kind, seq, change, offset, payload, next_offset - offset)
+                    offset = next_offset
+                self._applied = offset
+            except (ValueError, KeyError, struct.error, IndexError):
+                # Records overwritten by a concurrent clear or compaction; anything else is corruption
+                if self._header()[2] == generation:
+                    raise
+            if self._header()[2] == generation:
+                return
+            # What was applied may have been read from a half-rewritten log, so it is all read again
+            self._generation = -1
+    
+    def _follow_rewrite(self) -> None:
+        """Catch up with a clear or compaction, possibly by another process; the caller holds ``_lock``."""
+        if not self._writer:
+            # The writer holds the exclusive lock until the rewritten log is published
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+        try:
+            end, _, generation = self._header()
+            compacted_from = self._field(_COMPACTED_FROM_OFFSET)
+            compacted_to = self._field(_COMPACTED_TO_OFFSET)
+            self._remap(end)
+            if generation == self._generation + 1 and compacted_from == self._applied and self._applied > _HEADER_SIZE:
+                # Compacted right after what this view has applied: only the create records moved
+                offset = _HEADER_SIZE
+                while offset < compacted_to:
+                    length, kind, seq, _ = _RECORD.unpack_from(self._mm, offset)
+                    if kind == _CREATE:
+                        self._offset_of[seq] = offset
+                    offset += _RECORD.size + length
+                self._applied = compacted_to
+                self._seqs = list(self._id_of)
+            else:
+                self._reset_view()
+                # The records of the rewritten log are not replayed as changes
+                self._changes.restart(self._field(_NEXT_CHANGE_OFFSET) - 1)
+            self._generation = generation
+        finally:
+            if not self._writer:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    def _stable(self, read: Callable[[], _T]) -> _T:
+        """Run a read of the mapping until no clear or compaction overlapped it; the caller holds ``_lock``."""
+        while True:
+            self._catch_up()
+            try:
+                result = read()
+            except (ValueError, KeyError, struct.error, IndexError):
+                if self._header()[2] == self._generation:
+                    raise
+                continue
+            if self._header()[2] == self._generation:
+                return result
+    
+    def _apply(self, kind: int, seq: int, change: int, offset: int, payload: List[Any], size: int) -> None:
+        """Update the local view and change feed with one record."""
+        # Records moved or folded by a compaction this view was reset to are not changes
+        recorded = change > self._changes.last_seq
+        if recorded and change != self._changes.last_seq + 1:
+            self._changes.restart(change - 1)
+        if kind == _CREATE:
+            contact_id, created_at, status, *values = payload
+            _, _, email, _, company, _ = values
+            self._seq_of[contact_id] = seq
+            self._id_of[seq] = contact_id
+            self._offset_of[seq] = offset
+            self._status_of[contact_id] = status
+            self._seqs.append(seq)
+            self._live_bytes += size
+            _index_add(self._email_index, normalize_key(email), seq)
+            _index_add(self._company_index, normalize_key(company), seq)
+            _index_add(self._status_index, status, seq)
+            self._status_counts[status] += 1
+            company_key = normalize_key(company)
+            if company_key is not None:
+                self._company_counts[company_key] += 1
+                self._company_spellings.setdefault(company_key, Counter())[company] += 1
+            self._created_per_minute[created_at[:16] + "Z"] += 1
+            if len(self._created_per_minute) > 2 * self.STATS_HISTORY_MINUTES:
+                for minute in sorted(self._created_per_minute)[:-self.STATS_HISTORY_MINUTES]:
+                    del self._created_per_minute[minute]
+            if recorded:
+                self._changes.record("create", contact_id, created_at, status=status, contact=contact_from_tuple(values))
+        elif kind == _STATUS:
+            status, at = payload
+            contact_id = self._id_of[seq]
+            old_status = self._status_of[contact_id]
+            self._status_of[contact_id] = status
+            self._status_changed.add(seq)
+            _index_discard(self._status_index, old_status, seq)
+            _index_add(self._status_index, status, seq)
+            _decrement(self._status_counts, old_status)
+            self._status_counts[status] += 1
+            if recorded:
+                self._changes.record("status", contact_id, at, status=status)
+        elif kind == _DELETE:
+            contact_id = self._id_of.pop(seq)
+            del self._seq_of[contact_id]
+            create_offset = self._offset_of.pop(seq)
+            status = self._status_of.pop(contact_id)
+            self._status_changed.discard(seq)
+            _, _, _, (_, created_at, _, _, _, email, _, company, _), next_offset = self._read(create_offset)
+            self._live_bytes -= next_offset - create_offset
+            _index_discard(self._email_index, normalize_key(email), seq)
+            _index_discard(self._company_index, normalize_key(company), seq)
+            _index_discard(self._status_index, status, seq)
+            _decrement(self._status_counts, status)
+            company_key = normalize_key(company)
+            if company_key is not None:
+                _decrement(self._company_counts, company_key)
+                _decrement(self._company_spellings[company_key], company)
+                if not self._company_spellings[company_key]:
+                    del self._company_spellings[company_key]
+            # Compaction drops the create records of deleted contacts, so they are not counted anywhere
+            if created_at[:16] + "Z" in self._created_per_minute:
+                _decrement(self._created_per_minute, created_at[:16] + "Z")
+            # Drop deleted sequence numbers once they make up half the list
+            if len(self._seqs) > 2 * len(self._id_of) + _FIRST_CHUNK:
+                self._seqs = list(self._id_of)
+            if recorded:
+                self._changes.record("delete", contact_id, payload[0])
+        else:
+            raise ValueError(f"Unknown record kind {kind} at offset {offset}")
+    
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Be the single writer: hold this process's lock and the exclusive file lock, with the view caught up."""
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._writer = True
+            try:
+                self._catch_up()
+                yield
+            finally:
+                self._writer = False
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    def _append(self, records: List[Tuple[int, int, List[Any]]]) -> int:
+        """
+        Append (kind, sequence number, payload) records after the committed end and publish them; the caller is the writer.
+        
+        Returns:
+            Offset of the first appended record
+        """
+        start, version, _ = self._header()
+        change = self._field(_NEXT_CHANGE_OFFSET)
+        data = b"".join(
+            _encode(kind, seq, change + number, payload) for number, (kind, seq, payload) in enumerate(records)
+        )
+        end = start + len(data)
+        if end > len(self._mm):
+            # Another worker may have grown the file already; never shrink it
+            size = os.fstat(self._fd).st_size
+            if end > size:
+                os.ftruncate(self._fd, max(2 * size, end))
+            self._remap(end)
+        self._mm[start:end] = data
+        self._set_field(_NEXT_CHANGE_OFFSET, change + len(records))
+        # Publishing the end offset makes the records visible; the version goes first so
+        # a reader that sees the new records also sees a version that covers them
+        struct.pack_into("<Q", self._mm, _VERSION_OFFSET, version + 1)
+        struct.pack_into("<Q", self._mm, _END_OFFSET, end)
+        self._catch_up()
+        return start
+    
+    def __len__(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return len(self._seq_of)
+    
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._header()[1]
+    
+    def insert(self, contacts: List[AcmeContact], created_at: str, status: str) -> List[str]:
+        with self._writing():
+            contact_ids = new_contact_ids(len(contacts), self._seq_of.__contains__)
+            next_seq = self._field(_NEXT_SEQ_OFFSET)
+            # Handed out before the records are published, so no reader sees a sequence number twice
+            self._set_field(_NEXT_SEQ_OFFSET, next_seq + len(contacts))
+            self._append([
+                (_CREATE, seq, [contact_id, created_at, status, *contact_to_tuple(contact)])
+                for seq, contact_id, contact in zip(range(next_seq, next_seq + len(contacts)), contact_ids, contacts)
+            ])
+        return contact_ids
+    
+    def _response(self, seq: int, contact_id: str) -> AcmeContactResponse:
+        """Build a stored contact from its create record and current status; the caller holds ``_lock``."""
+        _, created_at, _, *values = self._read(self._offset_of[seq])[3]
+        return AcmeContactResponse.model_construct(
+            acme_contact_id=contact_id,
+            acme_contact=contact_from_tuple(values),
+            acme_created_at=created_at,
+            acme_status=self._status_of[contact_id]
+        )
+    
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        def read() -> Optional[AcmeContactResponse]:
+            seq = self._seq_of.get(contact_id)
+            return self._response(seq, contact_id) if seq is not None else None
+        
+        with self._lock:
+            return self._stable(read)
+    
+    def iter_contacts(
+        self,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[int, AcmeContactResponse]]:
+        """
+        Lazily yield (sequence number, contact) pairs in insertion order, see AcmeService.iter_contacts.
+        
+        Contacts created after the iteration starts are not included; the
+        contacts are decoded in growing chunks, as in the in-memory backend.
+        """
+        with self._lock:
+            self._catch_up()
+            if email is not None or company is not None or status is not None:
+                seqs = self._find_seqs(email, company, status)
+            else:
+                seqs = list(self._seqs)
+        if after is not None:
+            seqs = seqs[bisect.bisect_right(seqs, after):]
+        
+        position = 0
+        chunk = _FIRST_CHUNK
+        while position < len(seqs):
+            def read() -> List[Tuple[int, AcmeContactResponse]]:
+                return [
+                    (seq, self._response(seq, self._id_of[seq]))
+                    for seq in seqs[position:position + chunk]
+                    # Skip contacts deleted, or moved out of the status filter, since the scan started
+                    if seq in self._id_of and (status is None or self._status_of[self._id_of[seq]] == status)
+                ]
+            
+            with self._lock:
+                contacts = self._stable(read)
+            yield from contacts
+            position += chunk
+            chunk = min(chunk * 2, _MAX_CHUNK)
+    
+    def _find_seqs(self, email: Optional[str], company: Optional[str], status: Optional[str]) -> List[int]:
+        """Intersect the secondary indexes for the given filters; the caller holds ``_lock``."""
+        candidates = []
+        if email is not None:
+            candidates.append(self._email_index.get(normalize_key(email), set()))
+        if company is not None:
+            candidates.append(self._company_index.get(normalize_key(company), set()))
+        if status is not None:
+            candidates.append(self._status_index.get(status, set()))
+        
+        # Intersect starting from the smallest set so the cost is bounded by the rarest key
+        candidates.sort(key=len)
+        return sorted(set(candidates[0]).intersection(*candidates[1:]))
+    
+    def set_status(self, contact_id: str, status: str) -> bool:
+        with self._writing():
+            seq = self._seq_of.get(contact_id)
+            if seq is None:
+                return False
+            self._append([(_STATUS, seq, [status, _now()])])
+            self._compact_when_wasteful()
+        return True
+    
+    def delete(self, contact_id: str) -> bool:
+        with self._writing():
+            seq = self._seq_of.get(contact_id)
+            if seq is None:
+                return False
+            self._append([(_DELETE, seq, [_now()])])
+            self._compact_when_wasteful()
+        return True
+    
+    def _wasteful(self) -> bool:
+        """Whether deleted contacts and old statuses take enough of the log to compact it; the caller is the writer."""
+        size = self._applied - _HEADER_SIZE
+        return size >= self.compact_min_size and size > COMPACT_RATIO * self._live_bytes
+    
+    def _compact_when_wasteful(self) -> None:
+        """Start a background compaction if the log is wasteful and none is running; the caller is the writer."""
+        if self._compactor is None and self._wasteful():
+            self._compactor = threading.Thread(target=self._compact_in_background, name="shared-log-compact", daemon=True)
+            self._compactor.start()
+    
+    def _compact_in_background(self) -> None:
+        with self._writing():
+            self._compactor = None
+            # Another worker may have compacted the log meanwhile
+            if self._wasteful():
+                self._compact()
+    
+    def compact(self) -> None:
+        """Rewrite the log without deleted contacts and superseded status records."""
+        with self._writing():
+            self._compact()
+    
+    def _compact(self) -> None:
+        """
+        Move the live contacts' create records to the front of the log; the caller is the writer.
+        
+        The create records keep their order and are followed by one status
+        record per contact whose status changed. The new log is never longer
+        than the old one at any point, so records are moved in place.
+        """
+        end, _, generation = self._header()
+        # A new generation first, so readers stop trusting offsets and wait for the moved records
+        self._set_field(_GENERATION_OFFSET, generation + 1)
+        write = _HEADER_SIZE
+        for seq in self._seqs:
+            offset = self._offset_of.get(seq)
+            if offset is None:
+                continue
+            size = _RECORD.size + _RECORD.unpack_from(self._mm, offset)[0]
+            if offset != write:
+                self._mm.move(write, offset, size)
+                self._offset_of[seq] = write
+            write += size
+        # Folded status records get change number 0, so views reset to the compacted log do not replay them
+        statuses = b"".join(
+            _encode(_STATUS, seq, 0, [self._status_of[self._id_of[seq]], ""]) for seq in sorted(self._status_changed)
+        )
+        compacted_to = write + len(statuses)
+        self._mm[write:compacted_to] = statuses
+        self._set_field(_COMPACTED_FROM_OFFSET, end)
+        self._set_field(_COMPACTED_TO_OFFSET, compacted_to)
+        self._set_field(_END_OFFSET, compacted_to)
+        self._applied = compacted_to
+        self._seqs = list(self._id_of)
+        self._generation = generation + 1
+        self._release(compacted_to)
+    
+    def _release(self, end: int) -> None:
+        """Hand the pages after the committed end back to tmpfs; the file keeps its size for other mappings."""
+        start = -(-end // mmap.PAGESIZE) * mmap.PAGESIZE
+        if hasattr(mmap, "MADV_REMOVE") and start < len(self._mm):
+            try:
+                self._mm.madvise(mmap.MADV_REMOVE, start, len(self._mm) - start)
+            except OSError:
+                # Not supported by the file system, e.g. a regular disk file
+                pass
+    
+    def stats(self, top_companies: int = 5) -> Dict[str, Any]:
+        with self._lock:
+            self._catch_up()
+            total = len(self._seq_of)
+            active = self._status_counts.get("active", 0)
+            minutes = sorted(self._created_per_minute)[-self.STATS_HISTORY_MINUTES:]
+            return {
+                "total_contacts": total,
+                "active_contacts": active,
+                "inactive_contacts": total - active,
+                "contacts_by_status": dict(self._status_counts),
+                "top_companies": company_leaderboard(self._company_counts, self._company_spellings.__getitem__, top_companies),
+                "created_per_minute": {minute: self._created_per_minute[minute] for minute in minutes}
+            }
+    
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._field(_CLEARS_OFFSET)
+    
+    def changes_since(self, seq: int, limit: int) -> Optional[List[ContactChange]]:
+        with self._lock:
+            self._catch_up()
+            return self._changes.since(seq, limit)
+    
+    @property
+    def change_cursor(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return self._changes.last_seq
+    
+    def clear(self) -> None:
+        with self._writing():
+            _, version, generation = self._header()
+            # A new generation first, so readers discard what they read from the old log
+            self._set_field(_GENERATION_OFFSET, generation + 1)
+            self._set_field(_CLEARS_OFFSET, self._field(_CLEARS_OFFSET) + 1)
+            self._set_field(_VERSION_OFFSET, version + 1)
+            self._set_field(_COMPACTED_FROM_OFFSET, 0)
+            self._set_field(_END_OFFSET, _HEADER_SIZE)
+            # Skip a change number, so that even a cursor at the latest change has to resync
+            change = self._field(_NEXT_CHANGE_OFFSET) + 1
+            self._set_field(_NEXT_CHANGE_OFFSET, change)
+            self._reset_view()
+            self._changes.restart(change - 1)
+            self._generation = generation + 1
+            self._release(_HEADER_SIZE)
+    
+    def close(self) -> None:
+        with self._lock:
+            if not self._mm.closed:
+                self._mm.close()
+                os.close(self._fd)
+
+
+def _now() -> str:
+    """Timestamp of a status update or delete, in the format AcmeService uses."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def _index_add(index: Dict[str, Set[int]], key: Optional[str], seq: int) -> None:
+    """Add a contact's sequence number under a key in a secondary index."""
+    if key is not None:
+        index.setdefault(key, set()).add(seq)
+
+
+def _index_discard(index: Dict[str, Set[int]], key: Optional[str], seq: int) -> None:
+    """Remove a contact's sequence number from a key in a secondary index, dropping empty keys."""
+    seqs = index.get(key)
+    if seqs is not None:
+        seqs.discard(seq)
+        if not seqs:
+            del index[key]
+
+
+def _decrement(counter: Counter, key: Optional[str]) -> None:
+    """Decrement a running counter, dropping keys that reach zero."""
+    if key is None:
+        return
+    counter[key] -= 1
+    if counter[key] <= 0:
+        del counter[key]
@@ -0,0 +1,325 @@
+"""SQLite storage backend for AcmeCRM contacts."""
+
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from models.acme_models import AcmeContact, AcmeContactResponse
+from services.contact_repository import ContactRepository, new_contact_ids, normalize_key
+from services.contact_store import contact_from_tuple, contact_to_tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    contact_id TEXT NOT NULL UNIQUE,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    phone TEXT,
+    company TEXT,
+    notes TEXT,
+    email_key TEXT NOT NULL,
+    company_key TEXT,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contacts_email_key ON contacts (email_key);
+CREATE INDEX IF NOT EXISTS contacts_company_key ON contacts (company_key);
+CREATE INDEX IF NOT EXISTS contacts_status ON contacts (status);
+CREATE INDEX IF NOT EXISTS contacts_created_at ON contacts (created_at);
+CREATE TABLE IF NOT EXISTS store_version (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    version INTEGER NOT NULL
+);
+"""
+
+# Contact counts per status, company and creation minute, kept current by triggers so stats()
+# reads a few small rows instead of grouping the whole contacts table on every request. Companies
+# are counted by company_key, as the company filter matches them, and per spelling for display
+_STATS_SCHEMA = (
+    "CREATE TABLE status_counts (status TEXT PRIMARY KEY, contacts INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE company_counts (company_key TEXT PRIMARY KEY, contacts INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE INDEX company_counts_contacts ON company_counts (contacts DESC, company_key)",
+    """CREATE TABLE company_spellings (
+    company_key TEXT NOT NULL,
+    company TEXT NOT NULL,
+    contacts INTEGER NOT NULL,
+    PRIMARY KEY (company_key, company)
+) WITHOUT ROWID""",
+    "CREATE TABLE minute_counts (minute TEXT PRIMARY KEY, contacts INTEGER NOT NULL) WITHOUT ROWID",
+    """CREATE TRIGGER contacts_counted AFTER INSERT ON contacts BEGIN
+    INSERT INTO status_counts VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET contacts = contacts + 1;
+    INSERT INTO company_counts SELECT NEW.company_key, 1 WHERE NEW.company_key IS NOT NULL
+        ON CONFLICT (company_key) DO UPDATE SET contacts = contacts + 1;
+    INSERT INTO company_spellings SELECT NEW.company_key, NEW.company, 1 WHERE NEW.company_key IS NOT NULL
+        ON CONFLICT (company_key, company) DO UPDATE SET contacts = contacts + 1;
+    INSERT INTO minute_counts VALUES (substr(NEW.created_at, 1, 16) || 'Z', 1)
+        ON CONFLICT (minute) DO UPDATE SET contacts = contacts + 1;
+END""",
+    """CREATE TRIGGER contacts_uncounted AFTER DELETE ON contacts BEGIN
+    UPDATE status_counts SET contacts = contacts - 1 WHERE status = OLD.status;
+    UPDATE company_counts SET contacts = contacts - 1 WHERE company_key = OLD.company_key;
+    DELETE FROM company_counts WHERE company_key = OLD.company_key AND contacts = 0;
+    UPDATE company_spellings SET contacts = contacts - 1 WHERE company_key = OLD.company_key AND company = OLD.company;
+    DELETE FROM company_spellings WHERE company_key = OLD.company_key AND company = OLD.company AND contacts = 0;
+    UPDATE minute_counts SET contacts = contacts - 1 WHERE minute = substr(OLD.created_at, 1, 16) || 'Z';
+    DELETE FROM minute_counts WHERE minute = substr(OLD.created_at, 1, 16) || 'Z' AND contacts = 0;
+END""",
+    """CREATE TRIGGER contacts_recounted AFTER UPDATE OF status ON contacts WHEN OLD.status != NEW.status BEGIN
+    UPDATE status_counts SET contacts = contacts - 1 WHERE status = OLD.status;
+    INSERT INTO status_counts VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET contacts = contacts + 1;
+END""",
+    "INSERT INTO status_counts SELECT status, COUNT(*) FROM contacts GROUP BY status",
+    "INSERT INTO company_counts SELECT company_key, COUNT(*) FROM contacts WHERE company_key IS NOT NULL GROUP BY company_key",
+    """INSERT INTO company_spellings SELECT company_key, company, COUNT(*) FROM contacts
+    WHERE company_key IS NOT NULL GROUP BY company_key, company""",
+    "INSERT INTO minute_counts SELECT substr(created_at, 1, 16) || 'Z', COUNT(*) FROM contacts GROUP BY 1"
+)
+
+# Count tables of the current layout; when any is missing, the count tables and triggers of
+# earlier layouts are dropped and the current ones created and backfilled
+_STATS_TABLES = ("status_counts", "company_counts", "company_spellings", "minute_counts")
+_OLD_STATS_SCHEMA = (
+    "DROP TRIGGER IF EXISTS contacts_counted",
+    "DROP TRIGGER IF EXISTS contacts_uncounted",
+    "DROP TRIGGER IF EXISTS contacts_recounted",
+    *(f"DROP TABLE IF EXISTS {table}" for table in _STATS_TABLES)
+)
+
+# Statements are kept as constants so sqlite3's per-connection statement cache
+# compiles each of them once and reuses the prepared statement afterwards.
+# Contact columns follow CONTACT_FIELDS order so rows convert with contact_from_tuple
+_CONTACT_COLUMNS = "seq, contact_id, first_name, last_name, email, phone, company, notes, created_at, status"
+_INSERT = (
+    "INSERT INTO contacts (contact_id, first_name, last_name, email, phone, company, notes,"
+    " email_key, company_key, created_at, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_BY_ID = f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE contact_id = ?"
+_UPDATE_STATUS = "UPDATE contacts SET status = ? WHERE contact_id = ?"
+_DELETE = "DELETE FROM contacts WHERE contact_id = ?"
+_COUNT = "SELECT COALESCE(SUM(contacts), 0) FROM status_counts"
+_VERSION = "SELECT version FROM store_version WHERE id = 0"
+_BUMP_VERSION = "UPDATE store_version SET version = version + 1 WHERE id = 0"
+_COUNT_BY_STATUS = "SELECT status, contacts FROM status_counts WHERE contacts > 0"
+# Like company_leaderboard: the most common spelling of each company, ties by normalized name and spelling
+_TOP_COMPANIES = (
+    "SELECT (SELECT company FROM company_spellings AS spellings WHERE spellings.company_key = counts.company_key"
+    " ORDER BY spellings.contacts DESC, spellings.company LIMIT 1), contacts"
+    " FROM company_counts AS counts ORDER BY contacts DESC, company_key LIMIT ?"
+)
+_CREATED_PER_MINUTE = (
+    "SELECT minute, contacts FROM (SELECT minute, contacts FROM minute_counts ORDER BY minute DESC LIMIT ?)"
+    " ORDER BY minute"
+)
+
+# Contacts fetched per query while iterating, so no connection is held across a long stream;
+# the first query is small because most callers only want one API page
+_FIRST_FETCH = 128
+_MAX_FETCH = 2048
+
+
+def _to_response(row: Tuple[Any, ...]) -> Tuple[int, AcmeContactResponse]:
+    """Build a (sequence number, contact) pair from a row selected with _CONTACT_COLUMNS."""
+    seq, contact_id, *values, created_at, status = row
+    return seq, AcmeContactResponse.model_construct(
+        acme_contact_id=contact_id,
+        acme_contact=contact_from_tuple(values),
+        acme_created_at=created_at,
+        acme_status=status
+    )
+
+
+class SQLiteContactRepository(ContactRepository):
+    """
+    Contacts kept in a SQLite database in WAL mode.
+    
+    Connections come from a small pool so concurrent requests do not share a
+    cursor; with WAL, readers never block the single writer. Lookups by email,
+    company and status go through SQL indexes, and stats are read from count
+    tables that triggers update with every write. Sequence numbers are the table's AUTOINCREMENT row IDs,
+    so they are never reused after a delete.
+    """
+    
+    def __init__(self, path: str, pool_size: int = 8, timeout: float = 30.0) -> None:
+        """
+        Open (or create) a contact database.
+        
+        Args:
+            path: Database file path
+            pool_size: Number of pooled connections
+            timeout: Seconds to wait for a lock or a free pooled connection
+        """
+        self.path = path
+        self.timeout = timeout
+        self._pool: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        # Every connection, pooled or borrowed, so close() reaches all of them
+        self._connections = [self._connect() for _ in range(pool_size)]
+        for conn in self._connections:
+            self._pool.put(conn)
+        
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            # Seeded from the clock so a recreated database never reuses an old version
+            conn.execute("INSERT OR IGNORE INTO store_version (id, version) VALUES (0, ?)", (time.time_ns(),))
+            with self._transaction_on(conn):
+                # Databases created before the current count tables existed are counted once, here
+                tables = conn.execute(
+                    f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({', '.join('?' * len(_STATS_TABLES))})",
+                    _STATS_TABLES
+                ).fetchone()[0]
+                if tables < len(_STATS_TABLES):
+                    for statement in _OLD_STATS_SCHEMA + _STATS_SCHEMA:
+                        conn.execute(statement)
+    
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=64
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        # With WAL, NORMAL only fsyncs at checkpoints; a commit survives a process crash but not power loss
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for the duration of the block."""
+        try:
+            conn = self._pool.get(timeout=self.timeout)
+        except queue.Empty:
+            raise RuntimeError("Timed out waiting for a SQLite connection")
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    @staticmethod
+    @contextmanager
+    def _transaction_on(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        """Run the block inside a write transaction on the given connection."""
+        # IMMEDIATE takes the write lock up front instead of failing on upgrade from a read lock
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            changes = conn.total_changes
+            yield conn
+            # Every write transaction that changed a row bumps the version, whichever process commits it
+            if conn.total_changes != changes:
+                conn.execute(_BUMP_VERSION)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection inside a write transaction."""
+        with self._connection() as conn, self._transaction_on(conn) as conn:
+            yield conn
+    
+    def __len__(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(_COUNT).fetchone()[0]
+    
+    @property
+    def version(self) -> int:
+        with self._connection() as conn:
+            return conn.execute(_VERSION).fetchone()[0]
+    
+    def insert(self, contacts: List[AcmeContact], created_at: str, status: str) -> List[str]:
+        with self._transaction() as conn:
+            def in_use(contact_id: str) -> bool:
+                return conn.execute("SELECT 1 FROM contacts WHERE contact_id = ?", (contact_id,)).fetchone() is not None
+            
+            contact_ids = new_contact_ids(len(contacts), in_use)
+            conn.executemany(_INSERT, [
+                (contact_id, *contact_to_tuple(contact), normalize_key(contact.acme_email),
+                 normalize_key(contact.acme_company_name), created_at, status)
+                for contact_id, contact in zip(contact_ids, contacts)
+            ])
+        return contact_ids
+    
+    def get(self, contact_id: str) -> Optional[AcmeContactResponse]:
+        with self._connection() as conn:
+            row = conn.execute(_SELECT_BY_ID, (contact_id,)).fetchone()
+        return _to_response(row)[1] if row is not None else None
+    
+    def iter_contacts(
+        self,
+        after: Optional[int] = None,
+        email: Optional[str] = None,
+        company: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Iterator[Tuple[int, AcmeContactResponse]]:
+        conditions = ["seq > ?"]
+        params: List[Any] = []
+        if email is not None:
+            conditions.append("email_key = ?")
+            params.append(normalize_key(email))
+        if company is not None:
+            conditions.append("company_key = ?")
+            params.append(normalize_key(company))
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        sql = f"SELECT {_CONTACT_COLUMNS} FROM contacts WHERE {' AND '.join(conditions)} ORDER BY seq LIMIT ?"
+        
+        # Keyset pagination on seq keeps every query an index range scan, however deep the iteration goes
+        seq = -1 if after is None else after
+        fetch = _FIRST_FETCH
+        while True:
+            with self._connection() as conn:
+                rows = conn.execute(sql, (seq, *params, fetch)).fetchall()
+            for row in rows:
+                seq, contact = _to_response(row)
+                yield seq, contact
+            if len(rows) < fetch:
+                return
+            fetch = min(fetch * 2, _MAX_FETCH)
+    
+    def set_status(self, contact_id: str, status: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(_UPDATE_STATUS, (status, contact_id)).rowcount > 0
+    
+    def delete(self, contact_id: str) -> bool:
+        with self._transaction() as conn:
+            return conn.execute(_DELETE, (contact_id,)).rowcount > 0
+    
+    def stats(self, top_companies: int = 5) -> Dict[str, Any]:
+        with self._connection() as conn:
+            # One read transaction so all figures come from the same snapshot
+            conn.execute("BEGIN")
+            try:
+                by_status = dict(conn.execute(_COUNT_BY_STATUS).fetchall())
+                companies = conn.execute(_TOP_COMPANIES, (top_companies,)).fetchall()
+                per_minute = dict(conn.execute(_CREATED_PER_MINUTE, (self.STATS_HISTORY_MINUTES,)).fetchall())
+            finally:
+                conn.execute("COMMIT")
+        
+        total = sum(by_status.values())
+        active = by_status.get("active", 0)
+        return {
+            "total_contacts": total,
+            "active_contacts": active,
+            "inactive_contacts": total - active,
+            "contacts_by_status": by_status,
+            "top_companies": [{"company": company, "contacts": count} for company, count in companies],
+            "created_per_minute": per_minute
+        }
+    
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM contacts")
+    
+    def close(self) -> None:
+        # Borrowed connections are closed too; a request still using one fails instead of leaking it
+        for conn in self._connections:
+            conn.close()
+        self._connections = []
+
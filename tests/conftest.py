@@ -0,0 +1,41 @@
+"""Shared fixtures: every test starts from an empty in-memory AcmeService."""
+
+from typing import Iterator, Optional
+import pytest
+from fastapi.testclient import TestClient
+from models.acme_models import AcmeContact
+from services.acme_service import AcmeService
+from services.contact_repository import InMemoryContactRepository
+
+
+def make_contact(
+    first: str = "Ada",
+    last: str = "Lovelace",
+    email: Optional[str] = None,
+    company: Optional[str] = "Analytical Engines",
+    notes: Optional[str] = None
+) -> AcmeContact:
+    """Build a valid contact, with an email derived from the name unless one is given."""
+    return AcmeContact(
+        acme_first_name=first,
+        acme_last_name=last,
+        acme_email=email or f"{first}.{last}@example.com".lower().replace(" ", ""),
+        acme_company_name=company,
+        acme_notes=notes
+    )
+
+
+@pytest.fixture
+def service() -> Iterator[type]:
+    """AcmeService over a fresh in-memory repository, closed again after the test."""
+    AcmeService.use_repository(InMemoryContactRepository())
+    yield AcmeService
+    AcmeService.disable_persistence()
+    AcmeService.use_repository(InMemoryContactRepository())
+
+
+@pytest.fixture
+def client(service: type) -> TestClient:
+    """HTTP client for the API, authenticated with the demo token."""
+    from main import app
+    return TestClient(app, headers={"Authorization": "Bearer linq-demo-token"})
@@ -0,0 +1,138 @@
+"""Change feed cursors and resync semantics, in the feed itself and through GET /contacts/changes."""
+
+import asyncio
+import main
+from services.change_feed import ChangeFeed
+from tests.conftest import make_contact
+
+
+def test_since_returns_changes_after_the_cursor_in_order():
+    feed = ChangeFeed(capacity=10)
+    start = feed.last_seq
+    recorded = [feed.record("create", f"acme_{i:08x}", "2025-07-25T16:38:00Z", status="active") for i in range(5)]
+    
+    assert [change.seq for change in recorded] == list(range(start + 1, start + 6))
+    assert feed.since(start, 100) == recorded
+    assert feed.since(recorded[2].seq, 100) == recorded[3:]
+    assert feed.since(start, 2) == recorded[:2]
+    # A cursor at the latest change is up to date, not aged out
+    assert feed.since(feed.last_seq, 100) == []
+
+
+def test_aged_out_and_unknown_cursors_require_resync():
+    feed = ChangeFeed(capacity=3)
+    start = feed.last_seq
+    for i in range(5):
+        feed.record("create", f"acme_{i:08x}", "2025-07-25T16:38:00Z")
+    
+    assert feed.since(start, 100) is None
+    assert feed.since(start + 1, 100) is None
+    assert [change.contact_id for change in feed.since(start + 2, 100)] == ["acme_00000002", "acme_00000003", "acme_00000004"]
+    assert feed.since(feed.last_seq + 1, 100) is None
+
+
+def test_reset_makes_every_cursor_resync():
+    feed = ChangeFeed(capacity=10)
+    feed.record("create", "acme_00000001", "2025-07-25T16:38:00Z")
+    cursor = feed.last_seq
+    feed.reset()
+    
+    assert feed.since(cursor, 100) is None
+    feed.record("create", "acme_00000002", "2025-07-25T16:38:00Z")
+    assert feed.since(cursor, 100) is None
+
+
+def test_cursors_from_a_previous_run_require_resync():
+    previous = ChangeFeed()
+    previous.record("create", "acme_00000001", "2025-07-25T16:38:00Z")
+    
+    assert ChangeFeed().since(previous.last_seq, 100) is None
+
+
+def test_service_records_creates_status_updates_and_deletes(service):
+    cursor = service.get_change_cursor()
+    created = service.create_contact(make_contact())
+    service.update_contact_status(created.acme_contact_id, "inactive")
+    service.delete_contact(created.acme_contact_id)
+    # Writes that change nothing are not recorded
+    service.delete_contact(created.acme_contact_id)
+    
+    changes = service.get_changes(cursor, 100)
+    assert [(change.op, change.contact_id, change.status) for change in changes] == [
+        ("create", created.acme_contact_id, "active"),
+        ("status", created.acme_contact_id, "inactive"),
+        ("delete", created.acme_contact_id, None)
+    ]
+    assert changes[0].contact.acme_email == "ada.lovelace@example.com"
+    assert changes[-1].seq == service.get_change_cursor()
+
+
+def test_clearing_storage_requires_resync(service):
+    service.create_contact(make_contact())
+    cursor = service.get_change_cursor()
+    service.clear_storage()
+    
+    assert service.get_changes(cursor, 100) is None
+
+
+def test_endpoint_without_cursor_starts_with_resync(client):
+    body = client.get("/contacts/changes").json()
+    
+    assert body["resync_required"] is True
+    assert body["changes"] == []
+    # The cursor is taken before the full reload, so changes made during it are not missed
+    client.post("/contacts", json={"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"})
+    body = client.get("/contacts/changes", params={"since": body["next_since"]}).json()
+    assert body["resync_required"] is False
+    assert [(change["op"], change["contact"]["email"]) for change in body["changes"]] == [("create", "ada@example.com")]
+
+
+def test_endpoint_pages_with_next_since_and_has_more(client):
+    since = client.get("/contacts/changes").json()["next_since"]
+    for i in range(5):
+        client.post("/contacts", json={"firstName": f"First{i}", "lastName": "Last", "email": f"user{i}@example.com"})
+    
+    seen = []
+    while True:
+        body = client.get("/contacts/changes", params={"since": since, "limit": 2}).json()
+        seen += [change["contact"]["firstName"] for change in body["changes"]]
+        since = body["next_since"]
+        if not body["has_more"]:
+            break
+    assert seen == [f"First{i}" for i in range(5)]
+    # Caught up: the same cursor comes back with no changes
+    body = client.get("/contacts/changes", params={"since": since}).json()
+    assert body == {"resync_required": False, "changes": [], "next_since": since, "has_more": False}
+
+
+def test_endpoint_with_aged_out_cursor_requires_resync(client, service):
+    client.post("/contacts", json={"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"})
+    since = service.get_change_cursor()
+    service.clear_storage()
+    
+    body = client.get("/contacts/changes", params={"since": since}).json()
+    assert body["resync_required"] is True
+    assert body["next_since"] == service.get_change_cursor()
+
+
+def test_live_events_resync_when_the_feed_was_reset(service):
+    async def collect():
+        service.add_change_listener(main._publish_changes)
+        events = main._change_events(None)
+        try:
+            pending = asyncio.ensure_future(events.__anext__())
+            # Let the stream subscribe before anything is written
+            await asyncio.sleep(0)
+            service.create_contact(make_contact(first="Before"))
+            first = await pending
+            service.clear_storage()
+            service.create_contact(make_contact(first="After"))
+            return first, await events.__anext__()
+        finally:
+            await events.aclose()
+            service.remove_change_listener(main._publish_changes)
+    
+    first, second = asyncio.run(collect())
+    
+    assert first[0] == "changes"
+    assert second == ("resync", service.get_change_cursor(), b"[]")
@@ -0,0 +1,172 @@
+"""Streaming CSV / NDJSON import and export, and their round trip."""
+
+import asyncio
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, List, Optional
+import pytest
+from models.linq_models import LinqImportResponse
+from services import contact_transfer
+from services.contact_transfer import _RecordDecoder, export_columns, export_contacts, import_contacts
+from tests.conftest import make_contact
+
+LINQ_FIELDS = ["firstName", "lastName", "email", "phone", "company", "notes"]
+
+
+def run_import(data: bytes, content_type: str, format: Optional[str] = None, chunk_size: int = 7) -> LinqImportResponse:
+    """Import an upload delivered in small chunks, so records are split across them."""
+    async def chunks() -> AsyncIterator[bytes]:
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+    
+    return asyncio.run(import_contacts(chunks(), content_type, format, batch_size=2))
+
+
+def export(format: str, **filters: Optional[str]) -> bytes:
+    return b"".join(export_contacts(format, {"email": None, "company": None, "status": None, **filters}))
+
+
+def linq_contacts(service) -> List[Dict[str, Optional[str]]]:
+    """Stored contacts as Linq field dictionaries, in insertion order."""
+    return [
+        {field: getattr(service.get_linq_projection(contact)[0], field) for field in LINQ_FIELDS}
+        for _, contact in service.iter_contacts()
+    ]
+
+
+def seed(service) -> None:
+    service.create_contacts([
+        make_contact(first="Ada", last="Lovelace", notes='Said "hello",\nthen left'),
+        make_contact(first="Grace", last="Hopper", company=None),
+        make_contact(first="Zoë", last="Ørsted", company="Café, Inc.")
+    ])
+
+
+@pytest.mark.parametrize("format", ["csv", "ndjson"])
+def test_export_then_import_recreates_the_contacts(service, format):
+    seed(service)
+    original = linq_contacts(service)
+    data = export(format)
+    service.clear_storage()
+    
+    result = run_import(data, "text/csv" if format == "csv" else "application/x-ndjson")
+    
+    assert (result.success, result.total, result.created, result.failed) == (True, 3, 3, 0)
+    assert linq_contacts(service) == original
+
+
+@pytest.mark.parametrize("format", ["csv", "ndjson"])
+def test_import_creates_new_active_contacts(service, format):
+    seed(service)
+    exported_id = next(service.iter_contacts())[1].acme_contact_id
+    service.update_contact_status(exported_id, "inactive")
+    data = export(format)
+    
+    run_import(data, "application/octet-stream", format)
+    
+    # Exported IDs and statuses are not kept: importing into the same store adds copies
+    contacts = [contact for _, contact in service.iter_contacts()]
+    assert len(contacts) == 6
+    assert [contact.acme_status for contact in contacts[3:]] == ["active"] * 3
+    assert exported_id not in [contact.acme_contact_id for contact in contacts[3:]]
+
+
+def test_csv_export_layout(service):
+    seed(service)
+    rows = list(csv.reader(io.StringIO(export("csv").decode())))
+    
+    assert rows[0] == export_columns() == ["contact_id", *LINQ_FIELDS, "status", "created_at"]
+    assert rows[1][1:3] == ["Ada", "Lovelace"]
+    assert rows[1][6] == 'Said "hello",\nthen left'
+    assert rows[2][5] == ""
+    assert len(rows) == 4
+
+
+def test_ndjson_export_filters(service):
+    seed(service)
+    records = [json.loads(line) for line in export("ndjson", company="café, inc.").splitlines()]
+    
+    assert [record["firstName"] for record in records] == ["Zoë"]
+    assert set(records[0]) == {"contact_id", *LINQ_FIELDS, "status", "created_at"}
+
+
+def test_invalid_records_are_reported_without_stopping_the_import(service):
+    data = (
+        b'{"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"}\n'
+        b'{"firstName": "Bad", "lastName": "Email", "email": "not-an-email"}\n'
+        b'{not json}\n'
+        b'\n'
+        b'{"firstName": "Grace", "lastName": "Hopper", "email": "grace@example.com"}'
+    )
+    result = run_import(data, "application/x-ndjson")
+    
+    assert (result.success, result.total, result.created, result.failed) == (False, 4, 2, 2)
+    assert [error.index for error in result.errors] == [1, 2]
+    assert "Malformed JSON" in result.errors[1].error
+    assert [contact["firstName"] for contact in linq_contacts(service)] == ["Ada", "Grace"]
+
+
+def test_errors_stay_in_upload_order_and_keep_the_earliest(service, monkeypatch):
+    monkeypatch.setattr(contact_transfer, "MAX_REPORTED_ERRORS", 2)
+    data = (
+        b'{"firstName": "Bad", "lastName": "Email", "email": "not-an-email"}\n'
+        b'{not json}\n'
+        b'{"firstName": "Worse", "lastName": "Email", "email": "still-not-an-email"}\n'
+        b'{not json either}\n'
+    )
+    result = run_import(data, "application/x-ndjson")
+    
+    # Malformed lines are rejected as they are read, invalid ones only when their batch is stored
+    assert result.failed == 4
+    assert [error.index for error in result.errors] == [0, 1]
+    assert result.errors_truncated
+
+
+def test_csv_with_byte_order_mark_and_crlf(service):
+    data = b"\xef\xbb\xbffirstName,lastName,email\r\nAda,Lovelace,ada@example.com\r\n"
+    result = run_import(data, "text/csv")
+    
+    assert (result.created, result.failed) == (1, 0)
+    assert linq_contacts(service)[0]["firstName"] == "Ada"
+
+
+def test_multipart_upload(service):
+    boundary = "----boundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="note"\r\n\r\n'
+        "ignored\r\n"
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="contacts.csv"\r\n'
+        "Content-Type: text/csv\r\n\r\n"
+        "firstName,lastName,email\nAda,Lovelace,ada@example.com\nGrace,Hopper,grace@example.com\n\r\n"
+        f"--{boundary}--\r\n"
+    ).encode()
+    result = run_import(body, f"multipart/form-data; boundary={boundary}")
+    
+    assert (result.created, result.failed) == (2, 0)
+
+
+def test_unknown_format_is_rejected(service):
+    with pytest.raises(ValueError):
+        run_import(b"firstName\nAda\n", "application/octet-stream")
+
+
+def test_record_decoder_is_abstract():
+    with pytest.raises(TypeError):
+        _RecordDecoder()
+
+
+def test_endpoints_round_trip(client, service):
+    seed(service)
+    original = linq_contacts(service)
+    exported = client.get("/contacts/export", params={"format": "ndjson"})
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+    service.clear_storage()
+    
+    response = client.post("/contacts/import", content=exported.content, headers={"Content-Type": "application/x-ndjson"})
+    
+    assert response.status_code == 200
+    assert response.json()["created"] == 3
+    assert linq_contacts(service) == original
@@ -0,0 +1,112 @@
+"""Cursor paging, NDJSON streaming and conditional GET through the HTTP API."""
+
+import json
+from typing import List
+import pytest
+from tests.conftest import make_contact
+
+
+def create(client, count: int) -> None:
+    for i in range(count):
+        response = client.post("/contacts", json={"firstName": f"First{i}", "lastName": "Last", "email": f"user{i}@example.com"})
+        assert response.status_code == 200
+
+
+def first_names(contacts: List[dict]) -> List[str]:
+    return [contact["firstName"] for contact in contacts]
+
+
+def test_pages_follow_the_next_cursor(client):
+    create(client, 5)
+    
+    pages = []
+    response = client.get("/contacts", params={"limit": 2})
+    while True:
+        assert response.status_code == 200
+        pages.append(first_names(response.json()))
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        response = client.get("/contacts", params={"limit": 2, "after": cursor})
+    
+    assert pages == [["First0", "First1"], ["First2", "First3"], ["First4"]]
+
+
+def test_cursor_survives_deletes(client, service):
+    stored = service.create_contacts([make_contact(f"First{i}", "Last") for i in range(5)])
+    response = client.get("/contacts", params={"limit": 2})
+    cursor = response.headers["X-Next-Cursor"]
+    
+    # Deleting the last contact seen and the next one does not shift or repeat the following page
+    service.delete_contact(stored[1].acme_contact_id)
+    service.delete_contact(stored[2].acme_contact_id)
+    response = client.get("/contacts", params={"limit": 2, "after": cursor})
+    
+    assert first_names(response.json()) == ["First3", "First4"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "!!!", "eDox"])
+def test_invalid_cursor_is_rejected(client, cursor):
+    response = client.get("/contacts", params={"after": cursor})
+    
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+
+
+def test_ndjson_streams_one_contact_per_line(client):
+    create(client, 3)
+    
+    response = client.get("/contacts", params={"format": "ndjson"})
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "X-Next-Cursor" not in response.headers
+    lines = response.text.splitlines()
+    assert first_names([json.loads(line) for line in lines]) == ["First0", "First1", "First2"]
+    assert response.text.endswith("\n")
+    
+    # A limit and cursor apply to streams too
+    cursor = client.get("/contacts", params={"limit": 1}).headers["X-Next-Cursor"]
+    response = client.get("/contacts", params={"format": "ndjson", "limit": 1, "after": cursor})
+    assert first_names([json.loads(line) for line in response.text.splitlines()]) == ["First1"]
+
+
+@pytest.mark.parametrize("path", ["/contacts", "/contacts/stats", "/mapping/schema"])
+def test_matching_if_none_match_gets_304(client, path):
+    create(client, 1)
+    etag = client.get(path).headers["ETag"]
+    opaque = etag.removeprefix("W/")
+    
+    # Weak comparison: the tag matches with or without W/, on its own or in a list
+    for header in [opaque, f"W/{opaque}", f'"other", W/{opaque}', f'W/"other",{opaque}', "*"]:
+        response = client.get(path, headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    
+    assert client.get(path, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_writes_change_the_etag(client):
+    create(client, 1)
+    etag = client.get("/contacts").headers["ETag"]
+    stats_etag = client.get("/contacts/stats").headers["ETag"]
+    
+    create(client, 1)
+    
+    response = client.get("/contacts", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == 2
+    assert client.get("/contacts/stats", headers={"If-None-Match": stats_etag}).status_code == 200
+
+
+def test_etag_depends_on_the_request_parameters(client):
+    create(client, 3)
+    etag = client.get("/contacts").headers["ETag"]
+    
+    for params in [{"limit": 1}, {"format": "ndjson"}, {"company": "Acme"}]:
+        response = client.get("/contacts", params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200, params
+        assert response.headers["ETag"] != etag
@@ -0,0 +1,142 @@
+"""Idempotent email upserts and fuzzy duplicate detection on create."""
+
+import threading
+import pytest
+import services.duplicate_index as duplicate_index
+from services.duplicate_index import BloomFilter, DuplicateIndex, block_key, similar_first_names
+from tests.conftest import make_contact
+
+
+def test_upsert_is_idempotent_per_email(service):
+    first, created = service.upsert_contact(make_contact(email="Ada@Example.com"))
+    again, created_again = service.upsert_contact(make_contact(first="Augusta", email=" ada@example.COM "))
+    
+    assert created is True and created_again is False
+    assert again.acme_contact_id == first.acme_contact_id
+    # The stored contact is returned unchanged
+    assert again.acme_contact.acme_first_name == "Ada"
+    assert service.get_contact_count() == 1
+
+
+def test_upsert_after_delete_creates_again(service):
+    first, _ = service.upsert_contact(make_contact())
+    service.delete_contact(first.acme_contact_id)
+    
+    second, created = service.upsert_contact(make_contact())
+    
+    assert created is True
+    assert second.acme_contact_id != first.acme_contact_id
+
+
+def test_upsert_finds_contacts_stored_by_plain_creates(service):
+    stored = service.create_contacts([make_contact(email=f"user{i}@example.com") for i in range(3)])
+    
+    found, created = service.upsert_contact(make_contact(email="USER1@example.com"))
+    
+    assert created is False
+    assert found.acme_contact_id == stored[1].acme_contact_id
+
+
+def test_concurrent_upserts_create_one_contact(service):
+    results = []
+    
+    def upsert() -> None:
+        results.append(service.upsert_contact(make_contact(email="race@example.com")))
+    
+    threads = [threading.Thread(target=upsert) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert [created for _, created in results].count(True) == 1
+    assert len({contact.acme_contact_id for contact, _ in results}) == 1
+    assert service.get_contact_count() == 1
+
+
+@pytest.mark.parametrize("first, last, company", [
+    ("Jon", "Smith", "Acme"),
+    ("J.", "Smith", "ACME, Inc."),
+    ("Jhon", "smith", "acme corp"),
+    ("Jöhn", "Smith", "Acme"),
+    ("John", "Smith", "Acme")
+])
+def test_similar_contacts_at_the_same_company_are_reported(service, first, last, company):
+    existing = service.create_contact(make_contact(first="John", last="Smith", company="Acme Inc"))
+    
+    assert service.find_duplicates(make_contact(first=first, last=last, company=company, email="new@example.com")) == [
+        existing.acme_contact_id
+    ]
+
+
+@pytest.mark.parametrize("first, last, company", [
+    ("Mary", "Smith", "Acme"),
+    ("John", "Smyth-Jones", "Acme"),
+    ("John", "Smith", "Globex"),
+    ("John", "Smith", None)
+])
+def test_different_people_are_not_reported(service, first, last, company):
+    service.create_contact(make_contact(first="John", last="Smith", company="Acme Inc"))
+    
+    assert service.find_duplicates(make_contact(first=first, last=last, company=company)) == []
+
+
+def test_deleted_contacts_are_not_reported(service):
+    kept, deleted = service.create_contacts([
+        make_contact(first="John", last="Smith", company="Acme", email="john1@example.com"),
+        make_contact(first="Jon", last="Smith", company="Acme", email="john2@example.com")
+    ])
+    service.delete_contact(deleted.acme_contact_id)
+    
+    assert service.find_duplicates(make_contact(first="John", last="Smith", company="Acme")) == [kept.acme_contact_id]
+
+
+def test_create_endpoint_reports_duplicates_and_upserts(client):
+    payload = {"firstName": "John", "lastName": "Smith", "email": "john@example.com", "company": "Acme"}
+    first = client.post("/contacts", json=payload).json()
+    assert first["created"] is True and first["possible_duplicates"] == []
+    
+    similar = client.post("/contacts", json={**payload, "firstName": "Jon", "email": "jon@example.com"}).json()
+    assert similar["possible_duplicates"] == [first["contact_id"]]
+    
+    repeated = client.post("/contacts", params={"upsert": "true"}, json={**payload, "email": "JOHN@example.com"}).json()
+    assert repeated["created"] is False
+    assert repeated["contact_id"] == first["contact_id"]
+
+
+def test_block_key_ignores_case_accents_punctuation_and_legal_suffixes():
+    assert block_key(make_contact(last="O'Brien", company="Café Ltd.")) == block_key(make_contact(last="obrien", company="CAFE"))
+    assert block_key(make_contact(company=None)) is None
+
+
+def test_similar_first_names():
+    assert similar_first_names("j", "john")
+    assert similar_first_names("jon", "jonathan")
+    assert similar_first_names("jhon", "john")
+    assert not similar_first_names("jo", "john")
+    assert not similar_first_names("mary", "john")
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"key{i}")
+    
+    assert all(f"key{i}" in bloom for i in range(10_000))
+    assert sum(f"other{i}" in bloom for i in range(10_000)) < 300
+
+
+def test_index_is_sized_from_the_repository_and_grows_in_the_background(service, monkeypatch):
+    monkeypatch.setattr(duplicate_index, "BLOOM_INITIAL_CAPACITY", 64)
+    service.create_contacts([make_contact(first=f"F{i}", email=f"user{i}@example.com") for i in range(100)])
+    index = DuplicateIndex()
+    
+    index.sync(service._repository)
+    assert index._bloom.capacity * duplicate_index.BLOOM_GROW_AT >= 4 * 100
+    
+    capacity = index._bloom.capacity
+    service.create_contacts([make_contact(first=f"F{i}", email=f"user{i}@example.com") for i in range(100, 400)])
+    assert index.may_have_email(service._repository, "user399@example.com")
+    index._grower.join()
+    assert index._bloom.capacity == 2 * capacity
+    assert all(index.may_have_email(service._repository, f"user{i}@example.com") for i in range(400))
@@ -0,0 +1,101 @@
+"""Journal recovery and replay of the in-memory repository."""
+
+import glob
+import os
+from typing import List, Tuple
+from services.acme_service import AcmeService
+from services.contact_repository import InMemoryContactRepository
+from tests.conftest import make_contact
+
+
+def restart(directory: str) -> None:
+    """Drop the in-memory contacts and restore them from the journal, as a process restart would."""
+    AcmeService.use_repository(InMemoryContactRepository())
+    AcmeService.enable_persistence(directory, sync_commit=True)
+
+
+def snapshot_of_store() -> List[Tuple]:
+    """Every stored contact with its sequence number, status and data."""
+    return [
+        (seq, contact.acme_contact_id, contact.acme_status, contact.acme_created_at, contact.acme_contact)
+        for seq, contact in AcmeService.iter_contacts()
+    ]
+
+
+def test_recovery_replays_creates_status_updates_and_deletes(service, tmp_path):
+    service.enable_persistence(str(tmp_path), sync_commit=True)
+    created = service.create_contacts([make_contact(first=f"First{i}") for i in range(5)])
+    single = service.create_contact(make_contact(first="Single"))
+    assert service.update_contact_status(created[1].acme_contact_id, "inactive")
+    assert service.delete_contact(created[2].acme_contact_id)
+    before = snapshot_of_store()
+    
+    restart(str(tmp_path))
+    
+    assert snapshot_of_store() == before
+    assert service.get_contact(created[2].acme_contact_id) is None
+    assert service.get_contact(created[1].acme_contact_id).acme_status == "inactive"
+    assert service.get_contact(single.acme_contact_id).acme_contact.acme_first_name == "Single"
+    stats = service.get_storage_stats()
+    assert stats["total_contacts"] == 5
+    assert stats["contacts_by_status"] == {"active": 4, "inactive": 1}
+
+
+def test_recovery_keeps_sequence_numbers_and_cursors(service, tmp_path):
+    service.enable_persistence(str(tmp_path), sync_commit=True)
+    service.create_contacts([make_contact(first=f"First{i}") for i in range(6)])
+    page, cursor = service.get_contacts_page(3)
+    
+    restart(str(tmp_path))
+    
+    rest, _ = service.get_contacts_page(10, cursor)
+    assert [c.acme_contact.acme_first_name for c in page + rest] == [f"First{i}" for i in range(6)]
+    # New contacts continue after the recovered ones instead of reusing their numbers
+    service.create_contact(make_contact(first="Later"))
+    rest, _ = service.get_contacts_page(10, cursor)
+    assert [c.acme_contact.acme_first_name for c in rest] == ["First3", "First4", "First5", "Later"]
+
+
+def test_recovery_from_snapshot_and_later_log(service, tmp_path):
+    service.enable_persistence(str(tmp_path), sync_commit=True)
+    created = service.create_contacts([make_contact(first=f"First{i}") for i in range(4)])
+    service._repository._journal.snapshot()
+    # Changes after the snapshot are only in the new log segment
+    service.delete_contact(created[0].acme_contact_id)
+    service.update_contact_status(created[3].acme_contact_id, "inactive")
+    service.create_contact(make_contact(first="AfterSnapshot"))
+    before = snapshot_of_store()
+    
+    restart(str(tmp_path))
+    
+    assert snapshot_of_store() == before
+    assert [os.path.basename(path) for path in glob.glob(os.path.join(tmp_path, "snapshot-*"))] == ["snapshot-00000002.jsonl"]
+    assert [os.path.basename(path) for path in glob.glob(os.path.join(tmp_path, "wal-*"))] == ["wal-00000002.log"]
+
+
+def test_recovery_twice_is_idempotent(service, tmp_path):
+    service.enable_persistence(str(tmp_path), sync_commit=True)
+    service.create_contacts([make_contact(first=f"First{i}") for i in range(3)])
+    service._repository._journal.snapshot()
+    service.create_contact(make_contact(first="Last"))
+    before = snapshot_of_store()
+    
+    restart(str(tmp_path))
+    restart(str(tmp_path))
+    
+    assert snapshot_of_store() == before
+
+
+def test_torn_tail_record_is_ignored(service, tmp_path):
+    service.enable_persistence(str(tmp_path), sync_commit=True)
+    service.create_contacts([make_contact(first=f"First{i}") for i in range(2)])
+    before = snapshot_of_store()
+    service.disable_persistence()
+    # A crash in the middle of a write leaves an incomplete last line
+    (log,) = glob.glob(os.path.join(tmp_path, "wal-*.log"))
+    with open(log, "ab") as f:
+        f.write(b'{"op":"create","seq":2,"ids":["acme_')
+    
+    restart(str(tmp_path))
+    
+    assert snapshot_of_store() == before
@@ -0,0 +1,142 @@
+"""The in-memory, SQLite and shared-memory backends behave the same through the ContactRepository interface."""
+
+from typing import Iterator, List
+import pytest
+from services.contact_repository import ContactRepository, InMemoryContactRepository
+from services.shared_repository import SharedContactRepository
+from services.sqlite_repository import SQLiteContactRepository
+from tests.conftest import make_contact
+
+CREATED_AT = "2025-07-25T16:38:00Z"
+LATER = "2025-07-25T16:39:00Z"
+
+
+@pytest.fixture(params=["memory", "sqlite", "shared"])
+def repository(request, tmp_path) -> Iterator[ContactRepository]:
+    """A fresh repository of each backend, closed again after the test."""
+    if request.param == "memory":
+        repository = InMemoryContactRepository()
+    elif request.param == "sqlite":
+        repository = SQLiteContactRepository(str(tmp_path / "contacts.db"))
+    else:
+        repository = SharedContactRepository(str(tmp_path / "contacts.shm"), initial_size=4096)
+    yield repository
+    repository.close()
+
+
+def emails(repository: ContactRepository, **filters) -> List[str]:
+    return [contact.acme_contact.acme_email for _, contact in repository.iter_contacts(**filters)]
+
+
+def test_insert_and_get(repository):
+    ids = repository.insert(
+        [make_contact("Ada", "Lovelace", company="Analytical Engines"), make_contact("Grace", "Hopper", company=None)],
+        CREATED_AT,
+        "active"
+    )
+    
+    assert len(ids) == len(set(ids)) == 2
+    ada = repository.get(ids[0])
+    assert ada.acme_contact_id == ids[0]
+    assert ada.acme_status == "active"
+    assert ada.acme_created_at == CREATED_AT
+    assert ada.acme_contact == make_contact("Ada", "Lovelace", company="Analytical Engines")
+    assert repository.get(ids[1]).acme_contact.acme_company_name is None
+    assert repository.get("acme_ffffffff") is None
+    assert emails(repository) == ["ada.lovelace@example.com", "grace.hopper@example.com"]
+
+
+def test_set_status_and_delete(repository):
+    ids = repository.insert([make_contact("Ada", "Lovelace"), make_contact("Grace", "Hopper")], CREATED_AT, "active")
+    
+    assert repository.set_status(ids[0], "inactive")
+    assert repository.get(ids[0]).acme_status == "inactive"
+    assert repository.delete(ids[1])
+    assert repository.get(ids[1]) is None
+    assert emails(repository) == ["ada.lovelace@example.com"]
+    # Missing contacts are reported rather than created or counted
+    assert not repository.set_status(ids[1], "active")
+    assert not repository.delete(ids[1])
+    assert emails(repository) == ["ada.lovelace@example.com"]
+
+
+def test_iteration_resumes_after_a_cursor_and_applies_filters(repository):
+    ids = repository.insert(
+        [
+            make_contact("Ada", "Lovelace", company="Analytical Engines"),
+            make_contact("Charles", "Babbage", company=" analytical engines"),
+            make_contact("Grace", "Hopper", company="Navy"),
+            make_contact("Joan", "Clarke", company="Analytical Engines")
+        ],
+        CREATED_AT,
+        "active"
+    )
+    repository.set_status(ids[3], "inactive")
+    repository.delete(ids[2])
+    
+    seqs = [seq for seq, _ in repository.iter_contacts()]
+    assert seqs == sorted(seqs)
+    assert emails(repository, after=seqs[0]) == ["charles.babbage@example.com", "joan.clarke@example.com"]
+    assert emails(repository, after=seqs[-1]) == []
+    # Filters match case- and whitespace-insensitively, and combine with each other and the cursor
+    assert emails(repository, email="  ADA.Lovelace@Example.com") == ["ada.lovelace@example.com"]
+    assert emails(repository, company="ANALYTICAL ENGINES") == [
+        "ada.lovelace@example.com", "charles.babbage@example.com", "joan.clarke@example.com"
+    ]
+    assert emails(repository, company="analytical engines", status="active") == [
+        "ada.lovelace@example.com", "charles.babbage@example.com"
+    ]
+    assert emails(repository, company="analytical engines", after=seqs[0]) == [
+        "charles.babbage@example.com", "joan.clarke@example.com"
+    ]
+    assert emails(repository, status="inactive") == ["joan.clarke@example.com"]
+    assert emails(repository, company="Navy") == []
+
+
+def test_stats_count_the_stored_contacts(repository):
+    ids = repository.insert(
+        [
+            make_contact("Ada", "Lovelace", company="Acme"),
+            make_contact("Charles", "Babbage", company="ACME"),
+            make_contact("Joan", "Clarke", company="Acme"),
+            make_contact("Grace", "Hopper", company="Navy"),
+            make_contact("Alan", "Turing", company=None)
+        ],
+        CREATED_AT,
+        "active"
+    )
+    later = repository.insert([make_contact("Mary", "Somerville", company="Navy")], LATER, "active")
+    repository.set_status(ids[0], "inactive")
+    repository.delete(ids[3])
+    repository.delete(later[0])
+    
+    assert repository.stats() == {
+        "total_contacts": 4,
+        "active_contacts": 3,
+        "inactive_contacts": 1,
+        "contacts_by_status": {"active": 3, "inactive": 1},
+        # Companies are counted by normalized name and shown in their most common spelling
+        "top_companies": [{"company": "Acme", "contacts": 3}],
+        # Minutes whose contacts were all deleted drop out
+        "created_per_minute": {"2025-07-25T16:38Z": 4}
+    }
+
+
+def test_clear_removes_everything(repository):
+    ids = repository.insert([make_contact("Ada", "Lovelace"), make_contact("Grace", "Hopper")], CREATED_AT, "active")
+    
+    repository.clear()
+    
+    assert repository.get(ids[0]) is None
+    assert emails(repository) == []
+    assert repository.stats() == {
+        "total_contacts": 0,
+        "active_contacts": 0,
+        "inactive_contacts": 0,
+        "contacts_by_status": {},
+        "top_companies": [],
+        "created_per_minute": {}
+    }
+    # The repository keeps working after a clear
+    repository.insert([make_contact("Joan", "Clarke")], CREATED_AT, "active")
+    assert emails(repository) == ["joan.clarke@example.com"]
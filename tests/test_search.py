@@ -0,0 +1,128 @@
+"""Ranked full-text and prefix search over contacts."""
+
+import pytest
+from tests.conftest import make_contact
+
+
+def search(service, query, limit=20):
+    """Names of the matching contacts, best first, with their scores."""
+    return [
+        (f"{contact.acme_contact.acme_first_name} {contact.acme_contact.acme_last_name}", score)
+        for contact, score in service.search_contacts(query, limit)
+    ]
+
+
+def test_fields_rank_name_over_company_over_email_over_notes(service):
+    service.create_contacts([
+        make_contact("Grace", "Hopper", notes="Met Turing at the conference"),
+        make_contact("Grace", "Brewster", email="turing.fan@example.com"),
+        make_contact("Joan", "Clarke", company="Turing Labs"),
+        make_contact("Alan", "Turing")
+    ])
+    
+    assert search(service, "turing") == [
+        ("Alan Turing", 8), ("Joan Clarke", 6), ("Grace Brewster", 4), ("Grace Hopper", 2)
+    ]
+
+
+def test_last_word_completes_name_and_company_prefixes(service):
+    service.create_contacts([
+        make_contact("John", "Smith"),
+        make_contact("Joan", "Clarke"),
+        make_contact("Ada", "Major"),
+        make_contact("Ada", "Byron", company="Jolly Ventures"),
+        make_contact("Ada", "King", notes="jonquil order", email="jojo@example.com")
+    ])
+    
+    # Prefixes match the start of name and company words only, never inside words, emails or notes
+    assert search(service, "jo") == [("John Smith", 4), ("Joan Clarke", 4), ("Ada Byron", 3)]
+
+
+def test_whole_word_beats_prefix(service):
+    service.create_contacts([make_contact("Johnny", "Walker"), make_contact("Jo", "March")])
+    
+    assert search(service, "jo") == [("Jo March", 8), ("Johnny Walker", 4)]
+
+
+def test_only_last_word_matches_by_prefix(service):
+    service.create_contacts([make_contact("John", "Smith"), make_contact("Jo", "Smithers")])
+    
+    assert search(service, "jo smith") == [("Jo Smithers", 12)]
+    assert search(service, "john smi") == [("John Smith", 12)]
+
+
+def test_every_word_must_match(service):
+    service.create_contacts([
+        make_contact("Ada", "Lovelace", company="Analytical Engines"),
+        make_contact("Ada", "Byron", company="Difference Engines"),
+        make_contact("Charles", "Babbage", company="Analytical Engines")
+    ])
+    
+    assert search(service, "ada analytical") == [("Ada Lovelace", 14)]
+    assert search(service, "ada engines") == [("Ada Lovelace", 14), ("Ada Byron", 14)]
+    assert search(service, "ada nobody") == []
+
+
+def test_ties_keep_insertion_order_and_limit_applies(service):
+    stored = service.create_contacts([make_contact("Ada", "Lovelace", email=f"ada{i}@example.com") for i in range(5)])
+    
+    results = service.search_contacts("lovelace", 3)
+    
+    assert [contact.acme_contact_id for contact, _ in results] == [contact.acme_contact_id for contact in stored[:3]]
+
+
+def test_case_accents_and_punctuation_are_ignored(service):
+    service.create_contacts([make_contact("Zoë", "Müller-Lüdenscheidt", email="zoe@example.com")])
+    
+    assert search(service, "ZOE muller")[0][0] == "Zoë Müller-Lüdenscheidt"
+    assert search(service, "lüdensch") == [("Zoë Müller-Lüdenscheidt", 4)]
+    assert search(service, "!!!") == []
+
+
+def test_index_follows_creates_and_deletes(service):
+    ada = service.create_contact(make_contact("Ada", "Lovelace"))
+    assert search(service, "ada") == [("Ada Lovelace", 8)]
+    
+    service.create_contact(make_contact("Ada", "Byron"))
+    service.delete_contact(ada.acme_contact_id)
+    assert search(service, "ada") == [("Ada Byron", 8)]
+    
+    service.clear_storage()
+    assert search(service, "ada") == []
+
+
+def test_deletes_trigger_background_rebuild(service):
+    stored = service.create_contacts([make_contact("Ada", f"Number{i}", email=f"ada{i}@example.com") for i in range(8)])
+    assert service.sync_search_index()["contacts"] == 8
+    
+    # The third delete takes deleted contacts past REBUILD_DELETED_RATIO of the index
+    for contact in stored[:3]:
+        service.delete_contact(contact.acme_contact_id)
+    rebuilder = service._search._rebuilder
+    assert rebuilder is not None
+    # Deleted and added while the rebuild may still run: both are applied to the rebuilt index
+    service.delete_contact(stored[3].acme_contact_id)
+    service.create_contact(make_contact("Ada", "Late", email="late@example.com"))
+    rebuilder.join()
+    
+    assert [name for name, _ in search(service, "ada")] == [f"Ada Number{i}" for i in range(4, 8)] + ["Ada Late"]
+    assert service.sync_search_index()["contacts"] == 5
+
+
+def test_search_endpoint(client):
+    for first, last in [("Ada", "Lovelace"), ("Adam", "Smith"), ("Grace", "Hopper")]:
+        assert client.post("/contacts", json={"firstName": first, "lastName": last, "email": f"{first}@example.com"}).status_code == 200
+    
+    response = client.get("/contacts/search", params={"q": "Ada", "limit": 1})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "Ada"
+    assert len(body["results"]) == 1
+    assert body["results"][0]["score"] == 8
+    assert body["results"][0]["contact"]["lastName"] == "Lovelace"
+
+
+@pytest.mark.parametrize("params", [{"q": ""}, {"q": "ada", "limit": 0}, {"q": "ada", "limit": 101}])
+def test_search_endpoint_rejects_invalid_parameters(client, params):
+    assert client.get("/contacts/search", params=params).status_code == 422
@@ -0,0 +1,217 @@
+"""Cross-process visibility, compaction and clears of the shared-memory repository."""
+
+import multiprocessing
+import os
+from typing import List, Tuple
+import pytest
+from services.duplicate_index import DuplicateIndex
+from services.search_index import SearchIndex
+from services.shared_repository import SharedContactRepository
+from tests.conftest import make_contact
+
+CREATED_AT = "2025-07-25T16:38:00Z"
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "contacts.shm")
+
+
+def open_log(path: str, **options) -> SharedContactRepository:
+    """Map the log as another worker process would, with its own local view."""
+    return SharedContactRepository(path, initial_size=4096, **options)
+
+
+def listing(repository: SharedContactRepository) -> List[Tuple[int, str, str, str]]:
+    return [
+        (seq, contact.acme_contact_id, contact.acme_status, contact.acme_contact.acme_email)
+        for seq, contact in repository.iter_contacts()
+    ]
+
+
+def test_writes_of_one_worker_are_visible_to_another(path):
+    first, second = open_log(path), open_log(path)
+    ids = first.insert([make_contact(first=f"First{i}", company="Acme") for i in range(3)], CREATED_AT, "active")
+    
+    assert len(second) == 3
+    assert second.get(ids[0]).acme_contact.acme_first_name == "First0"
+    assert listing(second) == listing(first)
+    
+    second.set_status(ids[1], "inactive")
+    second.delete(ids[2])
+    assert first.get(ids[1]).acme_status == "inactive"
+    assert first.get(ids[2]) is None
+    assert [contact.acme_contact_id for _, contact in first.iter_contacts(company="acme", status="active")] == [ids[0]]
+    assert first.stats() == second.stats()
+    assert first.version == second.version
+
+
+def test_sequence_numbers_are_shared_and_stable(path):
+    first, second = open_log(path), open_log(path)
+    first.insert([make_contact(first="A")], CREATED_AT, "active")
+    second.insert([make_contact(first="B")], CREATED_AT, "active")
+    first.insert([make_contact(first="C")], CREATED_AT, "active")
+    
+    seqs = [seq for seq, _ in first.iter_contacts()]
+    assert seqs == [seq for seq, _ in second.iter_contacts()] == sorted(seqs)
+    # A pagination cursor taken in one worker resumes in the other
+    assert [contact.acme_contact.acme_first_name for _, contact in second.iter_contacts(after=seqs[0])] == ["B", "C"]
+
+
+def test_compaction_drops_deleted_contacts_and_keeps_everything_else(path):
+    writer = open_log(path, compact_min_size=1 << 30)
+    reader = open_log(path)
+    ids = writer.insert([make_contact(first=f"First{i}") for i in range(300)], CREATED_AT, "active")
+    for i, contact_id in enumerate(ids):
+        if i % 3:
+            writer.delete(contact_id)
+        elif i % 2:
+            writer.set_status(contact_id, "inactive")
+    before = listing(writer)
+    assert listing(reader) == before
+    size = writer._applied
+    
+    writer.compact()
+    
+    assert writer._applied < size / 2
+    assert listing(writer) == listing(reader) == before
+    assert listing(open_log(path)) == before
+    assert reader.stats() == writer.stats() == open_log(path).stats()
+    # Later writes land after the compacted records and keep counting up
+    new_id = reader.insert([make_contact(first="Later")], CREATED_AT, "active")[0]
+    assert listing(writer)[-1][1] == new_id
+    assert listing(writer)[-1][0] > before[-1][0]
+
+
+def test_compaction_starts_in_the_background_once_the_log_is_wasteful(path):
+    repository = open_log(path, compact_min_size=4096)
+    ids = repository.insert([make_contact(first=f"First{i}") for i in range(200)], CREATED_AT, "active")
+    for contact_id in ids[:150]:
+        repository.delete(contact_id)
+    if repository._compactor is not None:
+        repository._compactor.join()
+    
+    assert repository._header()[2] > 0
+    assert [contact_id for _, contact_id, _, _ in listing(open_log(path))] == ids[150:]
+
+
+def test_clear_in_another_worker_resets_its_indexes(path):
+    worker, other = open_log(path), open_log(path)
+    search, duplicates = SearchIndex(), DuplicateIndex()
+    worker.insert([make_contact(first="Ada", email="ada@example.com")], CREATED_AT, "active")
+    assert [contact_id for contact_id, _ in search.search(worker, "ada", 10)]
+    assert duplicates.may_have_email(worker, "ada@example.com")
+    
+    other.clear()
+    grace = other.insert([make_contact(first="Grace", last="Hopper", email="grace@example.com")], CREATED_AT, "active")
+    
+    assert search.search(worker, "ada", 10) == []
+    assert [contact_id for contact_id, _ in search.search(worker, "grace", 10)] == grace
+    assert duplicates.may_have_email(worker, "grace@example.com")
+    assert not duplicates.may_have_email(worker, "ada@example.com")
+    assert len(worker) == 1
+
+
+def test_change_cursors_work_in_every_worker(path):
+    first, second = open_log(path), open_log(path)
+    cursor = first.change_cursor
+    assert second.change_cursor == cursor
+    
+    ids = first.insert([make_contact(first="A")], CREATED_AT, "active")
+    second.set_status(ids[0], "inactive")
+    ids += second.insert([make_contact(first="B")], CREATED_AT, "active")
+    first.delete(ids[0])
+    
+    expected = [("create", ids[0], "active"), ("status", ids[0], "inactive"), ("create", ids[1], "active"), ("delete", ids[0], None)]
+    for repository in (first, second):
+        changes = repository.changes_since(cursor, 100)
+        assert [(change.op, change.contact_id, change.status) for change in changes] == expected
+        assert [change.seq for change in changes] == list(range(cursor + 1, cursor + 5))
+        assert changes[2].contact.acme_first_name == "B"
+    assert first.changes_since(cursor + 2, 100) == second.changes_since(cursor + 2, 100)
+    # A worker that maps the log later has no history: older cursors resync there, the latest one is up to date
+    assert open_log(path).changes_since(cursor, 100) is None
+    assert open_log(path).changes_since(first.change_cursor, 100) == []
+
+
+def test_compaction_keeps_the_change_feed_of_caught_up_workers(path):
+    writer = open_log(path, compact_min_size=1 << 30)
+    caught_up, behind = open_log(path), open_log(path)
+    cursor = writer.change_cursor
+    # A worker's feed starts when it first reads the log
+    assert caught_up.change_cursor == behind.change_cursor == cursor
+    ids = writer.insert([make_contact(first=f"First{i}") for i in range(10)], CREATED_AT, "active")
+    for contact_id in ids[:5]:
+        writer.delete(contact_id)
+    assert len(caught_up.changes_since(cursor, 100)) == 15
+    
+    writer.compact()
+    later = writer.insert([make_contact(first="Later")], CREATED_AT, "active")
+    
+    for repository in (writer, caught_up):
+        assert [change.op for change in repository.changes_since(cursor, 100)] == ["create"] * 10 + ["delete"] * 5 + ["create"]
+    # Had not applied the deletes before they were compacted away: its feed starts over, without replaying the log
+    assert behind.changes_since(cursor, 100) is None
+    assert behind.changes_since(writer.change_cursor - 1, 100) is None
+    assert behind.changes_since(writer.change_cursor, 100) == []
+    assert caught_up.changes_since(writer.change_cursor - 1, 100)[0].contact_id == later[0]
+
+
+def test_clear_in_another_worker_requires_resync(path):
+    worker, other = open_log(path), open_log(path)
+    worker.insert([make_contact()], CREATED_AT, "active")
+    cursor = worker.change_cursor
+    
+    other.clear()
+    
+    assert worker.changes_since(cursor, 100) is None
+    assert other.changes_since(cursor, 100) is None
+    new = other.insert([make_contact(first="Grace")], CREATED_AT, "active")
+    assert [change.contact_id for change in worker.changes_since(worker.change_cursor - 1, 100)] == new
+
+
+def test_service_passes_other_workers_changes_to_listeners(service, path):
+    service.use_repository(open_log(path))
+    other = open_log(path)
+    received = []
+    
+    def listener(changes):
+        received.extend(changes)
+    
+    service.add_change_listener(listener)
+    try:
+        cursor = service.get_change_cursor()
+        own = service.create_contact(make_contact(first="Own"))
+        theirs = other.insert([make_contact(first="Theirs")], CREATED_AT, "active")
+        service.poll_changes()
+        service.poll_changes()
+    finally:
+        service.remove_change_listener(listener)
+    
+    assert [change.contact_id for change in received] == [own.acme_contact_id, theirs[0]]
+    assert [change.seq for change in received] == [cursor + 1, cursor + 2]
+    assert service.get_changes(cursor, 100) == received
+
+
+def _insert_from_process(path: str, worker: int) -> List[str]:
+    repository = open_log(path)
+    ids = []
+    for batch in range(10):
+        ids += repository.insert(
+            [make_contact(first=f"W{worker}", email=f"w{worker}.{batch}.{i}@example.com") for i in range(5)],
+            CREATED_AT, "active"
+        )
+        repository.delete(ids.pop(0))
+    repository.close()
+    return ids
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork to share the test module with the workers")
+def test_concurrent_writer_processes(path):
+    open_log(path)
+    with multiprocessing.get_context("fork").Pool(3) as pool:
+        kept = pool.starmap(_insert_from_process, [(path, worker) for worker in range(3)])
+    
+    repository = open_log(path)
+    assert sorted(contact_id for _, contact_id, _, _ in listing(repository)) == sorted(sum(kept, []))
+    assert len(repository) == 3 * 40